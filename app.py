@@ -177,58 +177,153 @@
 
 import streamlit as st
 import random
-import copy # Cần để copy trạng thái object
-from core.algorithms import FIFO, LIFO, LRU, LFU, CLOCK
-from ui.visuals import draw_request_queue, draw_linear_cache_with_evicted, draw_metrics, draw_clock_svg
+import hashlib
+import numpy as np
+from core import registry, workloads
+from core.shards import exact_mrc
+from core.store import ResultStore, array_digest
+from core.timeline import Timeline
+from ui.visuals import draw_request_queue, draw_linear_cache_with_evicted, draw_metrics, draw_clock_svg, draw_multi_list_cache, \
+    draw_miss_ratio_chart, draw_hit_rate_chart
 
 st.set_page_config(page_title="Paging Algorithm", layout="centered") 
 st.title("💾 Paging Algorithm Simulator")
 
-ALGO_DESCRIPTIONS = {
-    "FIFO": "Page vào cache sớm nhất → bị xóa",
-    "LIFO": "Page vào sau cùng → bị xóa",
-    "LRU": "Page lâu nhất chưa được dùng → bị xóa",
-    "LFU": "Page nào được dùng ít lần nhất → bị xóa",
-    "CLOCK": 'Cải tiến của LRU: Bit = 1 → hạ xuống 0 (Cơ hội thứ hai), Bit = 0 → Thay thế.'
+# Tham số workload cho giao diện: trace ngắn, ít page để dễ theo dõi (page id bắt đầu từ 1)
+UI_WORKLOADS = {
+    "random": None,
+    "zipf": {'n_pages': 10, 'alpha': 1.0},
+    "scan": {},
+    "loop": {},  # loop_size = capacity + 1: LRU / FIFO MISS mọi request
+    "phases": {'working_set': 4, 'phase_length': 10},
+    "mixed": {'n_pages': 8, 'scan_weight': 0.25, 'scan_base': 100},
 }
 
+# --- Helper ---
+def make_requests(workload, length, capacity):
+    if UI_WORKLOADS[workload] is None:
+        return [random.randint(1, 10) for _ in range(length)]
+    params = dict(UI_WORKLOADS[workload], base=1)
+    if workload == "loop":
+        params['loop_size'] = capacity + 1
+    return workloads.generate(workload, length, random.randrange(2**31), **params).tolist()
+
+def trace_hash(requests):
+    return hashlib.sha1(repr(requests).encode()).hexdigest()
+
+# Chạy cả trace 1 lần cho mỗi (thuật toán, capacity, trace); cache có giới hạn số entry.
+# cache_resource trả về đúng object đã lưu (không pickle / copy mỗi lần rerun);
+# Timeline chỉ được đọc nên dùng chung giữa các session được.
+# Tham số bắt đầu bằng "_" không được Streamlit hash -> dùng trace_hash làm khóa
+@st.cache_resource(max_entries=16, show_spinner=False)
+def load_timeline(algo_name, capacity, requests_hash, _requests):
+    return Timeline(registry.create(algo_name, capacity, _requests), _requests)
+
+# Kết quả lưu trên đĩa, dùng chung giữa các session và các lần chạy CLI
+@st.cache_resource
+def get_store():
+    return ResultStore()
+
+# Số liệu cho biểu đồ: MRC theo capacity và mảng HIT/MISS của từng thuật toán
+@st.cache_data(max_entries=16, show_spinner=False)
+def load_charts(algo_names, capacity, requests_hash, _requests):
+    pages = np.asarray(_requests, dtype=np.int64)
+    digest = array_digest(pages)
+    # Bắt đầu từ 2 vì LIRS cần capacity >= 2
+    capacities = np.arange(2, max(capacity, len(np.unique(pages))) + 1)
+    curves, hit_masks = {}, {}
+    for name in algo_names:
+        mrc = exact_mrc(name, pages, capacities)
+        curves[name] = (mrc.capacities, mrc.miss_ratio)
+        hit_masks[name] = get_store().run(name, capacity, pages, keep_steps=True, digest=digest)['hit_mask']
+    return curves, hit_masks
+
+def move(delta, key="position"):
+    st.session_state[key] += delta
+
+def draw_cache(policy_info, frame, capacity):
+    cache_data, evicted = frame['cache_state'], frame['evicted']
+    if policy_info.render == "clock":
+        draw_clock_svg(cache_data, frame['hand'], capacity, evicted, policy_info.description)
+    elif policy_info.render == "lists":
+        draw_multi_list_cache(cache_data, evicted, policy_info.name, capacity, policy_info.description)
+    else:
+        draw_linear_cache_with_evicted(cache_data, evicted, policy_info.name, capacity, policy_info.description)
+    draw_metrics(frame['hits'], frame['misses'])
+
 # --- 1. Sidebar ---
 with st.sidebar:
     st.header("Cài đặt")
-    new_algo = st.selectbox("Thuật toán", list(ALGO_DESCRIPTIONS.keys()))
+    new_algo = st.selectbox("Thuật toán", registry.names())
     new_capacity = st.slider("Kích thước Cache", 3, 6, 3) 
+    new_workload = st.selectbox("Workload", list(UI_WORKLOADS))
+    new_length = st.slider("Số request", 15, 200, 15)
+    lockstep = st.checkbox("So sánh nhiều thuật toán (lockstep)")
 
 # --- 2. Khởi tạo / Reset State ---
-if 'config' not in st.session_state or \
-   st.session_state.config['algo'] != new_algo or \
-   st.session_state.config['cap'] != new_capacity:
-    
-    st.session_state.config = {'algo': new_algo, 'cap': new_capacity}
-    st.session_state.requests = [random.randint(1, 10) for _ in range(15)] 
-    st.session_state.step = 0
-    
-    # Khởi tạo instance
-    if new_algo == "FIFO": instance = FIFO(new_capacity)
-    elif new_algo == "LIFO": instance = LIFO(new_capacity)
-    elif new_algo == "LRU": instance = LRU(new_capacity)
-    elif new_algo == "LFU": instance = LFU(new_capacity)
-    elif new_algo == "CLOCK": instance = CLOCK(new_capacity)
-    
-    st.session_state.algo_instance = instance
-    st.session_state.last_status = (None, None)
-    # QUAN TRỌNG: Lưu lịch sử trạng thái
-    st.session_state.history = [] 
+new_config = {'algo': new_algo, 'cap': new_capacity, 'workload': new_workload, 'length': new_length}
+if st.session_state.get('config') != new_config:
+    st.session_state.config = new_config
+    st.session_state.requests = make_requests(new_workload, new_length, new_capacity)
+    # Vị trí trên timeline = số lần đã gọi access() (kể cả bước STEP của CLOCK)
+    st.session_state.position = 0
     st.rerun()
 
-# --- 3. Giao diện chính ---
 requests = st.session_state.requests
-current_step = st.session_state.step
-algo_instance = st.session_state.algo_instance
-status, evicted = st.session_state.last_status
+
+# --- Lockstep: các thuật toán cùng xử lý tới 1 request, dùng chung trace ---
+if lockstep:
+    default_algos = [name for name in ("FIFO", "LRU", "CLOCK") if name in registry.names()]
+    compare_algos = st.multiselect("Thuật toán so sánh", registry.names(), default=default_algos)
+    if 'lock_step' not in st.session_state or st.session_state.lock_step > len(requests):
+        st.session_state.lock_step = 0
+    lock_step = st.session_state.lock_step
+
+    draw_request_queue(requests, lock_step)
+    st.write("---")
+    st.slider("Request", 0, len(requests), key="lock_step")
+    col_ctrl1, col_ctrl2, col_ctrl3 = st.columns(3)
+    with col_ctrl1:
+        if st.button("🔄 Random", use_container_width=True):
+            del st.session_state.config
+            st.rerun()
+    with col_ctrl2:
+        st.button("⬅️ Prev", disabled=(lock_step == 0), use_container_width=True,
+                  on_click=move, args=(-1, "lock_step"))
+    with col_ctrl3:
+        st.button("Next ➡️", disabled=(lock_step >= len(requests)), use_container_width=True,
+                  type="primary", on_click=move, args=(1, "lock_step"))
+
+    frames = {}
+    for name in compare_algos:
+        timeline = load_timeline(name, new_capacity, trace_hash(requests), requests)
+        frames[name] = timeline.at(timeline.position_of_step(lock_step))
+    if frames:
+        st.dataframe([{'Thuật toán': name, 'Kết quả': frame['status'] or "-", 'Loại bỏ': frame['evicted'],
+                       'Hit': frame['hits'], 'Miss': frame['misses']}
+                      for name, frame in frames.items()], hide_index=True, use_container_width=True)
+    for name, frame in frames.items():
+        st.write("---")
+        draw_cache(registry.get(name), frame, new_capacity)
+    st.stop()
+
+# --- 3. Giao diện chính ---
+timeline = load_timeline(new_algo, new_capacity, trace_hash(requests), requests)
+last_position = len(timeline) - 1
+# Streamlit xóa state của slider khi slider không được vẽ (chế độ lockstep)
+if 'position' not in st.session_state or st.session_state.position > last_position:
+    st.session_state.position = 0
+
+frame = timeline.at(st.session_state.position)
+current_step = frame['step']
+status, evicted = frame['status'], frame['evicted']
 
 draw_request_queue(requests, current_step)
 st.write("---")
 
+# A. Thanh kéo timeline: nhảy tới bất kỳ bước nào (dựng lại từ checkpoint gần nhất, không chạy lại cả trace)
+st.slider("Timeline", 0, last_position, key="position")
+
 # B. Controls
 col_ctrl1, col_ctrl2, col_ctrl3 = st.columns(3)
 
@@ -238,38 +333,16 @@ with col_ctrl1:
         st.rerun()
 
 with col_ctrl2:
-    # --- LOGIC NÚT PREV ---
-    if st.button("⬅️ Prev", disabled=(not st.session_state.history), use_container_width=True):
-        # Lấy trạng thái cũ nhất từ history
-        prev_state = st.session_state.history.pop()
-        
-        st.session_state.algo_instance = prev_state['instance']
-        st.session_state.step = prev_state['step']
-        st.session_state.last_status = prev_state['last_status']
-        st.rerun()
+    st.button("⬅️ Prev", disabled=(st.session_state.position == 0), use_container_width=True,
+              on_click=move, args=(-1,))
 
 with col_ctrl3:
-    # --- LOGIC NÚT NEXT ---
-    if st.button("Next ➡️", disabled=(current_step >= 15), use_container_width=True, type="primary"):
-        # Lưu lại trạng thái HIỆN TẠI vào history trước khi thực hiện bước mới
-        current_snapshot = {
-            'instance': copy.deepcopy(algo_instance),
-            'step': st.session_state.step,
-            'last_status': st.session_state.last_status
-        }
-        st.session_state.history.append(current_snapshot)
-        
-        # Thực hiện bước tiếp theo
-        page = requests[current_step]
-        res_status, res_evicted = algo_instance.access(page)
-        st.session_state.last_status = (res_status, res_evicted)
-        
-        if res_status != "STEP":
-            st.session_state.step += 1
-        st.rerun()
+    st.button("Next ➡️", disabled=(st.session_state.position >= last_position), use_container_width=True,
+              type="primary", on_click=move, args=(1,))
 
 # C. Hiển thị kết quả (Giữ nguyên logic cũ)
-current_desc = ALGO_DESCRIPTIONS[new_algo]
+policy_info = registry.get(new_algo)
+current_desc = policy_info.description
 if status is not None:
     current_page = requests[current_step if status == "STEP" else current_step - 1]
     if status == "STEP":
@@ -282,10 +355,12 @@ if status is not None:
         st.error(msg, icon="❌")
 
 # Visualization
-cache_data = algo_instance.get_cache_state()
-if new_algo == "CLOCK":
-    draw_clock_svg(cache_data, algo_instance.hand, new_capacity, evicted, current_desc)
-else:
-    draw_linear_cache_with_evicted(cache_data, evicted, new_algo, new_capacity, current_desc)
-
-draw_metrics(algo_instance.hits, algo_instance.misses)
\ No newline at end of file
+draw_cache(policy_info, frame, new_capacity)
+
+# D. Biểu đồ so sánh (dữ liệu được downsample phía server trước khi vẽ)
+with st.expander("📈 Biểu đồ miss ratio / hit rate"):
+    chart_algos = st.multiselect("Thuật toán so sánh", registry.names(), default=[new_algo])
+    if chart_algos:
+        curves, hit_masks = load_charts(tuple(chart_algos), new_capacity, trace_hash(requests), requests)
+        draw_miss_ratio_chart(curves)
+        draw_hit_rate_chart(hit_masks, window=max(1, min(1000, len(requests) // 5)))
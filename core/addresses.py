@@ -0,0 +1,268 @@
+# core/addresses.py
+"""
+Đọc trace địa chỉ ảo (thay vì page id) và dịch sang page number ngay khi đọc,
+nên đổi page size không cần bước tiền xử lý riêng.
+
+Định dạng:
+- "lackey": output của `valgrind --tool=lackey --trace-mem=yes`
+      I  0400d7d4,8      đọc lệnh
+       L 7ff000398,8     đọc dữ liệu
+       S 7ff000398,8     ghi
+       M 0421e1b0,4      đọc rồi ghi (qua cả bộ lọc R lẫn W)
+  Các dòng khác (vd. "==1234== ...") bị bỏ qua; pid lấy từ dòng "==pid==" đầu tiên.
+- "hex": mỗi dòng "[pid] [R|W|I] địa_chỉ", địa chỉ hex (có thể có "0x"),
+  pid thập phân; dòng không ghi loại truy cập được coi là đọc (R).
+File nén .gz / .zst được giải nén khi đọc (xem core.trace).
+
+Mỗi khối byte được xử lý vector hóa trên mảng uint8 (np.frombuffer): tìm
+vị trí kết thúc địa chỉ của mọi dòng, đọc các chữ số bằng bảng tra rồi
+page = addr >> log2(page_size). Không tạo str / int Python cho từng dòng.
+
+Tách không gian page theo process (namespace=True):
+page = (pid << PID_SHIFT) | page, với page < 2^PID_SHIFT.
+"""
+import re
+
+import numpy as np
+
+from core.trace import detect_format as detect_compression, open_text
+
+FORMATS = ('lackey', 'hex')
+# Loại truy cập (mã ASCII): đọc lệnh, đọc, ghi, đọc rồi ghi
+KIND_INSTR, KIND_READ, KIND_WRITE, KIND_MODIFY = b'IRWM'
+ACCESS_TYPES = 'IRW'
+PAGE_SIZE = 4096
+# pid_max của Linux <= 2^22, địa chỉ ảo 48 bit với page >= 128 byte -> < 2^41
+PID_SHIFT = 41
+PID_NONE = -1
+BLOCK_BYTES = 4 << 20
+
+_MAX_HEX_DIGITS = 16
+_MAX_PID_DIGITS = 9
+
+
+def _table(mapping, fill=0, dtype=np.uint8):
+    table = np.full(256, fill, dtype=dtype)
+    for chars, value in mapping:
+        for c in chars:
+            table[c] = value
+    return table
+
+
+# Giá trị chữ số, 255 với ký tự không phải chữ số
+_HEX = _table([(bytes([c]), int(chr(c), 16)) for c in b'0123456789abcdefABCDEF'], fill=255)
+_DEC = _table([(bytes([c]), int(chr(c))) for c in b'0123456789'], fill=255)
+_SPACE = _table([(b' \t\r\n\v\f', 1)]).astype(bool)
+_LACKEY_KINDS = _table([(b'I', KIND_INSTR), (b'L', KIND_READ), (b'S', KIND_WRITE), (b'M', KIND_MODIFY)])
+_HEX_KINDS = _table([(b'Ii', KIND_INSTR), (b'Rr', KIND_READ), (b'Ww', KIND_WRITE)])
+_LACKEY_PID = re.compile(rb'^==(\d+)==', re.M)
+
+
+def page_shift(page_size):
+    if page_size <= 0 or page_size & (page_size - 1):
+        raise ValueError(f"page_size phải là lũy thừa của 2: {page_size}")
+    return page_size.bit_length() - 1
+
+
+def access_filter(access=None):
+    """
+    Bảng tra mã loại -> giữ lại hay không. access: chuỗi con của "IRW"
+    (vd. "RW" = chỉ truy cập dữ liệu), None = giữ tất cả.
+    """
+    if access is None:
+        access = ACCESS_TYPES
+    unknown = set(access.upper()) - set(ACCESS_TYPES)
+    if unknown:
+        raise ValueError(f"Loại truy cập phải thuộc '{ACCESS_TYPES}': {''.join(sorted(unknown))}")
+    access = access.upper()
+    keep = np.zeros(256, dtype=bool)
+    for kind in access:
+        keep[ord(kind)] = True
+    keep[KIND_MODIFY] = 'R' in access or 'W' in access
+    return keep
+
+
+def _number_before(data, end, table, base, width):
+    """
+    Đọc số gồm các chữ số liền nhau (tối đa width) kết thúc ngay trước vị trí end.
+    Trả về (giá trị uint64, số chữ số); 0 chữ số nếu data[end - 1] không phải chữ số.
+    """
+    value = np.zeros(len(end), dtype=np.uint64)
+    length = np.zeros(len(end), dtype=np.int64)
+    alive = np.ones(len(end), dtype=bool)
+    col = end.copy()
+    # Đi từ phải sang trái theo cột, dừng khi mọi số đã gặp ký tự khác chữ số
+    for k in range(width):
+        col -= 1
+        np.maximum(col, 0, out=col)
+        digit = table[data[col]]
+        alive &= (digit < base) & (end > k)
+        if not alive.any():
+            break
+        digit[~alive] = 0
+        value += digit.astype(np.uint64) * np.uint64(base ** k)
+        length += alive
+    return value, length
+
+
+def _solid_before(data, p, starts):
+    """Vị trí ký tự không trắng gần nhất trước p trong cùng dòng (-1 nếu không có)"""
+    q = p - 1
+    active = np.flatnonzero(q >= starts)
+    # Mỗi vòng lùi qua 1 khoảng trắng (thường chỉ 1 - 2 vòng)
+    while len(active):
+        active = active[_SPACE[data[q[active]]]]
+        q[active] -= 1
+        active = active[q[active] >= starts[active]]
+    return np.where(q >= starts, q, -1)
+
+
+def parse_block(block, fmt):
+    """
+    Parse các dòng đầy đủ (block kết thúc bằng '\\n').
+    Trả về (addr uint64, kind uint8, pid int64) của các dòng hợp lệ;
+    pid = PID_NONE với dòng không ghi pid (luôn như vậy với "lackey").
+    """
+    data = np.frombuffer(block, dtype=np.uint8)
+    newlines = np.flatnonzero(data == ord('\n'))
+    line_starts = np.concatenate(([0], newlines[:-1] + 1))
+
+    def is_space(p):
+        return _SPACE[data[np.maximum(p, 0)]]
+
+    if fmt == 'lackey':
+        # Địa chỉ kết thúc ở dấu phẩy trước kích thước truy cập
+        end = np.flatnonzero(data == ord(','))
+        starts = line_starts[np.searchsorted(line_starts, end, 'right') - 1]
+        kinds = _LACKEY_KINDS
+    else:
+        starts = line_starts
+        # Sau ký tự không trắng cuối dòng (= đầu dòng nếu dòng trống)
+        last = _solid_before(data, newlines, starts)
+        end = np.where(last >= 0, last + 1, starts)
+        kinds = _HEX_KINDS
+    addr, length = _number_before(data, end, _HEX, 16, _MAX_HEX_DIGITS)
+    token = end - length
+    if fmt == 'hex':
+        prefix = ((length > 0) & (token - 2 >= starts) & (data[np.maximum(token - 1, 0)] | 0x20 == ord('x'))
+                  & (data[np.maximum(token - 2, 0)] == ord('0')))
+        token -= 2 * prefix
+    # Địa chỉ phải là 1 token riêng (đầu dòng hoặc sau khoảng trắng)
+    valid = (length > 0) & ((token == starts) | is_space(token - 1))
+
+    # Token đứng trước địa chỉ (nếu có) là loại truy cập khi nó là 1 chữ cái hợp lệ
+    op = _solid_before(data, token, starts)
+    code = kinds[data[np.maximum(op, 0)]]
+    has_kind = (op >= 0) & (code != 0) & ((op == starts) | is_space(op - 1))
+    kind = np.where(has_kind, code, KIND_READ).astype(np.uint8)
+    rest = np.where(has_kind, _solid_before(data, op, starts), op)
+
+    if fmt == 'lackey':
+        # Loại truy cập bắt buộc và là token đầu dòng
+        valid &= has_kind & (rest < 0)
+        pid = np.full(len(end), PID_NONE, dtype=np.int64)
+    else:
+        value, digits = _number_before(data, rest + 1, _DEC, 10, _MAX_PID_DIGITS)
+        pid_start = rest + 1 - digits
+        # Token còn lại (nếu có) phải là pid và là token đầu dòng
+        has_pid = rest >= 0
+        valid &= ~has_pid | ((digits > 0) & (_solid_before(data, pid_start, starts) < 0)
+                             & ((pid_start == starts) | is_space(pid_start - 1)))
+        pid = np.where(has_pid, value.astype(np.int64), PID_NONE)
+    return addr[valid], kind[valid], pid[valid]
+
+
+def iter_blocks(path, block_bytes=BLOCK_BYTES):
+    """Yield các khối byte gồm các dòng đầy đủ của file (giải nén nếu cần)"""
+    compression = detect_compression(path)
+    tail = b''
+    with open_text(path, compression if compression in ('gzip', 'zstd') else 'text') as f:
+        while True:
+            block = f.read(block_bytes)
+            if not block:
+                break
+            block = tail + block
+            # Dòng cuối có thể bị cắt ngang giữa 2 khối -> giữ lại cho khối sau
+            cut = block.rfind(b'\n') + 1
+            tail = block[cut:]
+            if cut:
+                yield block[:cut]
+    if tail:
+        yield tail + b'\n'
+
+
+def iter_accesses(path, fmt, block_bytes=BLOCK_BYTES):
+    """Yield (addr, kind, pid) cho từng khối của trace địa chỉ"""
+    if fmt not in FORMATS:
+        raise ValueError(f"Định dạng phải là một trong {FORMATS}")
+    header_pid = None
+    for block in iter_blocks(path, block_bytes):
+        addr, kind, pid = parse_block(block, fmt)
+        if fmt == 'lackey':
+            if header_pid is None:
+                match = _LACKEY_PID.search(block)
+                header_pid = int(match.group(1)) if match else PID_NONE
+            pid.fill(header_pid)
+        yield addr, kind, pid
+
+
+def translate(addr, kind, pid, page_size=PAGE_SIZE, access=None, namespace=False, default_pid=0):
+    """
+    Lọc theo loại truy cập và đổi địa chỉ -> page id (mảng int64).
+    namespace=True ghép pid vào page id; dòng không có pid dùng default_pid.
+    """
+    shift = np.uint64(page_shift(page_size))
+    if access is not None:
+        keep = access_filter(access)[kind]
+        addr, pid = addr[keep], pid[keep]
+    pages = (addr >> shift).astype(np.int64)
+    if namespace:
+        pid = np.where(pid == PID_NONE, default_pid, pid)
+        pages |= pid << PID_SHIFT
+    return pages
+
+
+def iter_address_chunks(path, fmt, page_size=PAGE_SIZE, access=None, namespace=False, default_pid=0,
+                        block_bytes=BLOCK_BYTES):
+    """Generator các chunk page id (mảng int64) của trace địa chỉ, giống core.trace.iter_trace_chunks"""
+    page_shift(page_size)
+    access_filter(access)
+    for addr, kind, pid in iter_accesses(path, fmt, block_bytes):
+        pages = translate(addr, kind, pid, page_size, access, namespace, default_pid)
+        if len(pages):
+            yield pages
+
+
+def load_addresses(path, fmt, page_size=PAGE_SIZE, access=None, namespace=False, default_pid=0):
+    """Nạp cả trace địa chỉ thành 1 mảng page id"""
+    chunks = list(iter_address_chunks(path, fmt, page_size, access, namespace, default_pid))
+    return np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.int64)
+
+
+def compare_page_sizes(path, fmt, page_sizes, policies, capacities, access=None, namespace=False, default_pid=0,
+                       compact=False, instrumented=False):
+    """
+    Chạy mọi (page size, thuật toán, capacity) trong 1 lượt đọc / parse trace:
+    mỗi khối chỉ được parse 1 lần rồi dịch sang page id cho từng page size.
+    Trả về list row (cột của core.replay.simulate thêm 'page_size').
+    Không dùng được thuật toán offline (cần biết trước cả trace).
+    """
+    from core import engine, registry
+
+    offline = [name for name in policies if registry.get(name).offline]
+    if offline:
+        raise ValueError(f"{', '.join(offline)} cần cả trace, không chạy được khi so sánh page size")
+    for page_size in page_sizes:
+        page_shift(page_size)
+    access_filter(access)
+    engines = {page_size: engine.create(policies, capacities, None, compact, instrumented)
+               for page_size in page_sizes}
+    for addr, kind, pid in iter_accesses(path, fmt):
+        for page_size, runner in engines.items():
+            runner.feed(translate(addr, kind, pid, page_size, access, namespace, default_pid))
+    rows = []
+    for page_size, runner in engines.items():
+        for row in runner.results():
+            row['page_size'] = page_size
+            rows.append(row)
+    return rows
@@ -1,7 +1,30 @@
 # core/algorithms.py
 import collections
+import copy
+import heapq
+import sys
+import time
+from array import array
+
+# Giá trị đánh dấu "không có page bị xóa" trong mảng evicted của replay()
+EVICT_NONE = -1
 
 class PagingAlgorithm:
+    # __slots__ ở mọi lớp để không tốn thêm __dict__ cho mỗi instance
+    __slots__ = ('capacity', 'hits', 'misses', 'last_evicted', 'last_status', 'stats', 'probes')
+
+    # True nếu thuật toán cần biết trước toàn bộ trace (truyền vào constructor)
+    offline = False
+    # True nếu access() trả về "STEP" mỗi lần kim quét qua 1 frame (CLOCK)
+    sweeps = False
+    # Capacity nhỏ nhất constructor chấp nhận
+    min_capacity = 1
+    # Slot chứa dữ liệu đầu vào theo trace (OPT), không tính vào memory_usage()
+    input_slots = ()
+    # Số probe cố định của 1 lần HIT, tính gộp trong probe_count() thay vì
+    # đếm từng lần để đường HIT không tốn gì khi tắt đo đạc
+    hit_probes = 0
+
     def __init__(self, capacity):
         self.capacity = capacity
         self.hits = 0
@@ -9,6 +32,12 @@ class PagingAlgorithm:
         # Snapshot lưu lại kết quả của bước vừa chạy
         self.last_evicted = None 
         self.last_status = None
+        # core.instrument.Stats khi bật đo đạc, None khi tắt
+        self.stats = None
+        # Số thao tác (tra cứu / thêm / xóa) trên các bảng băm theo page, chỉ
+        # tính các lần MISS / xóa và chỉ đếm khi bật đo đạc (xem probe_count()).
+        # Vòng lặp replay() chuyên biệt cộng 1 lần ở cuối mỗi chunk.
+        self.probes = 0
 
     def access(self, page):
         """Trả về (status, evicted)"""
@@ -17,50 +46,268 @@ class PagingAlgorithm:
     def get_cache_state(self):
         pass
 
+    def probe_count(self):
+        """Tổng số probe: phần đếm khi MISS cộng hit_probes cho mỗi lần HIT"""
+        return self.probes + self.hit_probes * self.hits
+
+    def remove(self, page):
+        """
+        Xóa page khỏi cache mà không tính HIT/MISS (dùng bởi core.hierarchy).
+        Trả về True nếu page đang nằm trong cache.
+        """
+        raise NotImplementedError(f"{type(self).__name__} không hỗ trợ remove()")
+
+    def replay(self, pages, hit_mask, evicted):
+        """
+        Chạy cả một đoạn trace trong 1 lần gọi (dùng bởi core.replay.run_trace).
+        hit_mask[i] = True nếu request i HIT, evicted[i] = page bị xóa
+        (giữ nguyên EVICT_NONE nếu không xóa). Lớp con override _replay()
+        bằng vòng lặp chuyên biệt để không tạo tuple (status, evicted) cho
+        mỗi request. Khi bật đo đạc (self.stats), thời gian được đo trên
+        chính vòng lặp đó, 1 lần cho cả chunk.
+        """
+        stats = self.stats
+        if stats is None:
+            return self._replay(pages, hit_mask, evicted)
+        start = time.perf_counter_ns()
+        self._replay(pages, hit_mask, evicted)
+        stats.record_chunk(len(pages), time.perf_counter_ns() - start)
+
+    def _replay(self, pages, hit_mask, evicted):
+        access = self.access
+        for i, page in enumerate(pages):
+            status, out = access(page)
+            while status == "STEP":
+                status, out = access(page)
+            if status == "HIT":
+                hit_mask[i] = True
+            elif out is not None:
+                evicted[i] = out
+
+    def memory_usage(self):
+        """
+        Ước lượng số byte trạng thái của thuật toán (đi đệ quy qua các container).
+        Không tính input_slots: chúng tỉ lệ với độ dài trace, không với capacity.
+        """
+        seen = set()
+        total = sys.getsizeof(self)
+        for cls in type(self).__mro__:
+            for name in getattr(cls, '__slots__', ()):
+                if name not in PagingAlgorithm.__slots__ and name not in self.input_slots:
+                    total += _deep_sizeof(getattr(self, name, None), seen)
+        return total
+
+    def bytes_per_frame(self):
+        return self.memory_usage() / self.capacity if self.capacity else 0.0
+
+
+def _deep_sizeof(obj, seen):
+    # Mỗi object chỉ tính 1 lần; None/bool và int nhỏ được Python cache sẵn
+    if obj is None or id(obj) in seen:
+        return 0
+    if isinstance(obj, int) and -5 <= obj <= 256:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            size += _deep_sizeof(k, seen) + _deep_sizeof(v, seen)
+    elif isinstance(obj, (list, tuple, set, frozenset, collections.deque)):
+        for item in obj:
+            size += _deep_sizeof(item, seen)
+    return size
+
+
+def _live_entries(entries, stale):
+    """
+    Các entry còn hiệu lực theo thứ tự cũ -> mới. stale: page -> số entry đã
+    bị remove() của page đó (luôn cũ hơn entry còn hiệu lực của cùng page).
+    """
+    skip = dict(stale)
+    live = []
+    for page in entries:
+        if skip.get(page):
+            skip[page] -= 1
+        else:
+            live.append(page)
+    return live
+
+
+def _drop_stale(stale, page):
+    n = stale[page]
+    if n == 1:
+        del stale[page]
+    else:
+        stale[page] = n - 1
+
 # --- FIFO, LIFO, LRU, LFU (Giữ nguyên logic cũ, chỉ clean code) ---
+# remove() của FIFO / LIFO xóa lười: page chỉ bị bỏ khỏi members và được đếm
+# trong stale, entry trong deque / list bị bỏ qua khi tới lượt xóa (O(1)
+# thay cho deque.remove / list.remove O(capacity)). Khi số entry cũ vượt số
+# page trong cache thì dựng lại deque / list (O(1) khấu hao).
 class FIFO(PagingAlgorithm):
+    __slots__ = ('cache', 'members', 'stale')
+    # HIT: kiểm tra members
+    hit_probes = 1
+
     def __init__(self, capacity):
         super().__init__(capacity)
         self.cache = collections.deque()
+        # Set đi kèm deque để check membership trong O(1)
+        self.members = set()
+        self.stale = {}
 
     def access(self, page):
-        if page in self.cache:
+        if page in self.members:
             self.hits += 1
             return "HIT", None
         
         self.misses += 1
         evicted = None
-        if len(self.cache) >= self.capacity:
+        if len(self.members) >= self.capacity:
             evicted = self.cache.popleft()
+            if self.stale:
+                evicted = self._skip_stale(evicted)
+            self.members.discard(evicted)
         
         self.cache.append(page)
+        self.members.add(page)
+        if self.stats is not None:
+            # Kiểm tra + add khi MISS, discard khi xóa
+            self.probes += 2 if evicted is None else 3
         return "MISS", evicted
 
+    def _skip_stale(self, out):
+        # Entry cũ của 1 page luôn đứng trước entry còn hiệu lực của page đó
+        stale = self.stale
+        while out in stale:
+            if self.stats is not None:
+                self.probes += 2
+            _drop_stale(stale, out)
+            out = self.cache.popleft()
+        return out
+
+    def _replay(self, pages, hit_mask, evicted):
+        cache, members, capacity = self.cache, self.members, self.capacity
+        hits = evictions = 0
+        for i, page in enumerate(pages):
+            if page in members:
+                hits += 1
+                hit_mask[i] = True
+                continue
+            if len(members) >= capacity:
+                evictions += 1
+                out = cache.popleft()
+                if self.stale:
+                    out = self._skip_stale(out)
+                members.discard(out)
+                evicted[i] = out
+            cache.append(page)
+            members.add(page)
+        misses = len(pages) - hits
+        if self.stats is not None:
+            # Kiểm tra + add khi MISS, discard khi xóa (HIT: xem hit_probes)
+            self.probes += 2 * misses + evictions
+        self.hits += hits
+        self.misses += misses
+
+    def remove(self, page):
+        if page not in self.members:
+            return False
+        self.members.discard(page)
+        self.stale[page] = self.stale.get(page, 0) + 1
+        if len(self.cache) > 2 * len(self.members) + 8:
+            self.cache = collections.deque(_live_entries(self.cache, self.stale))
+            self.stale = {}
+        return True
+
     def get_cache_state(self):
-        return list(self.cache)
+        return _live_entries(self.cache, self.stale) if self.stale else list(self.cache)
 
 class LIFO(PagingAlgorithm):
+    __slots__ = ('cache', 'members', 'stale')
+    # HIT: kiểm tra members
+    hit_probes = 1
+
     def __init__(self, capacity):
         super().__init__(capacity)
         self.cache = []
+        # Set đi kèm list để check membership trong O(1)
+        self.members = set()
+        self.stale = {}
 
     def access(self, page):
-        if page in self.cache:
+        if page in self.members:
             self.hits += 1
             return "HIT", None
         
         self.misses += 1
         evicted = None
-        if len(self.cache) >= self.capacity:
+        if len(self.members) >= self.capacity:
             evicted = self.cache.pop()
+            if self.stale:
+                evicted = self._skip_stale(evicted)
+            self.members.discard(evicted)
         
         self.cache.append(page)
+        self.members.add(page)
+        if self.stats is not None:
+            # Kiểm tra + add khi MISS, discard khi xóa
+            self.probes += 2 if evicted is None else 3
         return "MISS", evicted
 
+    def _skip_stale(self, out):
+        # Entry còn hiệu lực của 1 page luôn mới nhất (gần đỉnh nhất) nên
+        # entry ở đỉnh là entry cũ khi page không còn trong members
+        while out not in self.members:
+            if self.stats is not None:
+                self.probes += 2
+            _drop_stale(self.stale, out)
+            out = self.cache.pop()
+        return out
+
+    def _replay(self, pages, hit_mask, evicted):
+        cache, members, capacity = self.cache, self.members, self.capacity
+        hits = evictions = 0
+        for i, page in enumerate(pages):
+            if page in members:
+                hits += 1
+                hit_mask[i] = True
+                continue
+            if len(members) >= capacity:
+                evictions += 1
+                out = cache.pop()
+                if self.stale:
+                    out = self._skip_stale(out)
+                members.discard(out)
+                evicted[i] = out
+            cache.append(page)
+            members.add(page)
+        misses = len(pages) - hits
+        if self.stats is not None:
+            # Kiểm tra + add khi MISS, discard khi xóa (HIT: xem hit_probes)
+            self.probes += 2 * misses + evictions
+        self.hits += hits
+        self.misses += misses
+
+    def remove(self, page):
+        if page not in self.members:
+            return False
+        self.members.discard(page)
+        self.stale[page] = self.stale.get(page, 0) + 1
+        if len(self.cache) > 2 * len(self.members) + 8:
+            self.cache[:] = _live_entries(self.cache, self.stale)
+            self.stale = {}
+        return True
+
     def get_cache_state(self):
-        return self.cache
+        return _live_entries(self.cache, self.stale) if self.stale else self.cache
 
 class LRU(PagingAlgorithm):
+    __slots__ = ('cache',)
+    # HIT: kiểm tra + move_to_end
+    hit_probes = 2
+
     def __init__(self, capacity):
         super().__init__(capacity)
         self.cache = collections.OrderedDict()
@@ -77,40 +324,202 @@ class LRU(PagingAlgorithm):
             evicted, _ = self.cache.popitem(last=False)
         
         self.cache[page] = True
+        if self.stats is not None:
+            # Kiểm tra + chèn khi MISS, popitem khi xóa
+            self.probes += 2 if evicted is None else 3
         return "MISS", evicted
 
+    def _replay(self, pages, hit_mask, evicted):
+        cache, capacity = self.cache, self.capacity
+        move_to_end, popitem = cache.move_to_end, cache.popitem
+        hits = evictions = 0
+        for i, page in enumerate(pages):
+            if page in cache:
+                hits += 1
+                hit_mask[i] = True
+                move_to_end(page)
+                continue
+            if len(cache) >= capacity:
+                evictions += 1
+                evicted[i] = popitem(last=False)[0]
+            cache[page] = True
+        misses = len(pages) - hits
+        if self.stats is not None:
+            # Kiểm tra + chèn khi MISS, popitem khi xóa (HIT: xem hit_probes)
+            self.probes += 2 * misses + evictions
+        self.hits += hits
+        self.misses += misses
+
+    def remove(self, page):
+        return self.cache.pop(page, None) is not None
+
     def get_cache_state(self):
         return list(self.cache.keys())
 
 class LFU(PagingAlgorithm):
+    """
+    LFU dùng các "bucket" theo tần suất: freq -> (members, heap).
+    - members: dict page -> time của các page đang có tần suất freq
+    - heap: min-heap (time, page) để lấy page vào sớm nhất trong bucket
+    Hit / insert O(log n) vì mỗi lần đều heappush vào heap của bucket mới;
+    evict chỉ đụng tới bucket min_freq thay vì quét toàn bộ cache. Dùng heap
+    theo time (thay vì danh sách O(1) theo thứ tự vào bucket) để giữ nguyên
+    tie-break: cùng freq thì page được đưa vào cache sớm nhất (time nhỏ nhất)
+    bị xóa, không phải page lên freq đó sớm nhất.
+    """
+    __slots__ = ('cache', 'time', 'timer', 'buckets', 'min_freq')
+    # Probe chỉ tính các dict theo page, không tính buckets theo freq.
+    # HIT: cache.get, del members, cache[page], time[page], members[page]
+    hit_probes = 5
+
     def __init__(self, capacity):
         super().__init__(capacity)
-        self.cache = {} 
+        # dict giữ thứ tự chèn -> cũng chính là thứ tự theo time
+        self.cache = {}
         self.time = {}
         self.timer = 0
+        self.buckets = {}
+        self.min_freq = 0
+
+    def _bucket_add(self, page, freq):
+        bucket = self.buckets.get(freq)
+        if bucket is None:
+            bucket = self.buckets[freq] = ({}, [])
+        members, heap = bucket
+        t = self.time[page]
+        members[page] = t
+        heapq.heappush(heap, (t, page))
+        # Dọn các entry cũ (page đã rời bucket) khi heap phình quá to
+        if len(heap) > 2 * len(members) + 8:
+            heap[:] = [(v, k) for k, v in members.items()]
+            heapq.heapify(heap)
+            if self.stats is not None:
+                self.stats.count('heap_rebuilds')
+
+    def _bucket_remove(self, page, freq):
+        members = self.buckets[freq][0]
+        del members[page]
+        if not members:
+            del self.buckets[freq]
+            if self.min_freq == freq:
+                self.min_freq = freq + 1
 
     def access(self, page):
         self.timer += 1
         if page in self.cache:
             self.hits += 1
-            self.cache[page] += 1
+            freq = self.cache[page]
+            self._bucket_remove(page, freq)
+            self.cache[page] = freq + 1
+            self._bucket_add(page, freq + 1)
             return "HIT", None
-        
+
         self.misses += 1
         evicted = None
         if len(self.cache) >= self.capacity:
-            evicted = min(self.cache, key=lambda k: (self.cache[k], self.time[k]))
+            members, heap = self.buckets[self.min_freq]
+            # Bỏ qua các entry đã lỗi thời (page đã tăng freq hoặc bị xóa)
+            pops = 0
+            while True:
+                t, candidate = heapq.heappop(heap)
+                pops += 1
+                if members.get(candidate) == t:
+                    break
+            if self.stats is not None:
+                self.stats.evict(pops)
+                # members.get mỗi lần pop, del members / cache / time
+                self.probes += pops + 3
+            evicted = candidate
+            self._bucket_remove(evicted, self.min_freq)
             del self.cache[evicted]
             del self.time[evicted]
-        
+
         self.cache[page] = 1
         self.time[page] = self.timer
+        self._bucket_add(page, 1)
+        self.min_freq = 1
+        if self.stats is not None:
+            # cache.get, cache[page], time[page], members[page]
+            self.probes += 4
         return "MISS", evicted
 
+    def _replay(self, pages, hit_mask, evicted):
+        # Inline _bucket_add/_bucket_remove để giảm chi phí gọi hàm mỗi request
+        cache, time, buckets = self.cache, self.time, self.buckets
+        heappush, heappop, heapify = heapq.heappush, heapq.heappop, heapq.heapify
+        capacity = self.capacity
+        timer, min_freq = self.timer, self.min_freq
+        hits = evictions = pops = rebuilds = 0
+        for i, page in enumerate(pages):
+            timer += 1
+            freq = cache.get(page)
+            if freq is not None:
+                hits += 1
+                hit_mask[i] = True
+                members = buckets[freq][0]
+                del members[page]
+                if not members:
+                    del buckets[freq]
+                    if min_freq == freq:
+                        min_freq = freq + 1
+                freq += 1
+                cache[page] = freq
+                t = time[page]
+            else:
+                if len(cache) >= capacity:
+                    evictions += 1
+                    members, heap = buckets[min_freq]
+                    while True:
+                        t, out = heappop(heap)
+                        pops += 1
+                        if members.get(out) == t:
+                            break
+                    del members[out]
+                    if not members:
+                        del buckets[min_freq]
+                    del cache[out]
+                    del time[out]
+                    evicted[i] = out
+                freq = min_freq = 1
+                cache[page] = 1
+                t = time[page] = timer
+
+            bucket = buckets.get(freq)
+            if bucket is None:
+                bucket = buckets[freq] = ({}, [])
+            members, heap = bucket
+            members[page] = t
+            heappush(heap, (t, page))
+            if len(heap) > 2 * len(members) + 8:
+                rebuilds += 1
+                heap[:] = [(v, k) for k, v in members.items()]
+                heapify(heap)
+
+        self.timer, self.min_freq = timer, min_freq
+        misses = len(pages) - hits
+        self.hits += hits
+        self.misses += misses
+        if self.stats is not None:
+            # Như access(): 4 khi MISS, pops + 3 khi xóa (HIT: xem hit_probes)
+            self.probes += 4 * misses + pops + 3 * evictions
+            self.stats.count('evictions', evictions)
+            self.stats.count('evict_search', pops)
+            self.stats.count('heap_rebuilds', rebuilds)
+
+    def remove(self, page):
+        freq = self.cache.pop(page, None)
+        if freq is None:
+            return False
+        del self.time[page]
+        self._bucket_remove(page, freq)
+        # min_freq phải luôn trỏ tới 1 bucket còn page
+        if self.buckets and self.min_freq not in self.buckets:
+            self.min_freq = min(self.buckets)
+        return True
+
     def get_cache_state(self):
-        # Sắp xếp theo thứ tự thêm vào (dựa trên time) để hiển thị ổn định
-        sorted_keys = sorted(self.cache.keys(), key=lambda k: self.time[k])
-        return [{'val': k, 'freq': self.cache[k]} for k in sorted_keys]
+        # self.cache đã theo thứ tự thêm vào (time) nên không cần sort
+        return [{'val': k, 'freq': f} for k, f in self.cache.items()]
 
 # # --- CLOCK (Logic chuẩn vòng tròn) ---
 # class CLOCK(PagingAlgorithm):
@@ -161,30 +570,61 @@ class LFU(PagingAlgorithm):
 #         return self.frames
 
 class CLOCK(PagingAlgorithm):
+    __slots__ = ('frames', 'hand', 'index', 'last_sweep', 'free')
+    sweeps = True
+    # HIT: index.get
+    hit_probes = 1
+
     def __init__(self, capacity):
         super().__init__(capacity)
         self.frames = [{'val': None, 'bit': 0} for _ in range(capacity)]
         self.hand = 0
+        # Chỉ mục page -> vị trí frame để check HIT trong O(1)
+        self.index = {}
+        # Số frame kim đã đi qua ở lần access_complete gần nhất
+        self.last_sweep = 0
+        # Frame bị remove() làm trống: MISS lấp vào đây trước khi quét
+        # (không di chuyển kim), để cache không chạy dưới capacity
+        self.free = []
+
+    def _fill_free(self, page):
+        i = self.free.pop()
+        frame = self.frames[i]
+        frame['val'] = page
+        frame['bit'] = 1
+        self.index[page] = i
+        if self.stats is not None:
+            # index.get + gán index
+            self.probes += 2
 
     def access(self, page):
         # 1. Check HIT
-        for i in range(self.capacity):
-            if self.frames[i]['val'] == page:
-                self.hits += 1
-                self.frames[i]['bit'] = 1
-                return "HIT", None
+        i = self.index.get(page)
+        if i is not None:
+            self.hits += 1
+            self.frames[i]['bit'] = 1
+            return "HIT", None
 
         # 2. MISS
         # Lưu ý: Không cộng misses ngay tại đây vì có thể tốn nhiều bước quét
         # Chúng ta sẽ kiểm tra xem vị trí hiện tại có xử lý được luôn không
+        # Probe khi bật đo đạc: index.get mỗi lần gọi (cả bước STEP), gán
+        # index khi MISS, del index khi xóa
+        if self.free:
+            self.misses += 1
+            self._fill_free(page)
+            return "MISS", None
         
         current = self.frames[self.hand]
         
         # Trường hợp 1: Slot trống -> Điền vào (Xong luôn)
         if current['val'] is None:
             self.misses += 1
+            if self.stats is not None:
+                self.probes += 2
             current['val'] = page
             current['bit'] = 1
+            self.index[page] = self.hand
             self.hand = (self.hand + 1) % self.capacity
             return "MISS", None
 
@@ -192,15 +632,805 @@ class CLOCK(PagingAlgorithm):
         if current['bit'] == 1:
             current['bit'] = 0 
             self.hand = (self.hand + 1) % self.capacity
+            if self.stats is not None:
+                self.probes += 1
             return "STEP", None # Trạng thái trung gian
 
         # Trường hợp 3: Bit == 0 -> Thay thế (Xong luôn)
         self.misses += 1
+        if self.stats is not None:
+            self.probes += 3
         evicted = current['val']
+        del self.index[evicted]
         current['val'] = page
         current['bit'] = 1
+        self.index[page] = self.hand
         self.hand = (self.hand + 1) % self.capacity
         return "MISS", evicted
 
+    def access_complete(self, page):
+        """
+        Chạy hết vòng quét trong 1 lần gọi (không trả về "STEP").
+        Trả về (status, evicted, swept) với swept = số frame kim đã đi qua.
+        """
+        frames = self.frames
+        i = self.index.get(page)
+        if i is not None:
+            self.hits += 1
+            frames[i]['bit'] = 1
+            self.last_sweep = 0
+            return "HIT", None, 0
+
+        self.misses += 1
+        if self.free:
+            self._fill_free(page)
+            self.last_sweep = 0
+            return "MISS", None, 0
+        hand = self.hand
+        swept = 0
+        # Hạ bit các frame có bit = 1 cho tới khi gặp slot trống hoặc bit = 0
+        while True:
+            current = frames[hand]
+            swept += 1
+            if current['val'] is None or current['bit'] == 0:
+                break
+            current['bit'] = 0
+            hand = (hand + 1) % self.capacity
+
+        evicted = current['val']
+        if evicted is not None:
+            del self.index[evicted]
+        current['val'] = page
+        current['bit'] = 1
+        self.index[page] = hand
+        self.hand = (hand + 1) % self.capacity
+        self.last_sweep = swept
+        if self.stats is not None:
+            self.stats.sweep(swept)
+            # index.get + gán index, del index khi xóa
+            self.probes += 2 if evicted is None else 3
+        return "MISS", evicted, swept
+
+    def _replay(self, pages, hit_mask, evicted):
+        # Giống access_complete nhưng gộp vào 1 vòng lặp với biến cục bộ
+        frames, index, capacity, free = self.frames, self.index, self.capacity, self.free
+        hand = self.hand
+        hits = evictions = cleared = filled = 0
+        for i, page in enumerate(pages):
+            j = index.get(page)
+            if j is not None:
+                hits += 1
+                hit_mask[i] = True
+                frames[j]['bit'] = 1
+                continue
+            if free:
+                filled += 1
+                self._fill_free(page)
+                continue
+            while True:
+                current = frames[hand]
+                if current['val'] is None or current['bit'] == 0:
+                    break
+                cleared += 1
+                current['bit'] = 0
+                hand = (hand + 1) % capacity
+            out = current['val']
+            if out is not None:
+                evictions += 1
+                del index[out]
+                evicted[i] = out
+            current['val'] = page
+            current['bit'] = 1
+            index[page] = hand
+            hand = (hand + 1) % capacity
+        self.hand = hand
+        misses = len(pages) - hits
+        self.hits += hits
+        self.misses += misses
+        if self.stats is not None:
+            # index.get + gán index khi MISS, del index khi xóa (_fill_free
+            # tự đếm phần lấp frame trống, HIT: xem hit_probes)
+            self.probes += 2 * (misses - filled) + evictions
+            # Mỗi lần MISS (trừ khi lấp frame trống) kim đi qua các frame bị hạ bit + 1 frame được thay
+            self.stats.count('sweeps', misses - filled)
+            self.stats.count('hand_advances', cleared + misses - filled)
+
+    def remove(self, page):
+        i = self.index.pop(page, None)
+        if i is None:
+            return False
+        self.frames[i]['val'] = None
+        self.frames[i]['bit'] = 0
+        self.free.append(i)
+        return True
+
+    def get_cache_state(self):
+        return self.frames
+
+class OPT(PagingAlgorithm):
+    """
+    Thuật toán tối ưu Bélády: xóa page có lần dùng tiếp theo xa nhất.
+    Cần biết trước toàn bộ trace: next_use[i] = vị trí request kế tiếp
+    của cùng page (len(trace) nếu không còn dùng lại), tính bằng 1 lượt
+    duyệt ngược. Max-heap (-next_use, page) cho phép evict trong O(log capacity).
+    """
+    __slots__ = ('trace', 'next_use', 'pos', 'cache', 'heap')
+    offline = True
+    input_slots = ('trace', 'next_use')
+    # HIT: kiểm tra + gán cache
+    hit_probes = 2
+
+    def __init__(self, capacity, trace):
+        super().__init__(capacity)
+        self.trace = trace
+        self.next_use = self._build_next_use(trace)
+        self.pos = 0
+        # page -> vị trí lần dùng tiếp theo
+        self.cache = {}
+        self.heap = []
+
+    @staticmethod
+    def _build_next_use(trace):
+        seq = trace.tolist() if hasattr(trace, 'tolist') else list(trace)
+        n = len(seq)
+        next_use = array('q', [n]) * n
+        seen = {}
+        for i in range(n - 1, -1, -1):
+            page = seq[i]
+            next_use[i] = seen.get(page, n)
+            seen[page] = i
+        return next_use
+
+    def __deepcopy__(self, memo):
+        # trace / next_use không đổi sau khi khởi tạo -> dùng chung, chỉ copy trạng thái cache
+        clone = copy.copy(self)
+        clone.cache = dict(self.cache)
+        clone.heap = list(self.heap)
+        return clone
+
+    def _push(self, page, nxt):
+        heap = self.heap
+        heapq.heappush(heap, (-nxt, page))
+        # Dọn các entry cũ (next_use đã đổi hoặc page đã bị xóa)
+        if len(heap) > 2 * len(self.cache) + 8:
+            heap[:] = [(-v, k) for k, v in self.cache.items()]
+            heapq.heapify(heap)
+            if self.stats is not None:
+                self.stats.count('heap_rebuilds')
+
+    def _pop_victim(self):
+        cache, heap = self.cache, self.heap
+        pops = 0
+        while True:
+            key, page = heapq.heappop(heap)
+            pops += 1
+            if cache.get(page) == -key:
+                del cache[page]
+                if self.stats is not None:
+                    self.stats.evict(pops)
+                    # cache.get mỗi lần pop, del cache
+                    self.probes += pops + 1
+                return page
+
+    def access(self, page):
+        if self.pos >= len(self.next_use) or self.trace[self.pos] != page:
+            raise ValueError(f"OPT: request {page} không khớp trace tại vị trí {self.pos}")
+        nxt = self.next_use[self.pos]
+        self.pos += 1
+
+        if page in self.cache:
+            self.hits += 1
+            self.cache[page] = nxt
+            self._push(page, nxt)
+            return "HIT", None
+
+        self.misses += 1
+        evicted = None
+        if len(self.cache) >= self.capacity:
+            evicted = self._pop_victim()
+
+        self.cache[page] = nxt
+        self._push(page, nxt)
+        if self.stats is not None:
+            # Kiểm tra + gán cache
+            self.probes += 2
+        return "MISS", evicted
+
+    def _replay(self, pages, hit_mask, evicted):
+        # pages phải là đoạn tiếp theo của trace đã truyền vào constructor
+        cache, heap, next_use = self.cache, self.heap, self.next_use
+        heappush, heappop, heapify = heapq.heappush, heapq.heappop, heapq.heapify
+        capacity, pos = self.capacity, self.pos
+        if pos + len(pages) > len(next_use):
+            raise ValueError("OPT: replay vượt quá độ dài trace")
+        hits = evictions = pops = rebuilds = 0
+        for i, page in enumerate(pages):
+            nxt = next_use[pos]
+            pos += 1
+            if page in cache:
+                hits += 1
+                hit_mask[i] = True
+            elif len(cache) >= capacity:
+                evictions += 1
+                while True:
+                    key, out = heappop(heap)
+                    pops += 1
+                    if cache.get(out) == -key:
+                        break
+                del cache[out]
+                evicted[i] = out
+            cache[page] = nxt
+            heappush(heap, (-nxt, page))
+            if len(heap) > 2 * len(cache) + 8:
+                rebuilds += 1
+                heap[:] = [(-v, k) for k, v in cache.items()]
+                heapify(heap)
+        self.pos = pos
+        misses = len(pages) - hits
+        self.hits += hits
+        self.misses += misses
+        if self.stats is not None:
+            # Như access(): 2 khi MISS, pops + 1 khi xóa (HIT: xem hit_probes)
+            self.probes += 2 * misses + pops + evictions
+            self.stats.count('evictions', evictions)
+            self.stats.count('evict_search', pops)
+            self.stats.count('heap_rebuilds', rebuilds)
+
+    def get_cache_state(self):
+        return list(self.cache)
+
+# --- Các thuật toán chống "scan": ARC, 2Q, LIRS ---
+# get_cache_state() của nhóm này trả về dict để UI vẽ nhiều danh sách:
+#   {'lists': {tên: [page, ...]}, 'ghosts': {tên: [page, ...]}, 'params': {tên: giá trị}}
+# 'lists' là các page đang nằm trong cache, 'ghosts' chỉ lưu lịch sử (không chiếm frame).
+
+class ARC(PagingAlgorithm):
+    """
+    Adaptive Replacement Cache (Megiddo & Modha).
+    T1: page mới dùng 1 lần, T2: page dùng >= 2 lần (đều là LRU).
+    B1 / B2: ghost của T1 / T2. p = kích thước mục tiêu của T1, tự điều chỉnh
+    khi HIT trong ghost list. Mọi thao tác O(1) nhờ OrderedDict.
+    """
+    __slots__ = ('t1', 't2', 'b1', 'b2', 'p')
+    # Probe = mọi thao tác theo page trên T1 / T2 / B1 / B2 (kiểm tra, thêm,
+    # xóa, di chuyển). HIT: 3
+    hit_probes = 3
+
+    def __init__(self, capacity):
+        super().__init__(capacity)
+        self.t1 = collections.OrderedDict()
+        self.t2 = collections.OrderedDict()
+        self.b1 = collections.OrderedDict()
+        self.b2 = collections.OrderedDict()
+        self.p = 0.0
+
+    def _replace(self, in_b2):
+        # Đẩy page LRU của T1 hoặc T2 sang ghost list tương ứng (2 probe)
+        if self.stats is not None:
+            self.probes += 2
+        t1 = self.t1
+        if t1 and ((in_b2 and len(t1) == self.p) or len(t1) > self.p):
+            evicted, _ = t1.popitem(last=False)
+            self.b1[evicted] = True
+        else:
+            evicted, _ = self.t2.popitem(last=False)
+            self.b2[evicted] = True
+        return evicted
+
+    def access(self, page):
+        t1, t2, b1, b2, c = self.t1, self.t2, self.b1, self.b2, self.capacity
+
+        if page in t1:
+            self.hits += 1
+            del t1[page]
+            t2[page] = True
+            return "HIT", None
+        if page in t2:
+            self.hits += 1
+            t2.move_to_end(page)
+            return "HIT", None
+
+        self.misses += 1
+        # Chỉ đếm probe khi bật đo đạc
+        counting = self.stats is not None
+        if page in b1:
+            if counting:
+                self.probes += 5
+            self.p = min(c, self.p + max(len(b2) / len(b1), 1))
+            evicted = self._replace(False)
+            del b1[page]
+            t2[page] = True
+            return "MISS", evicted
+        if page in b2:
+            if counting:
+                self.probes += 6
+            self.p = max(0, self.p - max(len(b1) / len(b2), 1))
+            evicted = self._replace(True)
+            del b2[page]
+            t2[page] = True
+            return "MISS", evicted
+
+        if counting:
+            self.probes += 5
+        evicted = None
+        l1 = len(t1) + len(b1)
+        if l1 == c:
+            if counting:
+                self.probes += 1
+            if len(t1) < c:
+                b1.popitem(last=False)
+                evicted = self._replace(False)
+            else:
+                evicted, _ = t1.popitem(last=False)
+        elif l1 < c:
+            total = l1 + len(t2) + len(b2)
+            if total >= c:
+                if total == 2 * c:
+                    if counting:
+                        self.probes += 1
+                    b2.popitem(last=False)
+                evicted = self._replace(False)
+        t1[page] = True
+        return "MISS", evicted
+
+    def get_cache_state(self):
+        return {
+            'lists': {'T1': list(self.t1), 'T2': list(self.t2)},
+            'ghosts': {'B1': list(self.b1), 'B2': list(self.b2)},
+            'params': {'p': round(self.p, 2)},
+        }
+
+
+class TwoQ(PagingAlgorithm):
+    """
+    2Q (Johnson & Shasha), bản đầy đủ.
+    A1in: FIFO cho page mới (tối đa kin), A1out: ghost FIFO của page bị đẩy
+    khỏi A1in (tối đa kout), Am: LRU cho page được dùng lại khi còn trong A1out.
+    Một lượt scan chỉ đi qua A1in nên không đẩy được page nóng trong Am.
+    """
+    __slots__ = ('a1in', 'a1out', 'am', 'kin', 'kout')
+    # Probe = mọi thao tác theo page trên Am / A1in / A1out. HIT: 2
+    hit_probes = 2
+
+    def __init__(self, capacity, kin=None, kout=None):
+        super().__init__(capacity)
+        self.kin = kin if kin is not None else max(1, capacity // 4)
+        self.kout = kout if kout is not None else max(1, capacity // 2)
+        self.a1in = collections.OrderedDict()
+        self.a1out = collections.OrderedDict()
+        self.am = collections.OrderedDict()
+
+    def _reclaim(self):
+        if len(self.am) + len(self.a1in) < self.capacity:
+            return None
+        counting = self.stats is not None
+        if len(self.a1in) > self.kin or not self.am:
+            evicted, _ = self.a1in.popitem(last=False)
+            self.a1out[evicted] = True
+            if len(self.a1out) > self.kout:
+                self.a1out.popitem(last=False)
+                if counting:
+                    self.probes += 1
+            if counting:
+                self.probes += 2
+            return evicted
+        if counting:
+            self.probes += 1
+        evicted, _ = self.am.popitem(last=False)
+        return evicted
+
+    def access(self, page):
+        if page in self.am:
+            self.hits += 1
+            self.am.move_to_end(page)
+            return "HIT", None
+        if page in self.a1in:
+            self.hits += 1
+            return "HIT", None
+
+        self.misses += 1
+        evicted = self._reclaim()
+        if page in self.a1out:
+            del self.a1out[page]
+            self.am[page] = True
+            if self.stats is not None:
+                self.probes += 5
+        else:
+            self.a1in[page] = True
+            if self.stats is not None:
+                self.probes += 4
+        return "MISS", evicted
+
+    def remove(self, page):
+        # _reclaim() chỉ xóa khi A1in + Am đầy nên không cần chỉnh gì thêm
+        return self.am.pop(page, None) is not None or self.a1in.pop(page, None) is not None
+
+    def get_cache_state(self):
+        return {
+            'lists': {'A1in': list(self.a1in), 'Am': list(self.am)},
+            'ghosts': {'A1out': list(self.a1out)},
+            'params': {'Kin': self.kin, 'Kout': self.kout},
+        }
+
+
+# Trạng thái page trong LIRS
+_LIR, _HIR = 0, 1
+
+
+class LIRS(PagingAlgorithm):
+    """
+    LIRS (Jiang & Zhang). Phân page theo "inter-reference recency":
+    - LIR: page dùng lại gần đây, chiếm tối đa lir_size frame
+    - HIR resident: nằm trong hàng đợi Q (hir_size frame), bị xóa trước
+    - HIR non-resident: chỉ còn trong stack S (ghost)
+    S là OrderedDict theo recency (đáy = phần tử đầu). Số ghost trong S được
+    giới hạn bởi ghost_limit để bộ nhớ không tăng vô hạn. Các thao tác O(1)
+    (prune đáy stack là O(1) khấu hao).
+    """
+    __slots__ = ('s', 'q', 'status', 'ghosts', 'lir_size', 'lir_count', 'ghost_limit')
+    min_capacity = 2
+    # Probe = mọi thao tác theo page trên S / Q / status / ghosts. HIT tốn
+    # ít nhất 2 (kiểm tra + đưa lên đỉnh S), phần thêm chỉ đếm khi bật đo đạc
+    hit_probes = 2
+
+    def __init__(self, capacity, hir_ratio=0.01, ghost_limit=None):
+        if capacity < self.min_capacity:
+            raise ValueError("LIRS cần capacity >= 2")
+        super().__init__(capacity)
+        hir_size = min(capacity - 1, max(1, int(capacity * hir_ratio)))
+        self.lir_size = capacity - hir_size
+        self.lir_count = 0
+        self.ghost_limit = ghost_limit if ghost_limit is not None else capacity
+        self.s = collections.OrderedDict()
+        self.q = collections.OrderedDict()
+        # page -> _LIR / _HIR (chỉ page trong cache hoặc trong S)
+        self.status = {}
+        # Các HIR non-resident còn trong S, theo thứ tự cũ -> mới
+        self.ghosts = collections.OrderedDict()
+
+    def _prune(self):
+        # Đáy S luôn phải là LIR: bỏ các HIR ở đáy
+        s, status, ghosts = self.s, self.status, self.ghosts
+        counting = self.stats is not None
+        while s:
+            bottom = next(iter(s))
+            if counting:
+                self.probes += 1
+            if status[bottom] == _LIR:
+                return
+            del s[bottom]
+            if bottom in ghosts:
+                del ghosts[bottom]
+                del status[bottom]
+                if counting:
+                    self.probes += 4
+            elif counting:
+                self.probes += 2
+
+    def _demote_bottom_lir(self):
+        # LIR ở đáy S chuyển thành HIR resident ở cuối Q
+        if self.stats is not None:
+            self.probes += 3
+        bottom, _ = self.s.popitem(last=False)
+        self.status[bottom] = _HIR
+        self.q[bottom] = True
+        self._prune()
+
+    def _add_ghost(self, page):
+        self.ghosts[page] = True
+        if len(self.ghosts) > self.ghost_limit:
+            old, _ = self.ghosts.popitem(last=False)
+            del self.s[old]
+            del self.status[old]
+            if self.stats is not None:
+                self.probes += 3
+        if self.stats is not None:
+            self.probes += 1
+
+    def access(self, page):
+        s, q, status = self.s, self.q, self.status
+        state = status.get(page)
+        resident = state == _LIR or page in q
+
+        if resident:
+            self.hits += 1
+            if state == _LIR:
+                was_bottom = next(iter(s)) == page
+                s.move_to_end(page)
+                if was_bottom:
+                    self._prune()
+            elif page in s:
+                # HIR resident có recency nhỏ -> lên LIR
+                if self.stats is not None:
+                    self.probes += 4
+                s.move_to_end(page)
+                del q[page]
+                status[page] = _LIR
+                self._demote_bottom_lir()
+            else:
+                if self.stats is not None:
+                    self.probes += 3
+                s[page] = True
+                q.move_to_end(page)
+            return "HIT", None
+
+        self.misses += 1
+        counting = self.stats is not None
+        if counting:
+            self.probes += 2
+        if self.lir_count < self.lir_size:
+            # Giai đoạn đầu: page mới đều là LIR
+            if counting:
+                self.probes += 2
+            self.lir_count += 1
+            status[page] = _LIR
+            s[page] = True
+            return "MISS", None
+
+        evicted = None
+        if self.lir_count + len(q) >= self.capacity:
+            evicted, _ = q.popitem(last=False)
+            if evicted in s:
+                self._add_ghost(evicted)
+            else:
+                del status[evicted]
+                if counting:
+                    self.probes += 1
+            if counting:
+                self.probes += 2
+
+        if counting:
+            self.probes += 4
+        if page in self.ghosts:
+            # Non-resident HIR còn trong S -> lên LIR
+            del self.ghosts[page]
+            s.move_to_end(page)
+            status[page] = _LIR
+            self._demote_bottom_lir()
+        else:
+            status[page] = _HIR
+            s[page] = True
+            q[page] = True
+        return "MISS", evicted
+
+    def get_cache_state(self):
+        status = self.status
+        return {
+            'lists': {'LIR': [k for k in self.s if status[k] == _LIR], 'HIR': list(self.q)},
+            'ghosts': {'NR': list(self.ghosts)},
+            'params': {'L_lir': self.lir_size, 'L_hir': self.capacity - self.lir_size},
+        }
+
+# --- Chế độ lưu trữ gọn (compact) ---
+# Trạng thái mỗi frame nằm trong mảng kiểu cố định (array / bytearray) theo
+# vị trí slot, chỉ còn 1 dict page -> slot để tra cứu HIT.
+# Ngân sách bộ nhớ (byte / frame, đo bằng bytes_per_frame() khi cache đầy,
+# page id ngẫu nhiên lớn): CompactCLOCK <= 192, CompactLFU <= 256
+# (so với khoảng 350 của CLOCK và 440 của LFU).
+
+# Slot chưa có page (page id phải là số nguyên không âm)
+EMPTY = -1
+
+
+class CompactCLOCK(PagingAlgorithm):
+    """CLOCK với vals: array('q') và bits: bytearray thay cho list các dict"""
+    __slots__ = ('vals', 'bits', 'index', 'hand', 'last_sweep', 'free')
+    sweeps = True
+    hit_probes = 1
+    MEMORY_BUDGET = 192
+
+    def __init__(self, capacity):
+        super().__init__(capacity)
+        self.vals = array('q', [EMPTY]) * capacity
+        self.bits = bytearray(capacity)
+        self.index = {}
+        self.hand = 0
+        self.last_sweep = 0
+        # Slot bị remove() làm trống (xem CLOCK.free)
+        self.free = []
+
+    def _fill_free(self, page):
+        slot = self.free.pop()
+        self.vals[slot] = page
+        self.bits[slot] = 1
+        self.index[page] = slot
+        if self.stats is not None:
+            self.probes += 2
+
+    def _place(self, page, slot):
+        evicted = None
+        old = self.vals[slot]
+        if old != EMPTY:
+            del self.index[old]
+            evicted = old
+        self.vals[slot] = page
+        self.bits[slot] = 1
+        self.index[page] = slot
+        self.hand = (slot + 1) % self.capacity
+        if self.stats is not None:
+            # Như CLOCK: index.get + gán index, del index khi xóa
+            self.probes += 2 if evicted is None else 3
+        return evicted
+
+    def access(self, page):
+        # Giống CLOCK.access: mỗi lần hạ bit trả về "STEP"
+        slot = self.index.get(page)
+        if slot is not None:
+            self.hits += 1
+            self.bits[slot] = 1
+            return "HIT", None
+
+        if self.free:
+            self.misses += 1
+            self._fill_free(page)
+            return "MISS", None
+        hand = self.hand
+        if self.vals[hand] != EMPTY and self.bits[hand] == 1:
+            self.bits[hand] = 0
+            self.hand = (hand + 1) % self.capacity
+            if self.stats is not None:
+                self.probes += 1
+            return "STEP", None
+
+        self.misses += 1
+        return "MISS", self._place(page, hand)
+
+    def access_complete(self, page):
+        slot = self.index.get(page)
+        if slot is not None:
+            self.hits += 1
+            self.bits[slot] = 1
+            self.last_sweep = 0
+            return "HIT", None, 0
+
+        self.misses += 1
+        if self.free:
+            self._fill_free(page)
+            self.last_sweep = 0
+            return "MISS", None, 0
+        vals, bits, hand = self.vals, self.bits, self.hand
+        swept = 1
+        while vals[hand] != EMPTY and bits[hand] == 1:
+            bits[hand] = 0
+            hand = (hand + 1) % self.capacity
+            swept += 1
+        self.last_sweep = swept
+        if self.stats is not None:
+            self.stats.sweep(swept)
+        return "MISS", self._place(page, hand), swept
+
+    def _replay(self, pages, hit_mask, evicted):
+        vals, bits, index, capacity, free = self.vals, self.bits, self.index, self.capacity, self.free
+        hand = self.hand
+        hits = evictions = cleared = filled = 0
+        for i, page in enumerate(pages):
+            slot = index.get(page)
+            if slot is not None:
+                hits += 1
+                hit_mask[i] = True
+                bits[slot] = 1
+                continue
+            if free:
+                filled += 1
+                self._fill_free(page)
+                continue
+            while bits[hand] and vals[hand] != EMPTY:
+                cleared += 1
+                bits[hand] = 0
+                hand = (hand + 1) % capacity
+            out = vals[hand]
+            if out != EMPTY:
+                evictions += 1
+                del index[out]
+                evicted[i] = out
+            vals[hand] = page
+            bits[hand] = 1
+            index[page] = hand
+            hand = (hand + 1) % capacity
+        self.hand = hand
+        misses = len(pages) - hits
+        self.hits += hits
+        self.misses += misses
+        if self.stats is not None:
+            # Giống CLOCK._replay
+            self.probes += 2 * (misses - filled) + evictions
+            self.stats.count('sweeps', misses - filled)
+            self.stats.count('hand_advances', cleared + misses - filled)
+
+    def remove(self, page):
+        slot = self.index.pop(page, None)
+        if slot is None:
+            return False
+        self.vals[slot] = EMPTY
+        self.bits[slot] = 0
+        self.free.append(slot)
+        return True
+
+    def get_cache_state(self):
+        return [{'val': None if v == EMPTY else v, 'bit': b} for v, b in zip(self.vals, self.bits)]
+
+
+# Khóa trong heap của CompactLFU: (freq, time, slot) gói vào 1 số nguyên
+_SLOT_BITS = 32
+_TIME_BITS = 48
+_SLOT_MASK = (1 << _SLOT_BITS) - 1
+_TIME_MASK = (1 << _TIME_BITS) - 1
+
+
+class CompactLFU(PagingAlgorithm):
+    """
+    LFU với freq / time / vals là array('q') theo slot. Thay cho các bucket,
+    1 min-heap các khóa nguyên ((freq << 48 | time) << 32 | slot) giữ đúng
+    thứ tự (freq, time) của LFU; entry lỗi thời bị bỏ qua khi pop và heap
+    được dựng lại khi phình quá 2 lần số page.
+    """
+    __slots__ = ('vals', 'freq', 'time', 'index', 'heap', 'timer')
+    # Probe: index.get, gán / xóa index. HIT: 1
+    hit_probes = 1
+    MEMORY_BUDGET = 256
+
+    def __init__(self, capacity):
+        super().__init__(capacity)
+        self.vals = array('q', [EMPTY]) * capacity
+        self.freq = array('q', [0]) * capacity
+        self.time = array('q', [0]) * capacity
+        self.index = {}
+        self.heap = []
+        self.timer = 0
+
+    def _push(self, slot):
+        heap = self.heap
+        heapq.heappush(heap, (((self.freq[slot] << _TIME_BITS) | self.time[slot]) << _SLOT_BITS) | slot)
+        if len(heap) > 2 * len(self.index) + 8:
+            freq, time = self.freq, self.time
+            heap[:] = [(((freq[k] << _TIME_BITS) | time[k]) << _SLOT_BITS) | k for k in self.index.values()]
+            heapq.heapify(heap)
+            if self.stats is not None:
+                self.stats.count('heap_rebuilds')
+
+    def _pop_victim(self):
+        freq, time, heap = self.freq, self.time, self.heap
+        pops = 0
+        while True:
+            key = heapq.heappop(heap)
+            pops += 1
+            slot = key & _SLOT_MASK
+            ft = key >> _SLOT_BITS
+            if freq[slot] == ft >> _TIME_BITS and time[slot] == ft & _TIME_MASK:
+                if self.stats is not None:
+                    self.stats.evict(pops)
+                return slot
+
+    def access(self, page):
+        self.timer += 1
+        slot = self.index.get(page)
+        if slot is not None:
+            self.hits += 1
+            self.freq[slot] += 1
+            self._push(slot)
+            return "HIT", None
+
+        self.misses += 1
+        evicted = None
+        if len(self.index) >= self.capacity:
+            slot = self._pop_victim()
+            evicted = self.vals[slot]
+            del self.index[evicted]
+            if self.stats is not None:
+                self.probes += 1
+        else:
+            slot = len(self.index)
+
+        self.vals[slot] = page
+        self.freq[slot] = 1
+        self.time[slot] = self.timer
+        self.index[page] = slot
+        self._push(slot)
+        if self.stats is not None:
+            self.probes += 2
+        return "MISS", evicted
+
     def get_cache_state(self):
-        return self.frames
\ No newline at end of file
+        # Sắp xếp theo thời điểm đưa vào giống LFU (chỉ dùng cho UI)
+        slots = sorted(self.index.values(), key=self.time.__getitem__)
+        return [{'val': self.vals[k], 'freq': self.freq[k]} for k in slots]
@@ -0,0 +1,231 @@
+# core/cli.py
+"""
+Chạy mô phỏng không cần giao diện (không import streamlit / plotly):
+
+    python -m core trace.txt -p LRU LFU -c 100 1000 --json
+    python -m core trace.u32 -c 1000 --stream
+    python -m core trace.u32 -p LRU -c 4096 --shards 16 -j 4
+    python -m core --workload zipf -n 100000000 --param alpha=1.1 -c 4096 --stream
+    python -m core app.lackey --format lackey --page-size 4096 65536 --access RW -c 64 256
+"""
+import argparse
+import json
+import os
+import sys
+
+from core import addresses, registry, workloads
+from core.replay import COLUMNS, INSTRUMENT_COLUMNS, iter_chunks
+from core.store import DEFAULT_ROOT, file_digest, module_version, spec_digest
+from core.trace import iter_trace_chunks, load_trace
+
+# Kết quả khi chạy với --events (xem core.events.record_trace)
+EVENT_COLUMNS = ['algo', 'capacity', 'requests', 'hits', 'misses', 'miss_ratio', 'events']
+# Kết quả tổng hợp khi chạy với --shards (xem core.partition.simulate_sharded)
+SHARD_COLUMNS = ['algo', 'capacity', 'shards', 'requests', 'hits', 'misses', 'miss_ratio', 'load_imbalance',
+                 'hot_shard', 'miss_ratio_spread']
+# Thêm vào khi so sánh nhiều --page-size (xem core.addresses.compare_page_sizes)
+PAGE_SIZE_COLUMNS = ['page_size']
+
+
+def format_table(rows, columns=COLUMNS):
+    # None = không đo (vd. cột thời gian của kết quả lấy từ --cache)
+    cells = [["-" if r[c] is None else
+              f"{r[c]:.4f}" if c == 'miss_ratio' else
+              f"{r[c]:,.0f}" if c == 'req_per_sec' else
+              f"{r[c]:.2f}" if isinstance(r[c], float) else str(r[c])
+              for c in columns] for r in rows]
+    widths = [max(len(c), *(len(row[i]) for row in cells)) for i, c in enumerate(columns)]
+    lines = ["  ".join(c.rjust(w) for c, w in zip(columns, widths))]
+    lines += ["  ".join(v.rjust(w) for v, w in zip(row, widths)) for row in cells]
+    return "\n".join(lines)
+
+
+def parse_param(text):
+    """"K=V" -> (K, V) với V được đổi sang int / float nếu được"""
+    key, sep, value = text.partition('=')
+    if not sep:
+        raise argparse.ArgumentTypeError(f"Tham số phải có dạng K=V: {text}")
+    for cast in (int, float):
+        try:
+            return key, cast(value)
+        except ValueError:
+            pass
+    return key, value
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m core", description="Paging algorithm simulator (headless)")
+    parser.add_argument("trace", nargs="?",
+                        help="File trace: text (.txt), nén (.gz, .zst) hoặc nhị phân (.u32, .u64)")
+    parser.add_argument("--workload", choices=workloads.names(),
+                        help="Dùng trace tổng hợp (core.workloads) thay cho file trace")
+    parser.add_argument("-n", "--requests", type=int, default=1_000_000,
+                        help="Số request của workload tổng hợp")
+    parser.add_argument("--seed", type=int, default=0, help="Seed của workload tổng hợp")
+    parser.add_argument("--param", type=parse_param, action="append", default=[], metavar="K=V",
+                        help="Tham số của workload, ví dụ --param alpha=1.2 --param n_pages=10000")
+    parser.add_argument("--format", choices=['text', 'gzip', 'zstd', 'u32', 'u64', *addresses.FORMATS],
+                        help="Định dạng trace (mặc định: đoán từ đuôi file); lackey / hex là trace địa chỉ")
+    parser.add_argument("--page-size", nargs="+", type=int, default=[addresses.PAGE_SIZE], metavar="BYTES",
+                        help="Page size khi dịch trace địa chỉ (nhiều giá trị: so sánh trong 1 lượt đọc)")
+    parser.add_argument("--access", metavar="IRW",
+                        help="Chỉ giữ các loại truy cập của trace địa chỉ: I (lệnh), R (đọc), W (ghi)")
+    parser.add_argument("--pid-namespace", action="store_true",
+                        help="Tách page của các process khác nhau trong trace địa chỉ")
+    parser.add_argument("--pid", type=int, default=0,
+                        help="pid cho dòng không ghi pid khi dùng --pid-namespace")
+    parser.add_argument("--stream", action="store_true",
+                        help="Đọc lại trace theo chunk cho mỗi ô thay vì nạp cả trace vào RAM")
+    parser.add_argument("-p", "--policies", nargs="+",
+                        choices=registry.names(), metavar="POLICY",
+                        help="Thuật toán cần chạy (mặc định: tất cả)")
+    parser.add_argument("-c", "--capacities", nargs="+", type=int, default=[3],
+                        metavar="N", help="Kích thước cache")
+    parser.add_argument("-j", "--workers", type=int, default=1,
+                        help="Số process chạy song song (mặc định: 1, chạy tuần tự)")
+    parser.add_argument("--compact", action="store_true",
+                        help="Dùng chế độ lưu trữ gọn (array) cho CLOCK / LFU")
+    parser.add_argument("--instrument", action="store_true",
+                        help="Đo công việc bên trong thuật toán (probe, kim CLOCK, tìm victim, ns/request)")
+    parser.add_argument("--shards", type=int, default=1, metavar="N",
+                        help="Chia cache thành N shard theo hash page, mỗi shard chạy trong 1 process")
+    parser.add_argument("--cache", nargs="?", const=DEFAULT_ROOT, metavar="DIR",
+                        help=f"Dùng lại kết quả đã lưu trên đĩa (mặc định: {DEFAULT_ROOT})")
+    parser.add_argument("--events", metavar="DIR",
+                        help="Ghi log từng request của mỗi ô ra DIR/<thuật toán>_<capacity>.<định dạng>")
+    parser.add_argument("--events-format", choices=['npz', 'parquet', 'feather'], default='npz',
+                        help="Định dạng log sự kiện (mặc định npz; parquet / feather cần pyarrow)")
+    parser.add_argument("--json", action="store_true", help="In kết quả dạng JSON")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    policies = args.policies
+    if policies is None:
+        policies = [name for name in registry.names() if not (args.stream and registry.get(name).offline)]
+    elif args.stream:
+        offline = [name for name in policies if registry.get(name).offline]
+        if offline:
+            parser.error(f"{', '.join(offline)} cần cả trace, không dùng được với --stream")
+    smallest = min(args.capacities)
+    if smallest < 1:
+        parser.error("Capacity phải >= 1")
+    if args.shards < 1:
+        parser.error("--shards phải >= 1")
+    if args.shards > 1:
+        if smallest < args.shards:
+            parser.error(f"Capacity phải >= số shard ({args.shards}) để mỗi shard có ít nhất 1 frame")
+        # Shard nhỏ nhất nhận capacity // shards frame (xem partition.shard_capacities)
+        smallest //= args.shards
+    too_small = [name for name in policies if registry.get(name).min_capacity > smallest]
+    if too_small:
+        message = ", ".join(f"{name} cần capacity >= {registry.get(name).min_capacity}" for name in too_small)
+        if args.policies is not None:
+            parser.error(message)
+        # Mặc định chạy mọi thuật toán -> bỏ qua thuật toán không chạy được thay vì dừng
+        print(f"{parser.prog}: cảnh báo: bỏ qua {message}", file=sys.stderr)
+        policies = [name for name in policies if name not in too_small]
+    if args.shards > 1 and (args.stream or args.instrument):
+        parser.error("--shards không dùng chung được với --stream / --instrument")
+    if args.events and (args.cache or args.shards > 1 or args.workers > 1 or args.instrument):
+        parser.error("--events chỉ dùng khi chạy tuần tự (không dùng với --cache / --shards / -j / --instrument)")
+    if args.stream and args.workers > 1:
+        parser.error("-j cần nạp cả trace (worker mở lại bằng mmap), không dùng được với --stream")
+    if args.cache and (args.shards > 1 or args.workers > 1):
+        parser.error("--cache chỉ dùng khi chạy tuần tự (không dùng với --shards / -j)")
+    if (args.trace is None) == (args.workload is None):
+        parser.error("Cần đúng một trong hai: file trace hoặc --workload")
+    address_trace = args.trace is not None and args.format in addresses.FORMATS
+    if address_trace:
+        try:
+            for page_size in args.page_size:
+                addresses.page_shift(page_size)
+            addresses.access_filter(args.access)
+        except ValueError as e:
+            parser.error(str(e))
+    elif len(args.page_size) > 1 or args.access or args.pid_namespace:
+        parser.error("--page-size / --access / --pid-namespace chỉ dùng với --format lackey / hex")
+    compare_sizes = address_trace and len(args.page_size) > 1
+    if compare_sizes:
+        if args.events or args.cache or args.shards > 1 or args.workers > 1:
+            parser.error("Nhiều --page-size chỉ dùng khi chạy tuần tự (không dùng với --events / --cache / "
+                         "--shards / -j)")
+        if args.policies is None:
+            policies = [name for name in policies if not registry.get(name).offline]
+        elif any(registry.get(name).offline for name in policies):
+            parser.error("Thuật toán offline cần cả trace, không dùng được với nhiều --page-size")
+    if args.workload is not None:
+        params = dict(args.param)
+        source = f"{args.workload}(n={args.requests}, seed={args.seed})"
+        digest = lambda: spec_digest(workload=args.workload, n=args.requests, seed=args.seed, params=params,
+                                     code=module_version('core.workloads'))
+        if args.stream:
+            pages = lambda: workloads.iter_workload(args.workload, args.requests, args.seed, **params)
+        else:
+            pages = workloads.generate(args.workload, args.requests, args.seed, **params)
+    elif address_trace:
+        source = args.trace
+        page_size = args.page_size[0]
+        options = dict(access=args.access, namespace=args.pid_namespace, default_pid=args.pid)
+        digest = lambda: spec_digest(file=file_digest(args.trace), format=args.format, page_size=page_size,
+                                     code=module_version('core.addresses'), **options)
+        if args.stream:
+            pages = lambda: addresses.iter_address_chunks(args.trace, args.format, page_size, **options)
+        elif not compare_sizes:
+            pages = addresses.load_addresses(args.trace, args.format, page_size, **options)
+    else:
+        source = args.trace
+        digest = lambda: file_digest(args.trace)
+        if args.stream:
+            pages = lambda: iter_trace_chunks(args.trace, args.format)
+        else:
+            pages = load_trace(args.trace, args.format)
+
+    columns = COLUMNS + INSTRUMENT_COLUMNS if args.instrument else COLUMNS
+    if compare_sizes:
+        columns = PAGE_SIZE_COLUMNS + columns
+        rows = addresses.compare_page_sizes(args.trace, args.format, args.page_size, policies, args.capacities,
+                                            compact=args.compact, instrumented=args.instrument, **options)
+    elif args.events:
+        from core.events import record_trace
+        os.makedirs(args.events, exist_ok=True)
+        columns = EVENT_COLUMNS
+        rows = []
+        for name in policies:
+            for cap in args.capacities:
+                path = os.path.join(args.events, f"{name}_{cap}.{args.events_format}")
+                policy = registry.create(name, cap, None if args.stream else pages, args.compact)
+                hits, misses = record_trace(policy, pages() if args.stream else pages, path, args.events_format)
+                total = hits + misses
+                rows.append({'algo': name, 'capacity': cap, 'requests': total, 'hits': hits, 'misses': misses,
+                             'miss_ratio': misses / total if total else 0.0, 'events': path})
+    elif args.shards > 1:
+        from core.partition import simulate_sharded
+        columns = SHARD_COLUMNS
+        rows = [simulate_sharded(name, cap, pages, args.shards, max_workers=args.workers, compact=args.compact)[1]
+                for name in policies for cap in args.capacities]
+    elif args.workers > 1:
+        from core.sweep import sweep
+        df = sweep({source: pages}, policies, args.capacities, max_workers=args.workers,
+                   compact=args.compact, instrumented=args.instrument)
+        rows = df[columns].to_dict('records')
+    else:
+        # 1 lượt đọc / giải mã trace cho mọi (thuật toán, capacity)
+        chunks = pages if args.stream else lambda: iter_chunks(pages)
+        trace = None if args.stream else pages
+        if args.cache:
+            from core.store import ResultStore, compare_cached
+            rows = compare_cached(ResultStore(args.cache), digest(), policies, args.capacities, chunks, trace,
+                                  args.compact, args.instrument)
+        else:
+            from core.engine import create
+            rows = create(policies, args.capacities, trace, args.compact, args.instrument).run(chunks()).results()
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        print(format_table(rows, columns))
+    return 0
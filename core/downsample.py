@@ -0,0 +1,79 @@
+# core/downsample.py
+"""
+Giảm số điểm của chuỗi dữ liệu trước khi gửi sang trình duyệt để vẽ.
+
+- minmax: chia thành các bucket đều nhau, giữ điểm nhỏ nhất và lớn nhất mỗi
+  bucket (vector hóa hoàn toàn, giữ được đỉnh/đáy).
+- lttb: Largest-Triangle-Three-Buckets (Steinarsson, 2013), mỗi bucket giữ
+  điểm tạo tam giác lớn nhất với điểm đã chọn trước và trung bình bucket sau.
+  Vòng lặp chỉ chạy theo số bucket, phần trong bucket dùng NumPy.
+
+Chuỗi 10M điểm rút còn vài nghìn điểm trong khoảng 1 giây.
+"""
+import numpy as np
+
+# Số điểm mặc định gửi tới Plotly cho mỗi đường
+MAX_POINTS = 2000
+
+
+def rolling_hit_rate(hit_mask, window):
+    """Tỉ lệ HIT trên cửa sổ trượt `window` request (dùng cumsum, O(n))"""
+    hits = np.asarray(hit_mask, dtype=np.int64)
+    n = len(hits)
+    window = max(1, min(window, n)) if n else 1
+    csum = np.concatenate(([0], np.cumsum(hits)))
+    x = np.arange(window, n + 1)
+    return x, (csum[window:] - csum[:-window]) / window
+
+
+def minmax(x, y, n_out=MAX_POINTS):
+    """Giữ điểm min và max của mỗi bucket (tối đa n_out điểm)"""
+    x, y = np.asarray(x), np.asarray(y)
+    n = len(y)
+    if n <= n_out or n_out < 4:
+        return x, y
+    buckets = n_out // 2
+    size = n // buckets
+    usable = size * buckets
+    block = y[:usable].reshape(buckets, size)
+    offsets = np.arange(buckets) * size
+    lo = offsets + block.argmin(axis=1)
+    hi = offsets + block.argmax(axis=1)
+    # Giữ thứ tự thời gian, thêm điểm cuối cùng
+    idx = np.unique(np.concatenate((lo, hi, [n - 1])))
+    return x[idx], y[idx]
+
+
+def lttb(x, y, n_out=MAX_POINTS):
+    """Largest-Triangle-Three-Buckets, luôn giữ điểm đầu và cuối"""
+    x, y = np.asarray(x), np.asarray(y)
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return x, y
+    xf, yf = x.astype(float), y.astype(float)
+    # Biên của n_out - 2 bucket ở giữa (bỏ điểm đầu và cuối)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0], idx[-1] = 0, n - 1
+    prev = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        if b + 2 < len(edges):
+            nxt_lo, nxt_hi = edges[b + 1], edges[b + 2]
+            avg_x, avg_y = xf[nxt_lo:nxt_hi].mean(), yf[nxt_lo:nxt_hi].mean()
+        else:
+            avg_x, avg_y = xf[-1], yf[-1]
+        px, py = xf[prev], yf[prev]
+        area = np.abs((px - avg_x) * (yf[lo:hi] - py) - (px - xf[lo:hi]) * (avg_y - py))
+        prev = lo + int(area.argmax())
+        idx[b + 1] = prev
+    return x[idx], y[idx]
+
+
+METHODS = {'lttb': lttb, 'minmax': minmax}
+
+
+def downsample(x, y, n_out=MAX_POINTS, method='lttb'):
+    if method not in METHODS:
+        raise ValueError(f"Không hỗ trợ phương pháp downsample: {method}")
+    return METHODS[method](x, y, n_out)
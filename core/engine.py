@@ -0,0 +1,111 @@
+# core/engine.py
+"""
+So sánh nhiều thuật toán / capacity trong 1 lượt đọc trace.
+
+Thay vì đọc, giải mã (tolist) và duyệt trace 1 lần cho mỗi policy, mỗi
+chunk chỉ được đọc và giải mã 1 lần rồi đưa vào replay() của mọi policy.
+Buffer hit_mask / evicted cũng được cấp phát 1 lần cho mỗi kích thước chunk
+và dùng lại (reset) giữa các policy.
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from core import registry
+from core.algorithms import EVICT_NONE
+from core.replay import COLUMNS, INSTRUMENT_COLUMNS, peak_memory_mb
+from core.instrument import instrument
+
+
+class MultiPolicyEngine:
+    """
+    policies: dict khóa -> instance PagingAlgorithm, khóa thường là (tên, capacity).
+    on_chunk(key, hit_mask, evicted) (nếu có) được gọi sau mỗi chunk của mỗi
+    policy; các mảng này bị ghi đè ở lần gọi sau nên cần copy nếu muốn giữ.
+    """
+    def __init__(self, policies, on_chunk=None):
+        self.policies = dict(policies)
+        self.on_chunk = on_chunk
+        self.elapsed = dict.fromkeys(self.policies, 0.0)
+        self.requests = 0
+        self.decode_time = 0.0
+        self._buffers = None
+
+    def _get_buffers(self, n):
+        if self._buffers is None or len(self._buffers[0]) != n:
+            self._buffers = (np.zeros(n, dtype=bool), np.full(n, EVICT_NONE, dtype=np.int64))
+        return self._buffers
+
+    def feed(self, chunk):
+        """Đưa 1 chunk (mảng NumPy hoặc list) vào mọi policy"""
+        start = time.perf_counter()
+        pages = chunk.tolist() if isinstance(chunk, np.ndarray) else chunk
+        self.decode_time += time.perf_counter() - start
+        n = len(pages)
+        if not n:
+            return
+        hit_mask, evicted = self._get_buffers(n)
+        hit_view, evicted_view = memoryview(hit_mask), memoryview(evicted)
+        clock, on_chunk = time.perf_counter, self.on_chunk
+        for key, policy in self.policies.items():
+            hit_mask.fill(False)
+            evicted.fill(EVICT_NONE)
+            start = clock()
+            policy.replay(pages, hit_view, evicted_view)
+            self.elapsed[key] += clock() - start
+            if on_chunk is not None:
+                on_chunk(key, hit_mask, evicted)
+        self.requests += n
+
+    def run(self, chunks):
+        for chunk in chunks:
+            self.feed(chunk)
+        return self
+
+    def results(self):
+        """1 dict / policy, cùng các cột với core.replay.simulate"""
+        rows = []
+        peak = peak_memory_mb()
+        for key, policy in self.policies.items():
+            algo, capacity = key if isinstance(key, tuple) else (key, policy.capacity)
+            total = policy.hits + policy.misses
+            elapsed = self.elapsed[key]
+            row = {
+                'algo': algo,
+                'capacity': capacity,
+                'requests': total,
+                'hits': policy.hits,
+                'misses': policy.misses,
+                'miss_ratio': policy.misses / total if total else 0.0,
+                'req_per_sec': total / elapsed if elapsed > 0 else 0.0,
+                'peak_mb': peak,
+                'bytes_per_frame': policy.bytes_per_frame(),
+            }
+            if policy.stats is not None:
+                summary = policy.stats.summary()
+                row.update((c, summary[c]) for c in INSTRUMENT_COLUMNS)
+            rows.append(row)
+        return rows
+
+
+def create(policies, capacities, trace=None, compact=False, instrumented=False):
+    """Engine cho lưới (thuật toán, capacity); thuật toán offline cần cả trace"""
+    engine_policies = {}
+    for name in policies:
+        for capacity in capacities:
+            policy = registry.create(name, capacity, trace, compact)
+            if instrumented:
+                instrument(policy)
+            engine_policies[(name, capacity)] = policy
+    return MultiPolicyEngine(engine_policies)
+
+
+def compare(chunks, policies, capacities, trace=None, compact=False, instrumented=False):
+    """
+    Chạy mọi (thuật toán, capacity) trên 1 lượt duyệt `chunks` (iterator các
+    chunk, xem core.trace / core.workloads) và trả về DataFrame kết quả.
+    """
+    engine = create(policies, capacities, trace, compact, instrumented).run(chunks)
+    columns = COLUMNS + INSTRUMENT_COLUMNS if instrumented else COLUMNS
+    return pd.DataFrame(engine.results(), columns=columns)
@@ -0,0 +1,241 @@
+# core/events.py
+"""
+Ghi log từng lần truy cập ra file dạng cột để phân tích sau (không cần chạy lại).
+
+Mỗi sự kiện gồm các cột:
+- step:    số thứ tự request (bắt đầu từ 0)
+- page:    page được yêu cầu
+- status:  STATUS_HIT / STATUS_MISS (int8)
+- evicted: page bị xóa (EVICT_NONE nếu không có)
+- extra:   vị trí kim sau request (CLOCK) hoặc tần suất của page sau request
+           (LFU); EXTRA_NONE với thuật toán khác. Tên cột xem extra_column().
+
+Dữ liệu lấy từ hit_mask / evicted của replay() theo từng chunk và được chép
+(vector hóa) vào các buffer NumPy cấp phát trước; đầy buffer thì ghi ra đĩa.
+Không tạo tuple Python cho mỗi sự kiện.
+
+Định dạng: "npz" (mặc định, mỗi lần ghi là 1 nhóm mảng trong file zip) hoặc
+"parquet" / "feather" (cần gói `pyarrow`, không có trong requirements.txt).
+Đọc lại bằng load_events() -> pandas DataFrame.
+"""
+import os
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+from core.algorithms import CLOCK, EVICT_NONE, LFU, CompactCLOCK, CompactLFU
+from core.replay import CHUNK_SIZE, iter_chunks, iter_replay
+
+STATUS_MISS, STATUS_HIT = 0, 1
+EXTRA_NONE = -1
+FORMATS = ('parquet', 'feather', 'npz')
+_DTYPES = {'step': np.int64, 'page': np.int64, 'status': np.int8, 'evicted': np.int64, 'extra': np.int64}
+
+
+def detect_format(path):
+    ext = os.path.splitext(path)[1].lower()
+    return {'.parquet': 'parquet', '.feather': 'feather', '.arrow': 'feather', '.npz': 'npz'}.get(ext, 'npz')
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError("Ghi Parquet / Feather cần cài gói 'pyarrow' (pip install pyarrow), "
+                          "hoặc dùng định dạng .npz") from None
+    return pyarrow
+
+
+def extra_column(policy):
+    """Tên cột extra của policy: 'hand', 'freq' hoặc None"""
+    if isinstance(policy, (CLOCK, CompactCLOCK)):
+        return 'hand'
+    if isinstance(policy, (LFU, CompactLFU)):
+        return 'freq'
+    return None
+
+
+def _freq_of(policy, page):
+    if isinstance(policy, LFU):
+        return policy.cache.get(page, 0)
+    slot = policy.index.get(page)
+    return 0 if slot is None else policy.freq[slot]
+
+
+def lfu_freqs(pages, hit_mask, before):
+    """
+    Tần suất sau mỗi request = số request tới page kể từ lần MISS gần nhất
+    của nó (tính cả request đó), cộng tần suất trước chunk nếu page chưa MISS
+    lần nào trong chunk. before: dict page -> tần suất ngay trước chunk.
+    """
+    n = len(pages)
+    order = np.argsort(pages, kind='stable')
+    p, miss = pages[order], ~hit_mask[order]
+    # Đoạn mới bắt đầu khi đổi page hoặc gặp MISS
+    start = np.ones(n, dtype=bool)
+    start[1:] = (p[1:] != p[:-1]) | miss[1:]
+    idx = np.arange(n)
+    seg_start = np.maximum.accumulate(np.where(start, idx, 0))
+    freq = idx - seg_start + 1
+    # Đoạn mở đầu bằng HIT = tiếp nối tần suất từ trước chunk
+    carry = start & ~miss
+    if carry.any():
+        base = np.zeros(n, dtype=np.int64)
+        base[carry] = [before[page] for page in p[carry].tolist()]
+        freq += base[seg_start]
+    out = np.empty(n, dtype=np.int64)
+    out[order] = freq
+    return out
+
+
+def clock_hands(policy, hand_before, pages, hit_mask, evicted):
+    """
+    Vị trí kim sau mỗi request. Sau MISS kim nằm ngay sau slot vừa đặt page;
+    slot đó được suy ngược từ cuối chunk: page còn trong cache lấy từ index,
+    page đã bị thay trong chunk dùng slot của page đã thay nó.
+    """
+    capacity = policy.capacity
+    miss_idx = np.flatnonzero(~hit_mask)
+    slot_of = dict(policy.index)
+    slots = np.empty(len(miss_idx), dtype=np.int64)
+    miss_pages = pages[miss_idx].tolist()
+    miss_evicted = evicted[miss_idx].tolist()
+    for k in range(len(miss_idx) - 1, -1, -1):
+        slot = slot_of[miss_pages[k]]
+        slots[k] = slot
+        if miss_evicted[k] != EVICT_NONE:
+            slot_of[miss_evicted[k]] = slot
+    if not len(miss_idx):
+        return np.full(len(pages), hand_before, dtype=np.int64)
+    # Với mỗi request: số thứ tự lần MISS gần nhất (-1 nếu chưa MISS trong chunk)
+    last = np.full(len(pages), -1, dtype=np.int64)
+    last[miss_idx] = np.arange(len(miss_idx))
+    last = np.maximum.accumulate(last)
+    return np.where(last >= 0, (slots[np.maximum(last, 0)] + 1) % capacity, hand_before).astype(np.int64)
+
+
+class EventRecorder:
+    """
+    Buffer cột cấp phát trước, ghi ra `path` mỗi khi đầy (buffer_size sự kiện).
+    Dùng với `with` hoặc gọi close() để ghi phần còn lại.
+    """
+    def __init__(self, path, fmt=None, buffer_size=CHUNK_SIZE, extra_name='extra'):
+        self.path = path
+        self.fmt = fmt or detect_format(path)
+        if self.fmt not in FORMATS:
+            raise ValueError(f"Định dạng phải là một trong {FORMATS}")
+        self.extra_name = extra_name
+        self.buffers = {name: np.empty(buffer_size, dtype=dtype) for name, dtype in _DTYPES.items()}
+        self.size = 0
+        self.step = 0
+        self.flushes = 0
+        self._writer = None
+        if self.fmt != 'npz':
+            _import_pyarrow()
+
+    def record(self, pages, hit_mask, evicted, extra=None):
+        """Chép 1 chunk kết quả replay vào buffer (ghi ra đĩa khi đầy)"""
+        pages = np.asarray(pages, dtype=np.int64)
+        n, done = len(pages), 0
+        capacity = len(self.buffers['step'])
+        while done < n:
+            take = min(n - done, capacity - self.size)
+            dst = slice(self.size, self.size + take)
+            src = slice(done, done + take)
+            b = self.buffers
+            b['step'][dst] = np.arange(self.step + done, self.step + done + take)
+            b['page'][dst] = pages[src]
+            b['status'][dst] = hit_mask[src]
+            b['evicted'][dst] = evicted[src]
+            b['extra'][dst] = EXTRA_NONE if extra is None else extra[src]
+            self.size += take
+            done += take
+            if self.size == capacity:
+                self.flush()
+        self.step += n
+
+    def _columns(self):
+        columns = {name: buf[:self.size] for name, buf in self.buffers.items()}
+        columns[self.extra_name] = columns.pop('extra')
+        return columns
+
+    def flush(self):
+        if not self.size:
+            return
+        columns = self._columns()
+        if self.fmt == 'npz':
+            if self._writer is None:
+                self._writer = zipfile.ZipFile(self.path, 'w', zipfile.ZIP_STORED, allowZip64=True)
+            for name, values in columns.items():
+                # Tên thành viên "cột/số_thứ_tự.npy": np.load đọc được từng mảng
+                with self._writer.open(f"{name}/{self.flushes:06d}.npy", 'w', force_zip64=True) as f:
+                    np.lib.format.write_array(f, values, allow_pickle=False)
+        else:
+            pa = _import_pyarrow()
+            table = pa.table(columns)
+            if self._writer is None:
+                if self.fmt == 'parquet':
+                    import pyarrow.parquet as pq
+                    self._writer = pq.ParquetWriter(self.path, table.schema)
+                else:
+                    self._writer = pa.ipc.new_file(self.path, table.schema)
+            self._writer.write_table(table)
+        self.flushes += 1
+        self.size = 0
+
+    def close(self):
+        self.flush()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def record_trace(policy, pages, path, fmt=None, chunk_size=CHUNK_SIZE, buffer_size=CHUNK_SIZE):
+    """
+    Chạy trace qua policy và ghi log sự kiện ra `path`.
+    pages: mảng page id, hoặc iterator các chunk (xem core.trace / core.workloads).
+    Trả về (hits, misses).
+    """
+    extra_name = extra_column(policy)
+    chunks = iter_chunks(pages, chunk_size) if isinstance(pages, np.ndarray) else pages
+    hits = misses = 0
+    with EventRecorder(path, fmt, buffer_size, extra_name or 'extra') as recorder:
+        for chunk in chunks:
+            chunk = np.asarray(chunk, dtype=np.int64)
+            if extra_name == 'hand':
+                before = policy.hand
+            elif extra_name == 'freq':
+                before = {page: _freq_of(policy, page) for page in np.unique(chunk).tolist()}
+            result = next(iter_replay(policy, [chunk]))
+            extra = None
+            if extra_name == 'hand':
+                extra = clock_hands(policy, before, chunk, result.hit_mask, result.evicted)
+            elif extra_name == 'freq':
+                extra = lfu_freqs(chunk, result.hit_mask, before)
+            recorder.record(chunk, result.hit_mask, result.evicted, extra)
+            hits += result.hits
+            misses += result.misses
+    return hits, misses
+
+
+def load_events(path, fmt=None):
+    """Đọc log sự kiện thành pandas DataFrame"""
+    fmt = fmt or detect_format(path)
+    if fmt == 'parquet':
+        return pd.read_parquet(path)
+    if fmt == 'feather':
+        return pd.read_feather(path)
+    with np.load(path) as data:
+        groups = {}
+        # Thứ tự trong file zip = thứ tự ghi (theo cột, theo lần flush)
+        for member in data.files:
+            name = member.split('/')[0]
+            groups.setdefault(name, []).append(data[member])
+    return pd.DataFrame({name: np.concatenate(parts) for name, parts in groups.items()})
@@ -0,0 +1,166 @@
+# core/hierarchy.py
+"""
+Mô phỏng cache nhiều tầng L1 / L2 / ... (tầng nhỏ, nhanh đứng trước tầng lớn, chậm).
+
+Request đi từ L1 xuống dưới cho tới tầng đầu tiên HIT; MISS ở mọi tầng thì
+đọc từ bộ nhớ chính. Ba chế độ:
+- "inclusive":     page MISS được đưa vào mọi tầng nó đi qua; page bị xóa ở
+                   tầng dưới cũng bị xóa ở các tầng trên (back-invalidation)
+                   nên tầng trên luôn là tập con của tầng dưới.
+- "exclusive":     mỗi page chỉ nằm ở 1 tầng. HIT ở tầng k > 1 thì page được
+                   chuyển lên L1; page bị L1 xóa được hạ (demote) xuống L2,
+                   page bị L2 xóa xuống L3, ... page bị tầng cuối xóa thì bỏ.
+- "non-inclusive": chỉ đưa page MISS vào các tầng nó đi qua, không đồng bộ
+                   gì giữa các tầng. Mỗi tầng chỉ thấy dãy MISS của tầng trên
+                   nên replay() chạy từng tầng trên cả mảng (batch).
+
+Thời gian truy cập trung bình = tổng latency các tầng đã dò (cộng
+memory_latency nếu MISS mọi tầng) chia cho số request.
+"""
+import numpy as np
+
+from core import registry
+from core.algorithms import PagingAlgorithm
+from core.replay import run_trace
+
+MODES = ("inclusive", "exclusive", "non-inclusive")
+
+
+def _access(policy, page):
+    # Chạy hết các bước "STEP" của CLOCK
+    status, out = policy.access(page)
+    while status == "STEP":
+        status, out = policy.access(page)
+    return status, out
+
+
+class Hierarchy:
+    """
+    levels: list các instance PagingAlgorithm (L1 trước), latencies: latency
+    của từng tầng (cùng đơn vị với memory_latency, ví dụ ns).
+    Bộ đếm hits/misses bên trong từng policy không còn ý nghĩa (demote và
+    back-invalidation cũng gọi access / remove); dùng level_hits / level_misses.
+    """
+    __slots__ = ('levels', 'latencies', 'memory_latency', 'mode', 'level_hits', 'level_misses', 'requests')
+
+    def __init__(self, levels, latencies, memory_latency=100.0, mode="inclusive"):
+        if mode not in MODES:
+            raise ValueError(f"mode phải là một trong {MODES}")
+        if not levels or len(latencies) != len(levels):
+            raise ValueError("Cần ít nhất 1 tầng và đúng 1 latency cho mỗi tầng")
+        for k, level in enumerate(levels):
+            if level.offline:
+                raise ValueError(f"L{k + 1}: không dùng được thuật toán offline trong hierarchy")
+            # inclusive xóa ở các tầng trên, exclusive xóa ở các tầng dưới L1
+            needs_remove = (mode == "inclusive" and k < len(levels) - 1) or (mode == "exclusive" and k > 0)
+            if needs_remove and type(level).remove is PagingAlgorithm.remove:
+                raise ValueError(f"L{k + 1}: {type(level).__name__} không hỗ trợ remove() cần cho chế độ {mode}")
+        self.levels = list(levels)
+        self.latencies = list(latencies)
+        self.memory_latency = memory_latency
+        self.mode = mode
+        self.level_hits = [0] * len(levels)
+        self.level_misses = [0] * len(levels)
+        self.requests = 0
+
+    def access(self, page):
+        """Trả về số thứ tự tầng HIT (0 = L1), hoặc len(levels) nếu đọc từ bộ nhớ chính"""
+        self.requests += 1
+        if self.mode == "exclusive":
+            return self._access_exclusive(page)
+        levels = self.levels
+        for k, level in enumerate(levels):
+            status, out = _access(level, page)
+            if status == "HIT":
+                self.level_hits[k] += 1
+                return k
+            self.level_misses[k] += 1
+            if out is not None and self.mode == "inclusive":
+                for upper in levels[:k]:
+                    upper.remove(out)
+        return len(levels)
+
+    def _access_exclusive(self, page):
+        levels = self.levels
+        status, victim = _access(levels[0], page)
+        if status == "HIT":
+            self.level_hits[0] += 1
+            return 0
+        self.level_misses[0] += 1
+        # Tìm page ở các tầng dưới; remove() vừa kiểm tra vừa lấy page ra
+        found = len(levels)
+        for k in range(1, len(levels)):
+            if levels[k].remove(page):
+                self.level_hits[k] += 1
+                found = k
+                break
+            self.level_misses[k] += 1
+        # Hạ page bị xóa xuống tầng kế tiếp
+        for level in levels[1:]:
+            if victim is None:
+                break
+            _, victim = _access(level, victim)
+        return found
+
+    def replay(self, pages):
+        """
+        Chạy cả trace. Ở chế độ non-inclusive mỗi tầng replay 1 lần trên mảng
+        các request MISS của tầng trên; hai chế độ còn lại phụ thuộc thứ tự
+        giữa các tầng nên chạy từng request.
+        Trả về mảng int8: tầng HIT của mỗi request (len(levels) = bộ nhớ chính).
+        """
+        pages = np.asarray(pages)
+        served = np.full(len(pages), len(self.levels), dtype=np.int8)
+        if self.mode != "non-inclusive":
+            access = self.access
+            for i, page in enumerate(pages.tolist()):
+                served[i] = access(page)
+            return served
+
+        self.requests += len(pages)
+        positions = np.arange(len(pages))
+        stream = pages
+        for k, level in enumerate(self.levels):
+            if not len(stream):
+                break
+            result = run_trace(level, stream)
+            self.level_hits[k] += result.hits
+            self.level_misses[k] += result.misses
+            served[positions[result.hit_mask]] = k
+            miss = ~result.hit_mask
+            stream, positions = stream[miss], positions[miss]
+        return served
+
+    def hit_ratios(self):
+        """Tỉ lệ HIT cục bộ của từng tầng (trên số request tới được tầng đó)"""
+        return [h / (h + m) if h + m else 0.0 for h, m in zip(self.level_hits, self.level_misses)]
+
+    def memory_accesses(self):
+        return self.level_misses[-1]
+
+    def average_latency(self):
+        if not self.requests:
+            return 0.0
+        # Mọi request tới được tầng k đều tốn latency của tầng k
+        total = sum((h + m) * lat for h, m, lat in zip(self.level_hits, self.level_misses, self.latencies))
+        total += self.memory_accesses() * self.memory_latency
+        return total / self.requests
+
+    def summary(self):
+        return {
+            'mode': self.mode,
+            'requests': self.requests,
+            'levels': [
+                {'level': f"L{k + 1}", 'policy': type(level).__name__, 'capacity': level.capacity,
+                 'hits': self.level_hits[k], 'misses': self.level_misses[k], 'hit_ratio': ratio}
+                for k, (level, ratio) in enumerate(zip(self.levels, self.hit_ratios()))
+            ],
+            'global_hit_ratio': 1 - self.memory_accesses() / self.requests if self.requests else 0.0,
+            'average_latency': self.average_latency(),
+        }
+
+
+def create(specs, latencies, memory_latency=100.0, mode="inclusive", compact=False):
+    """Tạo Hierarchy từ danh sách (tên thuật toán, capacity), ví dụ [("LRU", 64), ("CLOCK", 1024)]"""
+    levels = [registry.create(name, capacity, compact=compact) for name, capacity in specs]
+    return Hierarchy(levels, latencies, memory_latency, mode)
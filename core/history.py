@@ -0,0 +1,65 @@
+# core/history.py
+import bisect
+import copy
+from array import array
+
+from core.algorithms import EVICT_NONE
+
+# Mã status trong mảng statuses
+STATUSES = ("HIT", "MISS", "STEP")
+
+
+class History:
+    """
+    Lịch sử các lần gọi access() cho nút Prev / nhảy bước trong UI.
+
+    Thay vì deepcopy cả thuật toán sau mỗi bước, chỉ lưu 1 event nhỏ
+    (page, status, evicted, step) cho mỗi lần gọi và 1 checkpoint đầy đủ
+    sau mỗi `checkpoint_every` lần. Muốn quay về vị trí bất kỳ thì lấy
+    checkpoint gần nhất phía trước rồi chạy lại các event còn thiếu
+    (các thuật toán đều tất định nên chỉ cần page là đủ để tái tạo).
+    Event được lưu theo cột (array) nên chỉ tốn ~25 byte / lần gọi.
+    """
+    def __init__(self, instance, checkpoint_every=32):
+        self.checkpoint_every = checkpoint_every
+        self.pages = array('q')
+        self.statuses = array('b')
+        self.evicted = array('q')
+        # step của UI sau mỗi lần gọi (không giảm)
+        self.steps = array('q')
+        self.checkpoints = {0: copy.deepcopy(instance)}
+
+    def __len__(self):
+        return len(self.pages)
+
+    def record(self, instance, page, status, evicted, step):
+        """Ghi lại lần gọi access() vừa chạy trên `instance`"""
+        self.pages.append(page)
+        self.statuses.append(STATUSES.index(status))
+        self.evicted.append(EVICT_NONE if evicted is None else evicted)
+        self.steps.append(step)
+        if len(self.pages) % self.checkpoint_every == 0:
+            self.checkpoints[len(self.pages)] = copy.deepcopy(instance)
+
+    def rebuild(self, position):
+        """Tạo lại instance sau `position` lần gọi access()"""
+        base = position - position % self.checkpoint_every
+        instance = copy.deepcopy(self.checkpoints[base])
+        access = instance.access
+        for page in self.pages[base:position]:
+            access(page)
+        return instance
+
+    def state_at(self, position):
+        """Trả về (step, (status, evicted)) của UI tại `position`"""
+        if position == 0:
+            return 0, (None, None)
+        k = position - 1
+        evicted = self.evicted[k]
+        return self.steps[k], (STATUSES[self.statuses[k]], None if evicted == EVICT_NONE else evicted)
+
+    def position_of_step(self, step):
+        """Vị trí đầu tiên mà UI đã xử lý xong `step` request"""
+        if step <= 0:
+            return 0
+        return bisect.bisect_left(self.steps, step) + 1
@@ -0,0 +1,104 @@
+# core/instrument.py
+"""
+Đo đạc công việc bên trong thuật toán (tắt mặc định, không tốn gì khi tắt).
+
+    stats = instrument(policy)
+    run_trace(policy, pages)
+    print(stats.summary())
+
+Thời gian đo trên chính vòng lặp replay() của thuật toán, 1 lần cho mỗi
+chunk, nên ns_per_access là thời gian thật của đường chạy không đo đạc
+(chỉ tính các request chạy qua replay()). Các chỉ số:
+- probes: số thao tác theo page (tra cứu / thêm / xóa / di chuyển) trên các
+  bảng băm của thuật toán, không tính bảng theo freq / frame và thao tác heap.
+  Đúng cho mọi đường chạy (replay(), access(), access_complete()), xem
+  PagingAlgorithm.probe_count()
+- hand_advances / sweeps: số frame kim CLOCK đi qua / số lần quét khi miss
+- evict_search / evictions: số phần tử heap phải pop / số lần xóa (LFU, OPT)
+- heap_rebuilds: số lần heap được dựng lại để dọn entry cũ
+Histogram hand_advances / evict_search theo từng lần miss chỉ được ghi qua
+access() / access_complete(); vòng lặp replay() chỉ cộng vào tổng, khi đó
+histogram() trả về None thay vì 1 histogram thiếu.
+"""
+import collections
+
+# Histogram theo từng sự kiện -> bộ đếm số sự kiện tương ứng
+_EVENTS = {'hand_advances': 'sweeps', 'evict_search': 'evictions'}
+
+
+class Stats:
+    __slots__ = ('policy', 'counters', 'histograms', 'base_requests', 'base_probes')
+
+    def __init__(self, policy):
+        self.policy = policy
+        self.counters = collections.Counter()
+        self.histograms = collections.defaultdict(collections.Counter)
+        # Số request / probe của policy lúc bật đo đạc
+        self.base_requests = policy.hits + policy.misses
+        self.base_probes = policy.probe_count()
+
+    def count(self, name, n=1):
+        self.counters[name] += n
+
+    def record_chunk(self, n, elapsed_ns):
+        """Thời gian chạy n request liên tiếp qua replay()"""
+        self.counters['timed'] += n
+        self.counters['time_ns'] += elapsed_ns
+
+    def evict(self, pops):
+        """1 lần xóa cần pop `pops` phần tử heap"""
+        self.counters['evictions'] += 1
+        self.counters['evict_search'] += pops
+        self.histograms['evict_search'][pops] += 1
+
+    def sweep(self, swept):
+        """1 lần quét của kim CLOCK đi qua `swept` frame"""
+        self.counters['sweeps'] += 1
+        self.counters['hand_advances'] += swept
+        self.histograms['hand_advances'][swept] += 1
+
+    def ratio(self, name, per):
+        return self.counters[name] / self.counters[per] if self.counters[per] else 0.0
+
+    def summary(self):
+        """Dict các chỉ số chính (trung bình trên mỗi request / mỗi lần miss)"""
+        policy = self.policy
+        accesses = policy.hits + policy.misses - self.base_requests
+        probes = policy.probe_count() - self.base_probes
+        return {
+            'accesses': accesses,
+            'ns_per_access': self.ratio('time_ns', 'timed'),
+            'probes_per_access': probes / accesses if accesses else 0.0,
+            'hand_advances_per_miss': self.ratio('hand_advances', 'sweeps'),
+            'evict_search_mean': self.ratio('evict_search', 'evictions'),
+            'heap_rebuilds': self.counters['heap_rebuilds'],
+        }
+
+    def histogram(self, name):
+        """
+        Histogram dạng list (giá trị, số lần) đã sắp xếp, hoặc None nếu một
+        phần sự kiện chỉ được cộng vào tổng (chạy qua replay()).
+        """
+        hist = self.histograms.get(name, {})
+        if name in _EVENTS and sum(hist.values()) != self.counters[_EVENTS[name]]:
+            return None
+        return sorted(hist.items())
+
+
+def instrument(policy):
+    """Bật đo đạc cho policy, trả về Stats"""
+    if policy.stats is None:
+        policy.stats = Stats(policy)
+        # Policy gồm nhiều policy con (core.partition.ShardedCache): policy con
+        # ghi vào cùng Stats, thời gian do policy ngoài đo
+        for child in getattr(policy, 'shards', ()):
+            child.stats = policy.stats
+    return policy.stats
+
+
+def uninstrument(policy):
+    """Tắt đo đạc, trả về Stats đã thu được (nếu có)"""
+    stats, policy.stats = policy.stats, None
+    for child in getattr(policy, 'shards', ()):
+        child.stats = None
+    return stats
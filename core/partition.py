@@ -0,0 +1,165 @@
+# core/partition.py
+"""
+Mô phỏng cache chia shard theo hash (mỗi shard có trạng thái thay thế riêng),
+giống các cache production được partition thành N phần.
+
+- split_trace: tính shard của mọi request bằng 1 lượt hash vector hóa rồi
+  tách trace thành N dãy con (giữ nguyên thứ tự request trong mỗi shard).
+- ShardedCache: bọc N policy thành 1 PagingAlgorithm (dùng được với
+  run_trace, Timeline, ...) để chạy trong cùng process.
+- simulate_sharded: chạy mỗi shard trong 1 worker process (dãy con được ghi
+  ra .npy và mở lại bằng mmap giống core.sweep), rồi gộp thống kê từng shard
+  và tổng, kèm các chỉ số lệch tải / shard nóng.
+"""
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from core import registry
+from core.algorithms import EVICT_NONE, PagingAlgorithm
+from core.replay import simulate
+from core.shards import page_hash
+
+
+def shard_ids(pages, n_shards, seed=0):
+    """Shard của từng request (mảng cùng độ dài với pages)"""
+    ids = page_hash(pages, seed) % np.uint64(n_shards)
+    # Khóa 16 bit -> argsort(kind='stable') dùng radix sort O(n)
+    return ids.astype(np.uint16 if n_shards <= 1 << 16 else np.int64)
+
+
+def shard_capacities(capacity, n_shards):
+    """Chia đều tổng capacity, phần dư cho các shard đầu"""
+    base, extra = divmod(capacity, n_shards)
+    return [base + (k < extra) for k in range(n_shards)]
+
+
+def split_trace(pages, n_shards, seed=0, ids=None):
+    """
+    Tách trace thành n_shards mảng con.
+    Trả về (substreams, order): order là vị trí gốc của các request sau khi
+    ghép các shard liên tiếp nhau (dùng để trả kết quả về đúng vị trí).
+    """
+    pages = np.asarray(pages)
+    if ids is None:
+        ids = shard_ids(pages, n_shards, seed)
+    order = np.argsort(ids, kind='stable')
+    bounds = np.cumsum(np.bincount(ids, minlength=n_shards))[:-1]
+    return np.split(pages[order], bounds), order
+
+
+class ShardedCache(PagingAlgorithm):
+    """N policy độc lập; request tới page p đi vào shard hash(p) mod N"""
+    __slots__ = ('shards', 'seed')
+
+    def __init__(self, shards, seed=0):
+        super().__init__(sum(s.capacity for s in shards))
+        self.shards = list(shards)
+        self.seed = seed
+
+    def shard_of(self, page):
+        return int(page_hash(page, self.seed)) % len(self.shards)
+
+    def probe_count(self):
+        return sum(shard.probe_count() for shard in self.shards)
+
+    def access(self, page):
+        status, evicted = self.shards[self.shard_of(page)].access(page)
+        if status == "HIT":
+            self.hits += 1
+        elif status == "MISS":
+            self.misses += 1
+        return status, evicted
+
+    def _replay(self, pages, hit_mask, evicted):
+        pages = np.asarray(pages, dtype=np.int64)
+        hit_out = np.frombuffer(hit_mask, dtype=bool)
+        evicted_out = np.frombuffer(evicted, dtype=np.int64)
+        substreams, order = split_trace(pages, len(self.shards), self.seed)
+        start = 0
+        for shard, sub in zip(self.shards, substreams):
+            n = len(sub)
+            if n:
+                sub_hits = np.zeros(n, dtype=bool)
+                sub_evicted = np.full(n, EVICT_NONE, dtype=np.int64)
+                hits_before = shard.hits
+                # _replay(): thời gian do ShardedCache.replay() đo cho cả chunk
+                shard._replay(sub.tolist(), memoryview(sub_hits), memoryview(sub_evicted))
+                idx = order[start:start + n]
+                hit_out[idx] = sub_hits
+                evicted_out[idx] = sub_evicted
+                self.hits += shard.hits - hits_before
+                self.misses += n - (shard.hits - hits_before)
+            start += n
+
+    def get_cache_state(self):
+        return [shard.get_cache_state() for shard in self.shards]
+
+    def memory_usage(self):
+        return sum(shard.memory_usage() for shard in self.shards)
+
+
+def create(algo_name, capacity, n_shards, trace=None, seed=0, compact=False):
+    """ShardedCache gồm n_shards instance của algo_name (OPT nhận dãy con của shard mình)"""
+    info = registry.get(algo_name)
+    caps = shard_capacities(capacity, n_shards)
+    if info.offline:
+        if trace is None:
+            raise ValueError(f"{algo_name} cần biết trước cả trace")
+        subs, _ = split_trace(trace, n_shards, seed)
+    else:
+        subs = [None] * n_shards
+    return ShardedCache([info.create(cap, sub, compact) for cap, sub in zip(caps, subs)], seed)
+
+
+def _run_shard(shard, path, algo_name, capacity, compact):
+    row = simulate(algo_name, capacity, np.load(path, mmap_mode='r'), compact)
+    row['shard'] = shard
+    return row
+
+
+def simulate_sharded(algo_name, capacity, pages, n_shards, seed=0, max_workers=None, compact=False):
+    """
+    Chạy từng shard trong 1 worker process.
+    Trả về (per_shard, total): DataFrame 1 dòng / shard và dict tổng hợp gồm
+    miss_ratio chung, load_imbalance (requests shard lớn nhất / trung bình),
+    hot_shard và khoảng chênh miss ratio giữa các shard.
+    """
+    if capacity < n_shards:
+        raise ValueError("capacity phải >= số shard")
+    substreams, _ = split_trace(pages, n_shards, seed)
+    caps = shard_capacities(capacity, n_shards)
+
+    with tempfile.TemporaryDirectory(prefix="paging-shards-") as tmpdir:
+        paths = []
+        for k, sub in enumerate(substreams):
+            paths.append(os.path.join(tmpdir, f"shard{k}.npy"))
+            np.save(paths[-1], sub)
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(_run_shard, k, path, algo_name, cap, compact)
+                       for k, (path, cap) in enumerate(zip(paths, caps))]
+            rows = [f.result() for f in futures]
+
+    per_shard = pd.DataFrame(rows)[['shard', 'algo', 'capacity', 'requests', 'hits', 'misses', 'miss_ratio',
+                                    'req_per_sec', 'bytes_per_frame']]
+    requests = int(per_shard['requests'].sum())
+    misses = int(per_shard['misses'].sum())
+    per_shard['load_share'] = per_shard['requests'] / requests if requests else 0.0
+    mean_load = requests / n_shards
+    active = per_shard[per_shard['requests'] > 0]['miss_ratio']
+    total = {
+        'algo': algo_name,
+        'capacity': capacity,
+        'shards': n_shards,
+        'requests': requests,
+        'hits': requests - misses,
+        'misses': misses,
+        'miss_ratio': misses / requests if requests else 0.0,
+        'load_imbalance': float(per_shard['requests'].max() / mean_load) if mean_load else 0.0,
+        'hot_shard': int(per_shard.loc[per_shard['requests'].idxmax(), 'shard']),
+        'miss_ratio_spread': float(active.max() - active.min()) if len(active) else 0.0,
+    }
+    return per_shard, total
@@ -0,0 +1,147 @@
+# core/registry.py
+"""
+Registry các thuật toán, dùng chung cho UI, CLI và các bộ chạy batch.
+
+Mỗi thuật toán đăng ký: tên, mô tả, "module:Lớp" để tạo (chỉ import khi
+thật sự dùng) và kiểu hiển thị trên UI:
+- "linear": get_cache_state() trả về list page hoặc list dict {'val', 'freq'}
+- "clock":  list dict {'val', 'bit'} + thuộc tính hand
+- "lists":  dict {'lists', 'ghosts', 'params'} (ARC, 2Q, LIRS)
+
+Thuật toán bên ngoài đăng ký qua entry point nhóm "paging_simulator.policies",
+ví dụ trong pyproject.toml của gói khác:
+
+    [project.entry-points."paging_simulator.policies"]
+    MYPOLICY = "my_pkg.policies:MyPolicy"
+
+Lớp có thể khai báo thuộc tính `description` và `render` để UI hiển thị.
+"""
+import importlib
+from importlib.metadata import entry_points
+
+ENTRY_POINT_GROUP = "paging_simulator.policies"
+RENDER_TYPES = ("linear", "clock", "lists")
+
+
+class PolicyInfo:
+    __slots__ = ('name', 'target', 'compact_target', '_description', '_render', '_cls', '_compact_cls')
+
+    def __init__(self, name, target, description=None, render=None, compact=None):
+        self.name = name
+        # "module:Lớp", một lớp, hoặc EntryPoint
+        self.target = target
+        self.compact_target = compact
+        self._description = description
+        self._render = render
+        self._cls = None
+        self._compact_cls = None
+
+    @staticmethod
+    def _resolve(target):
+        if hasattr(target, 'load'):
+            return target.load()
+        if isinstance(target, str):
+            module_name, _, attr = target.partition(':')
+            return getattr(importlib.import_module(module_name), attr)
+        return target
+
+    def load(self, compact=False):
+        """Import (lần đầu) và trả về lớp thuật toán"""
+        if compact and self.compact_target is not None:
+            if self._compact_cls is None:
+                self._compact_cls = self._resolve(self.compact_target)
+            return self._compact_cls
+        if self._cls is None:
+            self._cls = self._resolve(self.target)
+        return self._cls
+
+    @property
+    def description(self):
+        if self._description is None:
+            self._description = getattr(self.load(), 'description', self.name)
+        return self._description
+
+    @property
+    def render(self):
+        if self._render is None:
+            self._render = getattr(self.load(), 'render', 'linear')
+        return self._render
+
+    @property
+    def offline(self):
+        return getattr(self.load(), 'offline', False)
+
+    @property
+    def min_capacity(self):
+        return getattr(self.load(), 'min_capacity', 1)
+
+    def create(self, capacity, trace=None, compact=False):
+        """Tạo instance; thuật toán offline (OPT) cần truyền cả trace"""
+        cls = self.load(compact)
+        if getattr(cls, 'offline', False):
+            if trace is None:
+                raise ValueError(f"{self.name} cần biết trước cả trace")
+            return cls(capacity, trace)
+        return cls(capacity)
+
+
+_REGISTRY = {}
+_entry_points_loaded = False
+
+
+def register(name, target, description=None, render=None, compact=None):
+    """Đăng ký (hoặc ghi đè) một thuật toán"""
+    if render is not None and render not in RENDER_TYPES:
+        raise ValueError(f"render phải là một trong {RENDER_TYPES}")
+    _REGISTRY[name] = PolicyInfo(name, target, description, render, compact)
+
+
+def _load_entry_points():
+    # Chỉ đọc metadata, chưa import gói nào
+    global _entry_points_loaded
+    if _entry_points_loaded:
+        return
+    _entry_points_loaded = True
+    for ep in entry_points(group=ENTRY_POINT_GROUP):
+        if ep.name not in _REGISTRY:
+            _REGISTRY[ep.name] = PolicyInfo(ep.name, ep)
+
+
+def names():
+    """Tên các thuật toán theo thứ tự đăng ký (built-in trước, entry point sau)"""
+    _load_entry_points()
+    return list(_REGISTRY)
+
+
+def get(name):
+    _load_entry_points()
+    try:
+        return _REGISTRY[name]
+    except KeyError:
+        raise KeyError(f"Không có thuật toán '{name}' (có: {', '.join(_REGISTRY)})") from None
+
+
+def create(name, capacity, trace=None, compact=False):
+    return get(name).create(capacity, trace, compact)
+
+
+# --- Built-in ---
+register("FIFO", "core.algorithms:FIFO", "Page vào cache sớm nhất → bị xóa")
+register("LIFO", "core.algorithms:LIFO", "Page vào sau cùng → bị xóa")
+register("LRU", "core.algorithms:LRU", "Page lâu nhất chưa được dùng → bị xóa")
+register("LFU", "core.algorithms:LFU", "Page nào được dùng ít lần nhất → bị xóa",
+         compact="core.algorithms:CompactLFU")
+register("CLOCK", "core.algorithms:CLOCK",
+         'Cải tiến của LRU: Bit = 1 → hạ xuống 0 (Cơ hội thứ hai), Bit = 0 → Thay thế.',
+         render="clock", compact="core.algorithms:CompactCLOCK")
+register("OPT", "core.algorithms:OPT",
+         "Page có lần dùng tiếp theo xa nhất trong tương lai → bị xóa (tối ưu, cần biết trước trace)")
+register("ARC", "core.algorithms:ARC",
+         "T1 (dùng 1 lần) / T2 (dùng nhiều lần) + ghost B1/B2; p tự chỉnh kích thước T1 theo HIT trong ghost",
+         render="lists")
+register("2Q", "core.algorithms:TwoQ",
+         "Page mới vào A1in (FIFO); bị đẩy ra thì nhớ trong A1out; dùng lại khi còn trong A1out → lên Am (LRU)",
+         render="lists")
+register("LIRS", "core.algorithms:LIRS",
+         "Page dùng lại gần đây → LIR (được giữ); page còn lại → HIR (bị xóa trước), HIR bị xóa vẫn nhớ trong stack",
+         render="lists")
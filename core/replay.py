@@ -0,0 +1,133 @@
+# core/replay.py
+import collections
+import itertools
+import resource
+import sys
+import time
+
+import numpy as np
+
+from core import registry
+from core.algorithms import EVICT_NONE
+from core.instrument import instrument
+
+# Kích thước mỗi đoạn trace đưa vào policy.replay()
+CHUNK_SIZE = 1 << 20
+
+# hit_mask: mảng bool, evicted: mảng int64 (EVICT_NONE nếu không xóa page nào)
+TraceResult = collections.namedtuple('TraceResult', ['hit_mask', 'evicted', 'hits', 'misses'])
+
+# Cột kết quả của simulate() (dùng chung cho CLI, core.engine, core.sweep)
+COLUMNS = ['algo', 'capacity', 'requests', 'hits', 'misses', 'miss_ratio', 'req_per_sec', 'peak_mb',
+           'bytes_per_frame']
+# Thêm vào khi chạy với --instrument (xem core.instrument.Stats.summary)
+INSTRUMENT_COLUMNS = ['ns_per_access', 'probes_per_access', 'hand_advances_per_miss', 'evict_search_mean',
+                      'heap_rebuilds']
+
+
+def iter_chunks(pages, chunk_size=CHUNK_SIZE):
+    """Chia trace (mảng NumPy hoặc iterable bất kỳ) thành các list page id"""
+    if isinstance(pages, np.ndarray):
+        for start in range(0, len(pages), chunk_size):
+            yield pages[start:start + chunk_size].tolist()
+        return
+
+    it = iter(pages)
+    while True:
+        chunk = list(itertools.islice(it, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_replay(policy, chunks):
+    """
+    Đưa lần lượt từng chunk (list hoặc mảng NumPy) vào policy.replay() và
+    yield TraceResult của riêng chunk đó. Dùng với các generator trong
+    core.trace để bộ nhớ không tăng theo độ dài trace.
+    """
+    for chunk in chunks:
+        if isinstance(chunk, np.ndarray):
+            chunk = chunk.tolist()
+        hits_before, misses_before = policy.hits, policy.misses
+        hit_mask = np.zeros(len(chunk), dtype=bool)
+        evicted = np.full(len(chunk), EVICT_NONE, dtype=np.int64)
+        # Ghi trực tiếp vào buffer của mảng NumPy, không tạo tuple mỗi bước
+        policy.replay(chunk, memoryview(hit_mask), memoryview(evicted))
+        yield TraceResult(hit_mask, evicted,
+                          policy.hits - hits_before, policy.misses - misses_before)
+
+
+def run_trace(policy, pages, chunk_size=CHUNK_SIZE):
+    """
+    Chạy toàn bộ trace qua policy bằng policy.replay() theo từng đoạn.
+    pages: mảng NumPy hoặc iterable các page id (số nguyên không âm).
+    Trả về TraceResult; hits/misses là số đếm của riêng lần chạy này.
+    """
+    results = list(iter_replay(policy, iter_chunks(pages, chunk_size)))
+
+    if len(results) == 1:
+        return results[0]
+    if not results:
+        return TraceResult(np.zeros(0, dtype=bool), np.zeros(0, dtype=np.int64), 0, 0)
+    return TraceResult(np.concatenate([r.hit_mask for r in results]),
+                       np.concatenate([r.evicted for r in results]),
+                       sum(r.hits for r in results),
+                       sum(r.misses for r in results))
+
+
+def replay_totals(policy, chunks):
+    """Chỉ đếm (hits, misses) qua một stream chunk, không giữ mảng kết quả"""
+    hits = misses = 0
+    for result in iter_replay(policy, chunks):
+        hits += result.hits
+        misses += result.misses
+    return hits, misses
+
+
+def peak_memory_mb():
+    # ru_maxrss tính bằng KB trên Linux, byte trên macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        peak /= 1024
+    return peak / 1024
+
+
+def simulate(algo_name, capacity, pages, compact=False, instrumented=False):
+    """
+    Chạy 1 ô (thuật toán, capacity) và trả về dict thống kê.
+    pages: mảng page id (có thể là memmap), hoặc hàm không tham số trả về
+    iterator các chunk (đọc lại trace theo dạng stream).
+    instrumented=True bật core.instrument và thêm các cột INSTRUMENT_COLUMNS.
+    """
+    info = registry.get(algo_name)
+    if callable(pages):
+        if info.offline:
+            raise ValueError(f"{algo_name} cần cả trace, không chạy được ở chế độ stream")
+        policy = info.create(capacity, compact=compact)
+        chunks = pages()
+    else:
+        policy = info.create(capacity, pages, compact)
+        chunks = iter_chunks(pages)
+    stats = instrument(policy) if instrumented else None
+
+    start = time.perf_counter()
+    hits, misses = replay_totals(policy, chunks)
+    elapsed = time.perf_counter() - start
+
+    total = hits + misses
+    row = {
+        'algo': algo_name,
+        'capacity': capacity,
+        'requests': total,
+        'hits': hits,
+        'misses': misses,
+        'miss_ratio': misses / total if total else 0.0,
+        'req_per_sec': total / elapsed if elapsed > 0 else 0.0,
+        'peak_mb': peak_memory_mb(),
+        'bytes_per_frame': policy.bytes_per_frame(),
+    }
+    if stats is not None:
+        summary = stats.summary()
+        row.update((c, summary[c]) for c in INSTRUMENT_COLUMNS)
+    return row
@@ -0,0 +1,158 @@
+# core/shards.py
+"""
+Miss-ratio curve gần đúng bằng lấy mẫu không gian kiểu SHARDS
+(Waldspurger et al., FAST'15).
+
+Chỉ giữ các request có hash(page) mod P < T, tức tỉ lệ mẫu R = T / P, và
+thu nhỏ capacity theo R. Vì lấy mẫu theo page (không theo request), mọi lần
+truy cập tới một page được chọn đều được giữ nên tính cục bộ được bảo toàn.
+Với max_pages, ngưỡng T được hạ dần để số page khác nhau trong mẫu không
+vượt quá giới hạn (bản "fixed-size" của SHARDS).
+"""
+import collections
+
+import numpy as np
+
+from core import registry
+from core.replay import replay_totals
+from core.stack_distance import COLD, stack_distances
+
+# Không gian hash dùng để so ngưỡng
+MODULUS = 1 << 24
+
+Sample = collections.namedtuple('Sample', ['pages', 'rate', 'total'])
+MissRatioCurve = collections.namedtuple('MissRatioCurve', ['capacities', 'miss_ratio', 'rate'])
+
+
+def page_hash(pages, seed=0):
+    """Hash splitmix64 vector hóa, trả về mảng trong [0, MODULUS)"""
+    with np.errstate(over='ignore'):
+        z = np.asarray(pages).astype(np.uint64) + np.uint64((0x9E3779B97F4A7C15 * (seed + 1)) & (2**64 - 1))
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        z = z ^ (z >> np.uint64(31))
+    return z & np.uint64(MODULUS - 1)
+
+
+def sample_trace(pages, rate, max_pages=None, seed=0):
+    """
+    Lấy mẫu trace. pages: mảng NumPy hoặc iterator các chunk (xem core.trace).
+    Trả về Sample(pages, rate, total): rate là tỉ lệ thực tế cuối cùng (có thể
+    nhỏ hơn `rate` nếu phải hạ ngưỡng vì max_pages), total là số request gốc.
+    """
+    chunks = [pages] if isinstance(pages, np.ndarray) else pages
+    threshold = max(1, int(rate * MODULUS))
+    kept, kept_hashes = [], []
+    # page -> hash của các page khác nhau đang nằm trong mẫu (chỉ khi có max_pages)
+    distinct = {}
+    total = 0
+
+    for chunk in chunks:
+        chunk = np.asarray(chunk)
+        total += len(chunk)
+        hashes = page_hash(chunk, seed)
+        mask = hashes < threshold
+        chunk, hashes = chunk[mask], hashes[mask]
+
+        if max_pages is not None and len(chunk):
+            uniq, idx = np.unique(chunk, return_index=True)
+            distinct.update(zip(uniq.tolist(), hashes[idx].tolist()))
+            if len(distinct) > max_pages:
+                # Hạ ngưỡng xuống hash nhỏ thứ (max_pages + 1) -> còn đúng max_pages page
+                threshold = int(np.partition(np.fromiter(distinct.values(), np.int64, len(distinct)),
+                                             max_pages)[max_pages])
+                distinct = {k: h for k, h in distinct.items() if h < threshold}
+                mask = hashes < threshold
+                chunk, hashes = chunk[mask], hashes[mask]
+
+        kept.append(chunk)
+        kept_hashes.append(hashes)
+
+    if kept:
+        sample = np.concatenate(kept)
+        # Ngưỡng chỉ giảm dần -> lọc lại các chunk cũ theo ngưỡng cuối
+        sample = sample[np.concatenate(kept_hashes) < threshold]
+    else:
+        sample = np.zeros(0, dtype=np.int64)
+    return Sample(sample, threshold / MODULUS, total)
+
+
+def scaled_capacity(capacity, rate, minimum=1):
+    # Mẫu quá nhỏ -> capacity thu nhỏ có thể dưới mức thuật toán chấp nhận (LIRS >= 2)
+    return max(minimum, int(round(capacity * rate)))
+
+
+def approx_lru_mrc(sample, capacities):
+    """
+    MRC của LRU từ stack distance trên mẫu, distance được nhân 1/R.
+    Có hiệu chỉnh SHARDS-adj: chênh lệch giữa số mẫu kỳ vọng (total * R) và
+    số mẫu thực tế được cộng vào nhóm distance nhỏ nhất.
+    """
+    capacities = np.asarray(capacities)
+    distances = stack_distances(sample.pages)
+    reuse = np.sort(distances[distances != COLD])
+    expected = sample.total * sample.rate
+    if expected <= 0:
+        return MissRatioCurve(capacities, np.zeros(len(capacities)), sample.rate)
+    hits = np.searchsorted(reuse, capacities * sample.rate, side='right')
+    hits = hits + (expected - len(distances))
+    miss_ratio = np.clip((expected - hits) / expected, 0.0, 1.0)
+    return MissRatioCurve(capacities, miss_ratio, sample.rate)
+
+
+def approx_mrc(algo_name, sample, capacities):
+    """
+    MRC gần đúng: replay mẫu với capacity đã thu nhỏ theo tỉ lệ mẫu.
+    Số miss được chia cho số mẫu kỳ vọng (total * R) thay vì số mẫu thực tế,
+    tương đương hiệu chỉnh SHARDS-adj (phần request dư do page nóng lọt vào
+    mẫu hầu hết là HIT).
+    """
+    if algo_name == "LRU":
+        return approx_lru_mrc(sample, capacities)
+    info = registry.get(algo_name)
+    expected = sample.total * sample.rate
+    ratios = []
+    for capacity in capacities:
+        cap = scaled_capacity(capacity, sample.rate, info.min_capacity)
+        policy = info.create(cap, sample.pages)
+        _, misses = replay_totals(policy, [sample.pages])
+        ratios.append(min(1.0, misses / expected) if expected > 0 else 0.0)
+    return MissRatioCurve(np.asarray(capacities), np.array(ratios), sample.rate)
+
+
+def exact_mrc(algo_name, pages, capacities):
+    """MRC chính xác (LRU dùng stack distance, thuật toán khác replay từng capacity)"""
+    pages = np.asarray(pages)
+    capacities = np.asarray(capacities)
+    n = len(pages)
+    if algo_name == "LRU":
+        from core.stack_distance import lru_miss_counts
+        misses = lru_miss_counts(pages, int(capacities.max()))
+        return MissRatioCurve(capacities, misses[capacities] / n if n else np.zeros(len(capacities)), 1.0)
+    info = registry.get(algo_name)
+    ratios = []
+    for capacity in capacities:
+        policy = info.create(int(capacity), pages)
+        _, misses = replay_totals(policy, [pages])
+        ratios.append(misses / n if n else 0.0)
+    return MissRatioCurve(capacities, np.array(ratios), 1.0)
+
+
+def estimate_error(algo_name, pages, capacities, rate, max_pages=None, seed=0):
+    """
+    Đo sai số của MRC lấy mẫu so với replay chính xác trên `pages`
+    (nên dùng trace nhỏ hơn trace thật để replay chính xác còn chạy được).
+    Trả về dict: capacities, approx, exact, mae (sai số tuyệt đối trung bình), max_error.
+    """
+    sample = sample_trace(np.asarray(pages), rate, max_pages, seed)
+    approx = approx_mrc(algo_name, sample, capacities)
+    exact = exact_mrc(algo_name, pages, capacities)
+    error = np.abs(approx.miss_ratio - exact.miss_ratio)
+    return {
+        'capacities': approx.capacities,
+        'approx': approx.miss_ratio,
+        'exact': exact.miss_ratio,
+        'rate': sample.rate,
+        'mae': float(error.mean()) if len(error) else 0.0,
+        'max_error': float(error.max()) if len(error) else 0.0,
+    }
@@ -0,0 +1,73 @@
+# core/stack_distance.py
+"""
+Phân tích stack distance (Mattson) cho LRU.
+
+Stack distance của một request = số page khác nhau được truy cập kể từ lần
+truy cập trước của chính page đó (tính cả nó). LRU với capacity C sẽ HIT
+khi và chỉ khi distance <= C, nên chỉ cần 1 lượt duyệt trace là có được
+miss ratio của LRU ở mọi capacity.
+
+Dùng Fenwick tree trên trục thời gian: vị trí t được đánh dấu nếu đó là lần
+truy cập gần nhất của một page. Mỗi request tốn O(log n).
+"""
+from array import array
+
+import numpy as np
+
+# Distance của request đầu tiên tới một page (cold miss)
+COLD = -1
+
+
+def stack_distances(pages):
+    """Trả về mảng int64 stack distance của từng request (COLD nếu cold miss)"""
+    seq = pages.tolist() if isinstance(pages, np.ndarray) else list(pages)
+    n = len(seq)
+    tree = [0] * (n + 1)
+    last = {}
+    distances = array('q', [COLD]) * n
+
+    for t, page in enumerate(seq, 1):
+        p = last.get(page)
+        if p is not None:
+            # Mọi dấu đều nằm ở vị trí < t, nên số dấu sau p = tổng - prefix(p)
+            s = 0
+            i = p
+            while i:
+                s += tree[i]
+                i &= i - 1
+            distances[t - 1] = len(last) - s + 1
+            # Bỏ dấu ở vị trí cũ
+            i = p
+            while i <= n:
+                tree[i] -= 1
+                i += i & -i
+        i = t
+        while i <= n:
+            tree[i] += 1
+            i += i & -i
+        last[page] = t
+
+    return np.frombuffer(distances, dtype=np.int64)
+
+
+def lru_miss_counts(pages, max_capacity=None, distances=None):
+    """
+    Số miss của LRU với mọi capacity 0..max_capacity (index = capacity).
+    Mặc định max_capacity = số page khác nhau (lớn hơn nữa thì chỉ còn cold miss).
+    """
+    if distances is None:
+        distances = stack_distances(pages)
+    reuse = distances[distances != COLD]
+    if max_capacity is None:
+        max_capacity = len(distances) - len(reuse)
+    hist = np.bincount(reuse, minlength=max_capacity + 1)[:max_capacity + 1]
+    return len(distances) - np.cumsum(hist)
+
+
+def miss_ratio_curve(pages, max_capacity=None, distances=None):
+    """Miss ratio của LRU với mọi capacity 0..max_capacity (index = capacity)"""
+    if distances is None:
+        distances = stack_distances(pages)
+    misses = lru_miss_counts(pages, max_capacity, distances)
+    total = len(distances)
+    return misses / total if total else misses.astype(float)
@@ -0,0 +1,270 @@
+# core/store.py
+"""
+Lưu kết quả mô phỏng trên đĩa, định danh theo nội dung (content-addressed).
+
+Khóa = hash của (hash nội dung trace, tên thuật toán, tham số, phiên bản code).
+Phiên bản code là hash mã nguồn module định nghĩa lớp thuật toán, nên sửa
+thuật toán thì kết quả cũ tự động không còn được dùng.
+
+Mỗi kết quả là 1 file .npz (dạng cột, nén):
+- meta:           JSON (khóa, thuật toán, tham số, tổng hits/misses, row thống kê)
+- window_hits / window_misses: số HIT / MISS trên từng cửa sổ `window` request
+- hit_mask (packbits) / evicted: mảng theo từng request (tùy chọn)
+
+Tổng dung lượng thư mục bị giới hạn bởi max_bytes; khi vượt, file ít được
+dùng gần đây nhất (theo mtime, được cập nhật mỗi lần đọc) bị xóa trước.
+Kết quả lớn hơn cả max_bytes không được lưu.
+
+Row thống kê chỉ lưu các cột tất định; các cột đo thời gian / bộ nhớ
+(MEASURED_COLUMNS) phụ thuộc lần chạy nên để trống (None) khi đọc lại.
+"""
+import functools
+import hashlib
+import inspect
+import json
+import os
+import sys
+import tempfile
+import warnings
+
+import numpy as np
+
+from core import registry
+from core.replay import iter_chunks, iter_replay
+
+# Tăng khi đổi định dạng file
+FORMAT_VERSION = 1
+DEFAULT_ROOT = os.environ.get("PAGING_SIM_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "paging-simulator"))
+DEFAULT_MAX_BYTES = 512 << 20
+# Kích thước cửa sổ mặc định cho thống kê theo thời gian
+WINDOW = 10_000
+# Cột của core.replay.simulate đo trên lần chạy cụ thể (không lưu vào store)
+MEASURED_COLUMNS = ('req_per_sec', 'peak_mb', 'bytes_per_frame', 'ns_per_access')
+
+
+def array_digest(pages):
+    """Hash nội dung mảng page id (không phụ thuộc dtype đầu vào)"""
+    data = np.ascontiguousarray(np.asarray(pages, dtype=np.int64))
+    h = hashlib.blake2b(digest_size=20)
+    h.update(b"pages:")
+    h.update(memoryview(data).cast('B'))
+    return h.hexdigest()
+
+
+def file_digest(path, block_size=1 << 22):
+    """Hash nội dung file trace (đọc theo block, không nạp cả file)"""
+    h = hashlib.blake2b(digest_size=20)
+    h.update(b"file:")
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def spec_digest(**spec):
+    """Hash của mô tả trace tổng hợp (vd. tên workload, n, seed, tham số)"""
+    return hashlib.blake2b(json.dumps(spec, sort_keys=True, default=str).encode(), digest_size=20).hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def module_version(module_name):
+    source = inspect.getsource(sys.modules[module_name])
+    return hashlib.blake2b(source.encode(), digest_size=8).hexdigest()
+
+
+def code_version(algo_name, compact=False):
+    cls = registry.get(algo_name).load(compact)
+    return f"{FORMAT_VERSION}:{cls.__qualname__}:{module_version(cls.__module__)}"
+
+
+class WindowCounter:
+    """Cộng dồn số HIT theo cửa sổ `window` request qua các chunk liên tiếp"""
+    __slots__ = ('window', 'offset', 'hits', 'sizes')
+
+    def __init__(self, window=WINDOW):
+        self.window = window
+        self.offset = 0
+        self.hits = np.zeros(0, dtype=np.int64)
+        self.sizes = np.zeros(0, dtype=np.int64)
+
+    def add(self, hit_mask):
+        n = len(hit_mask)
+        if not n:
+            return
+        ids = np.arange(self.offset, self.offset + n) // self.window
+        first, count = ids[0], ids[-1] - ids[0] + 1
+        hits = np.bincount(ids - first, weights=hit_mask, minlength=count).astype(np.int64)
+        sizes = np.bincount(ids - first, minlength=count)
+        # Cửa sổ đầu có thể nối tiếp cửa sổ cuối của chunk trước
+        if len(self.hits) > first:
+            self.hits[first] += hits[0]
+            self.sizes[first] += sizes[0]
+            hits, sizes = hits[1:], sizes[1:]
+        self.hits = np.concatenate((self.hits, hits))
+        self.sizes = np.concatenate((self.sizes, sizes))
+        self.offset += n
+
+    def misses(self):
+        return self.sizes - self.hits
+
+
+class ResultStore:
+    def __init__(self, root=DEFAULT_ROOT, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        os.makedirs(root, exist_ok=True)
+
+    def key(self, trace_digest, algo_name, compact=False, **params):
+        spec = {'trace': trace_digest, 'algo': algo_name, 'compact': compact,
+                'code': code_version(algo_name, compact), 'params': params}
+        return hashlib.blake2b(json.dumps(spec, sort_keys=True).encode(), digest_size=20).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.root, f"{key}.npz")
+
+    def get(self, key):
+        """Trả về dict kết quả hoặc None; đánh dấu vừa được dùng (cho LRU)"""
+        path = self._path(key)
+        try:
+            with np.load(path) as data:
+                result = {name: data[name] for name in data.files}
+            os.utime(path)
+        except (FileNotFoundError, ValueError, OSError):
+            return None
+        result['meta'] = json.loads(str(result['meta']))
+        if 'hit_mask' in result:
+            result['hit_mask'] = np.unpackbits(result['hit_mask'], count=result['meta']['requests']).astype(bool)
+        return result
+
+    def put(self, key, meta, window_hits=None, window_misses=None, hit_mask=None, evicted=None):
+        """Lưu kết quả; trả về False (và cảnh báo) nếu file lớn hơn max_bytes"""
+        # .item(): số NumPy -> số Python
+        arrays = {'meta': np.array(json.dumps(meta, default=lambda o: o.item()))}
+        if window_hits is not None:
+            arrays['window_hits'] = np.asarray(window_hits)
+            arrays['window_misses'] = np.asarray(window_misses)
+        if hit_mask is not None:
+            arrays['hit_mask'] = np.packbits(hit_mask)
+        if evicted is not None:
+            arrays['evicted'] = np.asarray(evicted)
+        # Ghi ra file tạm rồi đổi tên để reader không thấy file dở dang
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez_compressed(f, **arrays)
+            size = os.path.getsize(tmp)
+            if size > self.max_bytes:
+                # evict() sẽ xóa luôn chính file này -> không lưu
+                os.unlink(tmp)
+                warnings.warn(f"Kết quả {key} ({size:,} byte) lớn hơn max_bytes={self.max_bytes:,}, không lưu")
+                return False
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+        self.evict(keep=key)
+        return True
+
+    def evict(self, keep=None):
+        """
+        Xóa các kết quả dùng lâu nhất cho tới khi tổng dung lượng <= max_bytes.
+        keep: khóa không được xóa (kết quả vừa ghi, mtime có thể trùng file cũ).
+        """
+        keep = keep and self._path(keep)
+        entries = []
+        for entry in os.scandir(self.root):
+            if entry.name.endswith(".npz"):
+                st = entry.stat()
+                entries.append((st.st_mtime, st.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def size(self):
+        return sum(e.stat().st_size for e in os.scandir(self.root) if e.name.endswith(".npz"))
+
+    def clear(self):
+        for entry in os.scandir(self.root):
+            if entry.name.endswith(".npz"):
+                os.unlink(entry.path)
+
+    def run(self, algo_name, capacity, pages, compact=False, window=WINDOW, keep_steps=False, digest=None):
+        """
+        Lấy kết quả (algo_name, capacity) trên `pages` từ store, hoặc chạy rồi lưu lại.
+        keep_steps=True lưu / trả về cả hit_mask và evicted theo từng request.
+        """
+        digest = digest or array_digest(pages)
+        key = self.key(digest, algo_name, compact, capacity=capacity, window=window)
+        result = self.get(key)
+        if result is not None and (not keep_steps or 'hit_mask' in result):
+            return result
+
+        policy = registry.create(algo_name, capacity, pages, compact)
+        counter = WindowCounter(window)
+        masks, evicted = [], []
+        for chunk in iter_replay(policy, iter_chunks(pages)):
+            counter.add(chunk.hit_mask)
+            if keep_steps:
+                masks.append(chunk.hit_mask)
+                evicted.append(chunk.evicted)
+        requests = policy.hits + policy.misses
+        meta = {'key': key, 'algo': algo_name, 'capacity': capacity, 'compact': compact, 'window': window,
+                'requests': requests, 'hits': policy.hits, 'misses': policy.misses}
+        steps = (np.concatenate(masks) if masks else np.zeros(0, dtype=bool),
+                 np.concatenate(evicted) if evicted else np.zeros(0, dtype=np.int64)) if keep_steps else (None, None)
+        self.put(key, meta, counter.hits, counter.misses(), *steps)
+        result = {'meta': meta, 'window_hits': counter.hits, 'window_misses': counter.misses()}
+        if keep_steps:
+            result['hit_mask'], result['evicted'] = steps
+        return result
+
+
+def compare_cached(store, digest, policies, capacities, chunks, trace=None, compact=False, instrumented=False,
+                   window=WINDOW):
+    """
+    Giống core.engine.compare nhưng lấy các ô (thuật toán, capacity) đã có
+    trong store, chỉ chạy (1 lượt qua trace) các ô còn thiếu rồi lưu lại.
+    chunks: hàm không tham số trả về iterator các chunk (chỉ gọi khi cần chạy).
+    Trả về list row theo thứ tự (thuật toán, capacity); các cột
+    MEASURED_COLUMNS của ô lấy từ store là None (không đo lại).
+    """
+    from core.engine import MultiPolicyEngine
+    from core.instrument import instrument
+
+    cells = [(name, capacity) for name in policies for capacity in capacities]
+    keys = {cell: store.key(digest, cell[0], compact, capacity=cell[1], window=window, instrumented=instrumented)
+            for cell in cells}
+    rows = {}
+    for cell in cells:
+        entry = store.get(keys[cell])
+        if entry is not None and 'row' in entry['meta']:
+            row = entry['meta']['row']
+            row.update((c, None) for c in MEASURED_COLUMNS if c in row)
+            rows[cell] = row
+
+    todo = [cell for cell in cells if cell not in rows]
+    if todo:
+        policies = {cell: registry.create(cell[0], cell[1], trace, compact) for cell in todo}
+        if instrumented:
+            for policy in policies.values():
+                instrument(policy)
+        counters = {cell: WindowCounter(window) for cell in todo}
+        engine = MultiPolicyEngine(policies, on_chunk=lambda cell, hit_mask, _: counters[cell].add(hit_mask))
+        for row in engine.run(chunks()).results():
+            cell = (row['algo'], row['capacity'])
+            rows[cell] = row
+            # Giữ tên cột đo (giá trị None) để row đọc lại có cùng các cột
+            stored = {c: None if c in MEASURED_COLUMNS else v for c, v in row.items()}
+            meta = {'key': keys[cell], 'algo': cell[0], 'capacity': cell[1], 'compact': compact, 'window': window,
+                    'requests': row['requests'], 'hits': row['hits'], 'misses': row['misses'], 'row': stored}
+            store.put(keys[cell], meta, counters[cell].hits, counters[cell].misses())
+    return [rows[cell] for cell in cells]
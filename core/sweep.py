@@ -0,0 +1,90 @@
+# core/sweep.py
+"""
+Chạy song song lưới (trace, thuật toán, capacity) bằng ProcessPoolExecutor.
+
+Mỗi trace được ghi 1 lần ra file .npy và worker mở lại bằng mmap
+(np.load(mmap_mode='r')), nên các task không phải pickle cả trace; các
+process dùng chung page cache của hệ điều hành. Trace đã là np.memmap trên
+cả 1 file (vd. .u32 / .u64 từ core.trace.load_trace) được mở lại trực tiếp
+từ file đó, không copy.
+"""
+import mmap
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from core.replay import COLUMNS, INSTRUMENT_COLUMNS, simulate
+
+# Cache mmap trong từng worker: nguồn trace (xem _open_trace) -> mảng
+_TRACES = {}
+
+
+def _memmap_source(trace):
+    """(file, dtype, offset, độ dài) nếu trace là np.memmap trên cả 1 file, ngược lại None"""
+    # Lát cắt của memmap có base là memmap cha và offset không còn đúng -> phải copy
+    if (isinstance(trace, np.memmap) and isinstance(trace.base, mmap.mmap) and trace.filename
+            and trace.ndim == 1 and len(trace)):
+        return trace.filename, trace.dtype.str, trace.offset, len(trace)
+    return None
+
+
+def _open_trace(source):
+    """source: đường dẫn .npy hoặc tuple của _memmap_source"""
+    pages = _TRACES.get(source)
+    if pages is None:
+        if isinstance(source, tuple):
+            path, dtype, offset, length = source
+            pages = np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=(length,))
+        else:
+            pages = np.load(source, mmap_mode='r')
+        _TRACES[source] = pages
+    return pages
+
+
+def _run_cell(trace_name, source, algo_name, capacity, compact, instrumented):
+    row = simulate(algo_name, capacity, _open_trace(source), compact, instrumented)
+    row['trace'] = trace_name
+    return row
+
+
+def iter_sweep(traces, policies, capacities, max_workers=None, compact=False, instrumented=False):
+    """
+    Chạy mọi ô (trace, thuật toán, capacity) và yield dict kết quả ngay khi
+    từng ô xong (thứ tự không cố định).
+    traces: dict tên -> mảng page id (có thể là np.memmap), hoặc đường dẫn
+    tới file .npy có sẵn.
+    """
+    with tempfile.TemporaryDirectory(prefix="paging-sweep-") as tmpdir:
+        sources = {}
+        for i, (name, trace) in enumerate(traces.items()):
+            source = trace if isinstance(trace, str) else _memmap_source(trace)
+            if source is None:
+                source = os.path.join(tmpdir, f"trace{i}.npy")
+                np.save(source, np.asarray(trace))
+            sources[name] = source
+
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(_run_cell, name, source, algo, cap, compact, instrumented)
+                       for name, source in sources.items()
+                       for algo in policies
+                       for cap in capacities]
+            for future in as_completed(futures):
+                yield future.result()
+
+
+def sweep(traces, policies, capacities, max_workers=None, on_result=None, compact=False,
+          instrumented=False):
+    """
+    Giống iter_sweep nhưng gom kết quả vào pandas DataFrame.
+    on_result(row, df) (nếu có) được gọi sau mỗi ô với DataFrame tới thời điểm đó.
+    """
+    columns = ['trace'] + COLUMNS + (INSTRUMENT_COLUMNS if instrumented else [])
+    df = pd.DataFrame(columns=columns)
+    for row in iter_sweep(traces, policies, capacities, max_workers, compact, instrumented):
+        df.loc[len(df)] = row
+        if on_result is not None:
+            on_result(row, df)
+    return df.sort_values(['trace', 'algo', 'capacity'], ignore_index=True)
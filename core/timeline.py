@@ -0,0 +1,46 @@
+# core/timeline.py
+from core.history import History
+
+
+class Timeline:
+    """
+    Kết quả chạy sẵn toàn bộ trace để UI nhảy tới vị trí bất kỳ
+    (kể cả các bước "STEP" của CLOCK).
+
+    Vị trí 0 là trạng thái ban đầu, vị trí i là sau lần gọi access() thứ i.
+    Dữ liệu nằm trong core.history.History: 1 event dạng cột cho mỗi lần gọi
+    và 1 checkpoint sau mỗi `checkpoint_every` lần, nên bộ nhớ là
+    O(số bước + số bước / checkpoint_every * capacity). at() dựng lại trạng
+    thái từ checkpoint gần nhất (tối đa checkpoint_every - 1 lần access()),
+    thời gian không phụ thuộc độ dài trace.
+    """
+    def __init__(self, instance, requests, checkpoint_every=64):
+        self.history = History(instance, checkpoint_every)
+        step = 0
+        while step < len(requests):
+            page = requests[step]
+            status, evicted = instance.access(page)
+            if status != "STEP":
+                step += 1
+            self.history.record(instance, page, status, evicted, step)
+
+    def __len__(self):
+        return len(self.history) + 1
+
+    def at(self, position):
+        """Trả về dict mô tả trạng thái tại `position`"""
+        instance = self.history.rebuild(position)
+        step, (status, evicted) = self.history.state_at(position)
+        return {
+            'step': step,
+            'status': status,
+            'evicted': evicted,
+            'hits': instance.hits,
+            'misses': instance.misses,
+            'hand': getattr(instance, 'hand', None),
+            'cache_state': instance.get_cache_state(),
+        }
+
+    def position_of_step(self, step):
+        """Vị trí đầu tiên mà UI đã xử lý xong `step` request"""
+        return self.history.position_of_step(step)
@@ -0,0 +1,113 @@
+# core/trace.py
+"""
+Đọc trace theo dạng stream, bộ nhớ không phụ thuộc độ dài trace.
+
+Định dạng hỗ trợ:
+- "text": page id cách nhau bởi khoảng trắng / xuống dòng (.txt, ...)
+- "gzip" / "zstd": text nén (.gz, .zst); zstd cần gói `zstandard`
+- "u32" / "u64": mảng nhị phân uint32 / uint64 little-endian (.u32, .u64),
+  đọc qua np.memmap nên không nạp cả file vào RAM
+"""
+import gzip
+
+import numpy as np
+
+CHUNK_SIZE = 1 << 20
+# Số byte đọc mỗi lần với trace dạng text
+TEXT_BLOCK_BYTES = 8 << 20
+
+BINARY_DTYPES = {'u32': np.dtype('<u4'), 'u64': np.dtype('<u8')}
+
+_EXTENSIONS = {
+    '.gz': 'gzip',
+    '.zst': 'zstd',
+    '.zstd': 'zstd',
+    '.u32': 'u32',
+    '.u64': 'u64',
+}
+
+
+def detect_format(path):
+    """Đoán định dạng từ đuôi file, mặc định là "text" """
+    for ext, fmt in _EXTENSIONS.items():
+        if str(path).endswith(ext):
+            return fmt
+    return 'text'
+
+
+def open_text(path, fmt):
+    if fmt == 'gzip':
+        return gzip.open(path, 'rb')
+    if fmt == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("Đọc trace .zst cần cài gói 'zstandard' (pip install zstandard)") from None
+        # File ghi bởi zstd -T / nối nhiều file .zst có nhiều frame; mặc định
+        # stream_reader dừng ở cuối frame đầu tiên
+        return zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True, read_across_frames=True)
+    return open(path, 'rb')
+
+
+def iter_text_chunks(path, fmt='text', block_bytes=TEXT_BLOCK_BYTES):
+    """Đọc trace text theo từng khối byte, yield mảng int64"""
+    tail = b''
+    with open_text(path, fmt) as f:
+        while True:
+            block = f.read(block_bytes)
+            if not block:
+                break
+            block = tail + block
+            # Token cuối có thể bị cắt ngang giữa 2 khối -> giữ lại cho khối sau
+            cut = max(block.rfind(b' '), block.rfind(b'\n'), block.rfind(b'\t'), block.rfind(b'\r'))
+            if cut < 0:
+                tail = block
+                continue
+            tail = block[cut + 1:]
+            tokens = block[:cut].split()
+            if tokens:
+                yield np.array(tokens, dtype=np.int64)
+    tokens = tail.split()
+    if tokens:
+        yield np.array(tokens, dtype=np.int64)
+
+
+def open_binary(path, fmt):
+    """Mở trace nhị phân bằng np.memmap (chỉ đọc)"""
+    return np.memmap(path, dtype=BINARY_DTYPES[fmt], mode='r')
+
+
+def iter_binary_chunks(path, fmt, chunk_size=CHUNK_SIZE):
+    """Yield từng đoạn chunk_size phần tử của trace nhị phân (view trên memmap)"""
+    pages = open_binary(path, fmt)
+    for start in range(0, len(pages), chunk_size):
+        yield pages[start:start + chunk_size]
+
+
+def iter_trace_chunks(path, fmt=None, chunk_size=CHUNK_SIZE):
+    """Generator các chunk (mảng NumPy) của trace, bất kể định dạng"""
+    fmt = fmt or detect_format(path)
+    if fmt in BINARY_DTYPES:
+        yield from iter_binary_chunks(path, fmt, chunk_size)
+    else:
+        yield from iter_text_chunks(path, fmt)
+
+
+def load_trace(path, fmt=None):
+    """
+    Nạp cả trace thành 1 mảng. Với trace nhị phân trả về memmap (không copy),
+    với text thì ghép các chunk lại (tốn 8 byte / request).
+    """
+    fmt = fmt or detect_format(path)
+    if fmt in BINARY_DTYPES:
+        return open_binary(path, fmt)
+    chunks = list(iter_text_chunks(path, fmt))
+    return np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.int64)
+
+
+def write_binary(chunks, path, fmt='u32'):
+    """Ghi các chunk page id ra file nhị phân (vd. để chuyển trace text sang u32)"""
+    dtype = BINARY_DTYPES[fmt]
+    with open(path, 'wb') as f:
+        for chunk in chunks:
+            f.write(np.asarray(chunk).astype(dtype, copy=False).tobytes())
@@ -0,0 +1,156 @@
+# core/workloads.py
+"""
+Sinh trace tổng hợp bằng NumPy (vector hóa, có seed để chạy lại được).
+
+- zipf:   page phổ biến theo luật lũy thừa (page 0 nóng nhất)
+- scan:   quét tuần tự, không bao giờ dùng lại page
+- loop:   lặp vòng qua loop_size page (LRU/FIFO MISS toàn bộ khi loop_size > capacity)
+- phases: working set đổi sau mỗi phase_length request
+- mixed:  trộn ngẫu nhiên nhiều workload theo trọng số
+
+Mỗi workload là 1 object có trạng thái (vị trí, RNG); next(size) trả về
+size request tiếp theo, nên có thể sinh theo từng chunk (iter_workload) mà
+không giữ cả trace trong RAM, hoặc sinh cả trace một lần (generate).
+"""
+import numpy as np
+
+from core.replay import CHUNK_SIZE
+
+
+class Workload:
+    def __init__(self, seed=0, base=0):
+        self.rng = np.random.default_rng(seed)
+        # Cộng vào mọi page id (tách không gian page khi trộn workload)
+        self.base = base
+        self.pos = 0
+
+    def next(self, size):
+        pages = self._generate(size)
+        self.pos += size
+        if self.base:
+            pages += self.base
+        return pages
+
+    def _generate(self, size):
+        raise NotImplementedError
+
+
+class Zipf(Workload):
+    """
+    Xác suất page hạng r tỉ lệ khoảng r^-alpha, lấy mẫu bằng nghịch đảo CDF
+    của phân phối lũy thừa liên tục trên [1, n_pages + 1) rồi làm tròn xuống
+    (không cần bảng CDF n_pages phần tử hay searchsorted).
+    """
+    def __init__(self, n_pages=1000, alpha=1.0, seed=0, base=0):
+        super().__init__(seed, base)
+        self.n_pages = n_pages
+        self.alpha = alpha
+
+    def _generate(self, size):
+        u = self.rng.random(size)
+        top = self.n_pages + 1.0
+        if abs(self.alpha - 1.0) < 1e-9:
+            x = np.power(top, u)
+        else:
+            e = 1.0 - self.alpha
+            x = np.power(1.0 + u * (top ** e - 1.0), 1.0 / e)
+        pages = x.astype(np.int64) - 1
+        # Sai số làm tròn có thể chạm đúng n_pages
+        np.minimum(pages, self.n_pages - 1, out=pages)
+        return pages
+
+
+class Scan(Workload):
+    def _generate(self, size):
+        return np.arange(self.pos, self.pos + size, dtype=np.int64)
+
+
+class Loop(Workload):
+    def __init__(self, loop_size=100, seed=0, base=0):
+        super().__init__(seed, base)
+        self.loop_size = loop_size
+
+    def _generate(self, size):
+        pages = np.arange(self.pos, self.pos + size, dtype=np.int64)
+        pages %= self.loop_size
+        return pages
+
+
+class Phases(Workload):
+    """
+    Chọn ngẫu nhiên đều trong working set [p * shift, p * shift + working_set)
+    với p = số thứ tự pha; mặc định shift = working_set (các pha không trùng page).
+    """
+    def __init__(self, working_set=100, phase_length=10000, shift=None, seed=0, base=0):
+        super().__init__(seed, base)
+        self.working_set = working_set
+        self.phase_length = phase_length
+        self.shift = working_set if shift is None else shift
+
+    def _generate(self, size):
+        phase = np.arange(self.pos, self.pos + size, dtype=np.int64) // self.phase_length
+        return phase * self.shift + self.rng.integers(0, self.working_set, size)
+
+
+class Mixed(Workload):
+    """components: list các Workload, weights: xác suất chọn từng workload cho mỗi request"""
+    def __init__(self, components, weights=None, seed=0, base=0):
+        super().__init__(seed, base)
+        self.components = list(components)
+        weights = np.ones(len(components)) if weights is None else np.asarray(weights, dtype=float)
+        self.weights = weights / weights.sum()
+
+    def _generate(self, size):
+        choice = self.rng.choice(len(self.components), size, p=self.weights)
+        counts = np.bincount(choice, minlength=len(self.components))
+        pages = np.empty(size, dtype=np.int64)
+        for k, (component, count) in enumerate(zip(self.components, counts)):
+            if count:
+                pages[choice == k] = component.next(int(count))
+        return pages
+
+
+# Page id của phần scan trong "mixed" mặc định, tách khỏi các page nóng của zipf
+SCAN_BASE = 1 << 40
+
+
+def _default_mixed(n_pages=1000, alpha=1.0, scan_weight=0.2, scan_base=SCAN_BASE, seed=0, base=0):
+    """Zipf + scan xen kẽ (kịch bản kiểm tra khả năng chống scan)"""
+    return Mixed([Zipf(n_pages, alpha, seed + 1), Scan(seed + 2, scan_base)],
+                 [1 - scan_weight, scan_weight], seed, base)
+
+
+WORKLOADS = {
+    'zipf': Zipf,
+    'scan': Scan,
+    'loop': Loop,
+    'phases': Phases,
+    'mixed': _default_mixed,
+}
+
+
+def names():
+    return list(WORKLOADS)
+
+
+def create(name, seed=0, **params):
+    if name not in WORKLOADS:
+        raise KeyError(f"Không có workload '{name}' (có: {', '.join(WORKLOADS)})")
+    return WORKLOADS[name](seed=seed, **params)
+
+
+def iter_workload(name, n, seed=0, chunk_size=CHUNK_SIZE, **params):
+    """Yield các chunk (mảng int64) tổng cộng n request, giống core.trace.iter_trace_chunks"""
+    workload = create(name, seed, **params)
+    for start in range(0, n, chunk_size):
+        yield workload.next(min(chunk_size, n - start))
+
+
+def generate(name, n, seed=0, chunk_size=CHUNK_SIZE, **params):
+    """Sinh cả trace n request vào 1 mảng cấp phát trước (cùng kết quả với iter_workload)"""
+    pages = np.empty(n, dtype=np.int64)
+    start = 0
+    for chunk in iter_workload(name, n, seed, chunk_size, **params):
+        pages[start:start + len(chunk)] = chunk
+        start += len(chunk)
+    return pages
@@ -0,0 +1,11 @@
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def zipf_trace():
+    """make(seed, n, n_pages, alpha): trace lệch (zipf) dạng mảng int64, lặp lại được theo seed"""
+    def make(seed, n=5000, n_pages=80, alpha=1.2):
+        rng = np.random.default_rng(seed)
+        return (rng.zipf(alpha, n) % n_pages).astype(np.int64)
+    return make
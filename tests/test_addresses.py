@@ -0,0 +1,101 @@
+import numpy as np
+import pytest
+
+from core.addresses import (KIND_INSTR, KIND_MODIFY, KIND_READ, KIND_WRITE, PID_NONE, PID_SHIFT, iter_accesses,
+                            iter_blocks, load_addresses, parse_block)
+
+LACKEY = (b"==1234== Lackey, an example Valgrind tool\n"
+          b"I  0400d7d4,8\n"
+          b" L 7ff000398,8\n"
+          b" S 7ff0013a0,4\n"
+          b" M 0421e1b0,4\n"
+          b"==1234== ERROR SUMMARY: 0 errors\n")
+
+HEX = (b"0x1000\n"
+       b"2000\n"
+       b"12 W 0x3000\n"
+       b"7 r 4000\n"
+       b"I 0X5000\n"
+       b"\n"
+       b"not an address\n")
+
+
+def _write(tmp_path, data, name="trace.txt"):
+    path = tmp_path / name
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_lackey_lines():
+    addr, kind, pid = parse_block(LACKEY, 'lackey')
+    assert addr.tolist() == [0x0400d7d4, 0x7ff000398, 0x7ff0013a0, 0x0421e1b0]
+    assert kind.tolist() == [KIND_INSTR, KIND_READ, KIND_WRITE, KIND_MODIFY]
+    assert (pid == PID_NONE).all()
+
+
+def test_lackey_pid_from_header(tmp_path):
+    path = _write(tmp_path, LACKEY)
+    (addr, _, pid), = iter_accesses(path, 'lackey')
+    assert len(addr) == 4 and (pid == 1234).all()
+
+
+def test_hex_prefix_kind_and_pid():
+    addr, kind, pid = parse_block(HEX, 'hex')
+    # Có / không có "0x" đều là hex; dòng trống và dòng rác bị bỏ qua
+    assert addr.tolist() == [0x1000, 0x2000, 0x3000, 0x4000, 0x5000]
+    # Không ghi loại truy cập -> đọc
+    assert kind.tolist() == [KIND_READ, KIND_READ, KIND_WRITE, KIND_READ, KIND_INSTR]
+    assert pid.tolist() == [PID_NONE, PID_NONE, 12, 7, PID_NONE]
+
+
+@pytest.mark.parametrize("fmt, data", [('lackey', LACKEY), ('hex', HEX)])
+@pytest.mark.parametrize("block_bytes", [1, 5, 17])
+def test_record_split_across_blocks(tmp_path, fmt, data, block_bytes):
+    path = _write(tmp_path, data)
+    # Khối nhỏ cắt ngang dòng: mỗi khối vẫn chỉ gồm dòng đầy đủ
+    blocks = list(iter_blocks(path, block_bytes))
+    assert b''.join(blocks) == data and all(block.endswith(b'\n') for block in blocks)
+    chunks = list(iter_accesses(path, fmt, block_bytes))
+    expected = parse_block(data, fmt)
+    assert np.concatenate([c[0] for c in chunks]).tolist() == expected[0].tolist()
+    assert np.concatenate([c[1] for c in chunks]).tolist() == expected[1].tolist()
+
+
+def test_missing_final_newline(tmp_path):
+    path = _write(tmp_path, b"1000\n2000")
+    assert load_addresses(path, 'hex', page_size=4096).tolist() == [1, 2]
+
+
+@pytest.mark.parametrize("access, expected", [
+    (None, [0x0400d, 0x7ff000, 0x7ff001, 0x0421e]),
+    ('I', [0x0400d]),
+    ('R', [0x7ff000, 0x0421e]),
+    ('W', [0x7ff001, 0x0421e]),
+    ('rw', [0x7ff000, 0x7ff001, 0x0421e]),
+])
+def test_kind_filter(tmp_path, access, expected):
+    # M (đọc rồi ghi) qua cả bộ lọc R lẫn W
+    path = _write(tmp_path, LACKEY)
+    assert load_addresses(path, 'lackey', access=access).tolist() == expected
+
+
+def test_kind_filter_rejects_unknown(tmp_path):
+    path = _write(tmp_path, HEX)
+    with pytest.raises(ValueError):
+        load_addresses(path, 'hex', access='RX')
+
+
+def test_pid_namespace(tmp_path):
+    path = _write(tmp_path, HEX)
+    pages = load_addresses(path, 'hex', namespace=True, default_pid=3)
+    assert (pages >> PID_SHIFT).tolist() == [3, 3, 12, 7, 3]
+    assert (pages & ((1 << PID_SHIFT) - 1)).tolist() == [1, 2, 3, 4, 5]
+    # Không tách theo process -> pid bị bỏ qua
+    assert load_addresses(path, 'hex').tolist() == [1, 2, 3, 4, 5]
+
+
+def test_page_size(tmp_path):
+    path = _write(tmp_path, HEX)
+    assert load_addresses(path, 'hex', page_size=8192).tolist() == [0, 1, 1, 2, 2]
+    with pytest.raises(ValueError):
+        load_addresses(path, 'hex', page_size=3000)
@@ -0,0 +1,43 @@
+import pytest
+
+from core.cli import main
+
+
+@pytest.fixture
+def trace(tmp_path):
+    path = tmp_path / "trace.txt"
+    path.write_text("1 2 3 1 4 5 2 1\n")
+    return str(path)
+
+
+@pytest.mark.parametrize("argv", [
+    ["-c", "0", "-p", "LRU"],
+    ["-c", "4", "-1"],
+    ["-c", "1", "-p", "LIRS", "LRU"],
+])
+def test_rejects_capacity(trace, capsys, argv):
+    with pytest.raises(SystemExit) as exc:
+        main([trace, *argv])
+    assert exc.value.code == 2
+    assert "capacity" in capsys.readouterr().err.lower()
+
+
+def test_skips_policies_below_min_capacity(trace, capsys):
+    main([trace, "-c", "1", "--json"])
+    out, err = capsys.readouterr()
+    assert "LIRS" in err
+    assert '"LIRS"' not in out and '"LRU"' in out
+
+
+@pytest.mark.parametrize("argv", [["-c", "3", "--shards", "4"], ["-c", "8", "--shards", "0"]])
+def test_rejects_shards(trace, argv):
+    with pytest.raises(SystemExit) as exc:
+        main([trace, "-p", "LRU", *argv])
+    assert exc.value.code == 2
+
+
+def test_min_capacity_per_shard(trace, capsys):
+    # 7 frame / 4 shard -> shard nhỏ nhất có 1 frame, LIRS cần 2
+    with pytest.raises(SystemExit):
+        main([trace, "-c", "7", "--shards", "4", "-p", "LIRS"])
+    assert "LIRS" in capsys.readouterr().err
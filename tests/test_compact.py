@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from core.algorithms import CLOCK, LFU, OPT, CompactCLOCK, CompactLFU
+from core.replay import run_trace
+
+
+@pytest.mark.parametrize("full, compact", [(CLOCK, CompactCLOCK), (LFU, CompactLFU)])
+@pytest.mark.parametrize("capacity", [1, 4, 32])
+def test_compact_replay_matches(zipf_trace, full, compact, capacity):
+    pages = zipf_trace(capacity)
+    a, b = run_trace(full(capacity), pages), run_trace(compact(capacity), pages)
+    assert (a.hits, a.misses) == (b.hits, b.misses)
+    assert np.array_equal(a.hit_mask, b.hit_mask)
+    assert np.array_equal(a.evicted, b.evicted)
+
+
+@pytest.mark.parametrize("full, compact", [(CLOCK, CompactCLOCK), (LFU, CompactLFU)])
+def test_compact_access_matches(zipf_trace, full, compact):
+    a, b = full(8), compact(8)
+    for page in zipf_trace(7, 1500, 30).tolist():
+        # So sánh cả các bước "STEP" của CLOCK
+        while True:
+            step = a.access(page)
+            assert step == b.access(page)
+            if step[0] != "STEP":
+                break
+        assert a.get_cache_state() == b.get_cache_state()
+
+
+def test_clock_access_complete_matches_steps(zipf_trace):
+    a, b = CLOCK(6), CompactCLOCK(6)
+    stepped = CLOCK(6)
+    for page in zipf_trace(3, 1000, 20).tolist():
+        swept = 0
+        while True:
+            status, evicted = stepped.access(page)
+            if status != "STEP":
+                break
+            swept += 1
+        expected = (status, evicted, swept + 1 if status == "MISS" else 0)
+        assert a.access_complete(page) == expected
+        assert b.access_complete(page) == expected
+    assert a.hand == b.hand == stepped.hand
+
+
+@pytest.mark.parametrize("cls", [CompactCLOCK, CompactLFU])
+@pytest.mark.parametrize("capacity", [64, 4096])
+def test_memory_budget(cls, capacity):
+    # Cache đầy, page id ngẫu nhiên lớn (int không được Python cache sẵn)
+    rng = np.random.default_rng(capacity)
+    pool = rng.integers(1 << 40, 1 << 60, 4 * capacity)
+    pages = np.concatenate((pool[:2 * capacity], pool[rng.zipf(1.1, 20 * capacity) % len(pool)]))
+    policy = cls(capacity)
+    run_trace(policy, pages)
+    assert policy.bytes_per_frame() <= cls.MEMORY_BUDGET
+
+
+def test_memory_usage_excludes_trace_inputs():
+    short, long = np.arange(100) % 20, np.arange(100_000) % 20
+    a, b = OPT(20, short), OPT(20, long)
+    run_trace(a, short)
+    run_trace(b, long)
+    # trace / next_use tỉ lệ với độ dài trace, không phải trạng thái của cache
+    assert a.memory_usage() == pytest.approx(b.memory_usage(), rel=0.2)
@@ -0,0 +1,34 @@
+import pytest
+
+from core.algorithms import CLOCK, LFU, CompactCLOCK, CompactLFU
+from core.events import STATUS_HIT, load_events, record_trace
+
+
+def _expected(cls, capacity, pages):
+    """Chạy từng request qua access() và đọc kim / tần suất trực tiếp"""
+    policy = cls(capacity)
+    rows = []
+    for page in pages.tolist():
+        if policy.sweeps:
+            status, evicted, _ = policy.access_complete(page)
+            extra = policy.hand
+        else:
+            status, evicted = policy.access(page)
+            extra = policy.cache[page] if isinstance(policy, LFU) else policy.freq[policy.index[page]]
+        rows.append((status == "HIT", -1 if evicted is None else evicted, extra))
+    return rows
+
+
+@pytest.mark.parametrize("cls, column", [(CLOCK, 'hand'), (CompactCLOCK, 'hand'), (LFU, 'freq'), (CompactLFU, 'freq')])
+@pytest.mark.parametrize("chunk_size", [97, 1 << 20])
+def test_event_extra_column(tmp_path, zipf_trace, cls, column, chunk_size):
+    pages = zipf_trace(chunk_size, 4000, 40)
+    path = str(tmp_path / "events.npz")
+    # chunk_size nhỏ: kim / tần suất phải được nối đúng qua ranh giới chunk
+    hits, misses = record_trace(cls(7), pages, path, chunk_size=chunk_size, buffer_size=500)
+    df = load_events(path)
+    assert hits + misses == len(df) == len(pages)
+    assert df['step'].tolist() == list(range(len(pages)))
+    assert df['page'].tolist() == pages.tolist()
+    actual = list(zip((df['status'] == STATUS_HIT).tolist(), df['evicted'].tolist(), df[column].tolist()))
+    assert actual == _expected(cls, 7, pages)
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from core import hierarchy
+
+
+def _occupied(level):
+    state = level.get_cache_state()
+    return sum(1 for item in state if (item['val'] if isinstance(item, dict) else item) is not None)
+
+
+@pytest.mark.parametrize("mode", ["inclusive", "exclusive"])
+# CompactLFU không có remove() nên không dùng được trong hierarchy
+@pytest.mark.parametrize("names, compact", [
+    (("CLOCK", "CLOCK"), False), (("CLOCK", "CLOCK"), True), (("LRU", "CLOCK"), True),
+    (("CLOCK", "FIFO"), False), (("LIFO", "LFU"), False),
+])
+def test_levels_stay_full(mode, names, compact):
+    rng = np.random.default_rng(0)
+    pages = rng.zipf(1.1, 20000) % 400
+    h = hierarchy.create([(names[0], 8), (names[1], 32)], [1, 10], mode=mode, compact=compact)
+    access = h.access
+    for i, page in enumerate(pages.tolist()):
+        access(page)
+        if i < 2000:
+            continue
+        # exclusive: page bị lấy ra khỏi L2 được thay ngay bằng page L1 hạ xuống.
+        # inclusive: back-invalidation của request hiện tại có thể để trống 1 frame
+        # ở L1, frame đó được lấp ở lần MISS kế tiếp (không xóa page nào).
+        l1, l2 = (_occupied(level) for level in h.levels)
+        assert l2 == 32
+        assert l1 == 8 if mode == "exclusive" else l1 >= 7
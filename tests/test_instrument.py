@@ -0,0 +1,57 @@
+import pytest
+
+from core import partition, registry
+from core.instrument import instrument
+from core.replay import run_trace
+
+
+def _run_access(policy, pages):
+    for page in pages:
+        if policy.sweeps:
+            policy.access_complete(page)
+        else:
+            policy.access(page)
+
+
+@pytest.mark.parametrize("name", registry.names())
+@pytest.mark.parametrize("compact", [False, True])
+def test_probes_match_between_replay_and_access(zipf_trace, name, compact):
+    pages = zipf_trace(1, 3000, 200).tolist()
+    plain = registry.create(name, 16, pages, compact)
+    run_trace(plain, pages)
+    # Tắt đo đạc -> không đếm probe ngoài phần HIT tính gộp
+    assert plain.probes == 0
+
+    replayed, stepped = registry.create(name, 16, pages, compact), registry.create(name, 16, pages, compact)
+    a, b = instrument(replayed), instrument(stepped)
+    run_trace(replayed, pages)
+    _run_access(stepped, pages)
+    assert (replayed.hits, replayed.misses) == (plain.hits, plain.misses)
+    assert a.summary()['accesses'] == b.summary()['accesses'] == len(pages)
+    assert a.summary()['probes_per_access'] == b.summary()['probes_per_access'] > 0
+
+
+def test_sharded_probes_cover_access_path(zipf_trace):
+    pages = zipf_trace(2, 3000, 200).tolist()
+    replayed, stepped = partition.create('LRU', 32, 4), partition.create('LRU', 32, 4)
+    a, b = instrument(replayed), instrument(stepped)
+    run_trace(replayed, pages)
+    _run_access(stepped, pages)
+    assert a.summary()['probes_per_access'] == b.summary()['probes_per_access'] > 0
+
+
+@pytest.mark.parametrize("name", ['LFU', 'OPT'])
+def test_histogram_only_when_complete(zipf_trace, name):
+    pages = zipf_trace(3, 2000, 100).tolist()
+    stepped = registry.create(name, 8, pages)
+    stats = instrument(stepped)
+    _run_access(stepped, pages)
+    hist = stats.histogram('evict_search')
+    assert sum(n for _, n in hist) == stats.counters['evictions'] > 0
+
+    replayed = registry.create(name, 8, pages)
+    stats = instrument(replayed)
+    run_trace(replayed, pages)
+    # replay() chỉ cộng tổng -> không trả về histogram thiếu
+    assert stats.histogram('evict_search') is None
+    assert stats.summary()['evict_search_mean'] > 0
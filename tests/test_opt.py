@@ -0,0 +1,62 @@
+import functools
+import itertools
+
+import numpy as np
+import pytest
+
+from core.algorithms import OPT
+from core.replay import run_trace
+
+
+def _min_misses(pages, capacity):
+    """Số miss nhỏ nhất qua mọi cách chọn page bị xóa (vét cạn)"""
+    pages = tuple(pages)
+
+    @functools.lru_cache(maxsize=None)
+    def best(i, cache):
+        if i == len(pages):
+            return 0
+        page = pages[i]
+        if page in cache:
+            return best(i + 1, cache)
+        if len(cache) < capacity:
+            return 1 + best(i + 1, cache | {page})
+        return 1 + min(best(i + 1, (cache - {out}) | {page}) for out in cache)
+
+    return best(0, frozenset())
+
+
+def _belady(pages, capacity):
+    """Bélády trực tiếp: xóa page có lần dùng tiếp theo xa nhất (quét phần còn lại của trace)"""
+    cache, misses = set(), 0
+    for i, page in enumerate(pages):
+        if page in cache:
+            continue
+        misses += 1
+        if len(cache) == capacity:
+            rest = pages[i + 1:]
+            cache.remove(max(cache, key=lambda p: rest.index(p) if p in rest else len(rest)))
+        cache.add(page)
+    return misses
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_opt_is_optimal_on_small_traces(seed):
+    rng = np.random.default_rng(seed)
+    pages = rng.integers(0, 6, 14).tolist()
+    for capacity in (1, 2, 3, 4):
+        assert run_trace(OPT(capacity, pages), pages).misses == _min_misses(pages, capacity)
+
+
+@pytest.mark.parametrize("capacity", [1, 3, 8, 20])
+def test_opt_matches_belady(zipf_trace, capacity):
+    pages = zipf_trace(capacity, 2000, 50).tolist()
+    assert run_trace(OPT(capacity, pages), pages).misses == _belady(pages, capacity)
+
+
+def test_opt_access_matches_replay():
+    pages = list(itertools.islice(itertools.cycle([1, 2, 3, 4, 1, 2, 5, 1, 2, 3, 4, 5]), 60))
+    stepped = OPT(3, pages)
+    statuses = [stepped.access(page)[0] for page in pages]
+    result = run_trace(OPT(3, pages), pages)
+    assert [s == "HIT" for s in statuses] == result.hit_mask.tolist()
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from core import partition, registry
+from core.replay import run_trace
+
+
+@pytest.mark.parametrize("name", ['LRU', 'CLOCK', 'LFU', 'ARC', 'OPT'])
+@pytest.mark.parametrize("n_shards", [1, 3, 8])
+def test_sharded_cache_matches_per_shard_replay(zipf_trace, name, n_shards):
+    pages = zipf_trace(n_shards, 6000, 300)
+    sharded = partition.create(name, 40, n_shards, pages)
+    result = run_trace(sharded, pages)
+
+    # Chạy riêng từng dãy con với policy có capacity tương ứng
+    ids = partition.shard_ids(pages, n_shards)
+    caps = partition.shard_capacities(40, n_shards)
+    substreams, order = partition.split_trace(pages, n_shards)
+    hit_mask = np.zeros(len(pages), dtype=bool)
+    evicted = np.full(len(pages), -1, dtype=np.int64)
+    start = 0
+    for k, (sub, cap) in enumerate(zip(substreams, caps)):
+        assert (ids[order[start:start + len(sub)]] == k).all()
+        alone = run_trace(registry.create(name, cap, sub), sub)
+        hit_mask[order[start:start + len(sub)]] = alone.hit_mask
+        evicted[order[start:start + len(sub)]] = alone.evicted
+        start += len(sub)
+    assert np.array_equal(result.hit_mask, hit_mask)
+    assert np.array_equal(result.evicted, evicted)
+    assert sharded.hits == int(hit_mask.sum())
+
+
+def test_sharded_access_matches_replay(zipf_trace):
+    pages = zipf_trace(5, 3000, 200)
+    stepped, replayed = partition.create('CLOCK', 24, 4), partition.create('CLOCK', 24, 4)
+    statuses = []
+    for page in pages.tolist():
+        status, _ = stepped.access(page)
+        while status == "STEP":
+            status, _ = stepped.access(page)
+        statuses.append(status == "HIT")
+    assert run_trace(replayed, pages).hit_mask.tolist() == statuses
+    assert (stepped.hits, stepped.misses) == (replayed.hits, replayed.misses)
+
+
+def test_simulate_sharded_totals(zipf_trace):
+    pages = zipf_trace(6, 8000, 400)
+    per_shard, total = partition.simulate_sharded('LRU', 64, pages, 4, max_workers=2)
+    sharded = partition.create('LRU', 64, 4)
+    run_trace(sharded, pages)
+    assert list(per_shard['capacity']) == partition.shard_capacities(64, 4)
+    assert per_shard['requests'].sum() == total['requests'] == len(pages)
+    assert total['misses'] == sharded.misses
+    assert total['load_imbalance'] >= 1.0
+    assert per_shard['load_share'].sum() == pytest.approx(1.0)
+
+
+def test_capacity_below_shards():
+    with pytest.raises(ValueError):
+        partition.simulate_sharded('LRU', 3, np.arange(10), 4)
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from core.algorithms import CLOCK, FIFO, LIFO, CompactCLOCK
+from core.replay import run_trace
+
+
+class _Reference:
+    """FIFO / LIFO dùng list thường, remove() O(n)"""
+    def __init__(self, capacity, lifo):
+        self.capacity, self.lifo, self.cache = capacity, lifo, []
+
+    def access(self, page):
+        if page in self.cache:
+            return "HIT", None
+        evicted = None
+        if len(self.cache) >= self.capacity:
+            evicted = self.cache.pop(-1 if self.lifo else 0)
+        self.cache.append(page)
+        return "MISS", evicted
+
+    def remove(self, page):
+        if page not in self.cache:
+            return False
+        self.cache.remove(page)
+        return True
+
+
+@pytest.mark.parametrize("cls", [FIFO, LIFO])
+@pytest.mark.parametrize("seed", range(5))
+def test_remove_matches_reference(cls, seed):
+    rng = np.random.default_rng(seed)
+    policy, ref = cls(6), _Reference(6, cls is LIFO)
+    for _ in range(3000):
+        page = int(rng.integers(0, 12))
+        if rng.random() < 0.3:
+            assert policy.remove(page) == ref.remove(page)
+        elif rng.random() < 0.5:
+            assert policy.access(page) == ref.access(page)
+        else:
+            # replay() phải bỏ qua entry cũ giống access()
+            pages = rng.integers(0, 12, 5)
+            result = run_trace(policy, pages)
+            expected = [ref.access(p) for p in pages.tolist()]
+            assert result.hit_mask.tolist() == [s == "HIT" for s, _ in expected]
+            assert result.evicted.tolist() == [-1 if e is None else e for _, e in expected]
+        assert policy.get_cache_state() == ref.cache
+        # Entry cũ được dọn định kỳ nên không tăng vô hạn
+        assert len(policy.cache) <= 2 * len(policy.members) + 9
+
+
+@pytest.mark.parametrize("cls", [CLOCK, CompactCLOCK])
+def test_clock_fills_removed_frame_first(cls):
+    policy = cls(4)
+    for page in (5, 2, 3, 4, 7):
+        policy.access_complete(page)
+    # frames [7(1), 2(0), 3(0), 4(0)], kim ở 1; xóa 4 -> frame 3 trống
+    assert policy.remove(4)
+    assert policy.access_complete(6) == ("MISS", None, 0)
+    assert [f['val'] for f in policy.get_cache_state()] == [7, 2, 3, 6]
+    # Hết frame trống -> quay lại quét từ vị trí kim cũ
+    assert policy.hand == 1
+    assert policy.access(8) == ("MISS", 2)
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from core.algorithms import ARC, LIRS, TwoQ, _LIR
+from core.replay import run_trace
+
+
+def _resident(policy):
+    """Tập page đang nằm trong cache (không tính ghost)"""
+    pages = set()
+    for lst in policy.get_cache_state()['lists'].values():
+        pages.update(lst)
+    return pages
+
+
+def _check_structure(policy):
+    c = policy.capacity
+    if isinstance(policy, ARC):
+        assert len(policy.t1) + len(policy.t2) <= c
+        assert len(policy.t1) + len(policy.b1) <= c
+        assert len(policy.t1) + len(policy.t2) + len(policy.b1) + len(policy.b2) <= 2 * c
+        assert 0 <= policy.p <= c
+        lists = (policy.t1, policy.t2, policy.b1, policy.b2)
+    elif isinstance(policy, TwoQ):
+        assert len(policy.a1out) <= policy.kout
+        lists = (policy.a1in, policy.am, policy.a1out)
+    else:
+        lir = [page for page, state in policy.status.items() if state == _LIR]
+        assert len(lir) == policy.lir_count <= policy.lir_size
+        assert all(page in policy.s for page in lir)
+        assert not set(policy.q) & set(lir)
+        assert len(policy.ghosts) <= policy.ghost_limit
+        assert all(page in policy.s and page not in policy.q for page in policy.ghosts)
+        # Đáy stack S luôn là LIR
+        assert not policy.s or policy.status[next(iter(policy.s))] == _LIR
+        lists = (lir, policy.q, policy.ghosts)
+    # Mỗi page nằm trong tối đa 1 danh sách
+    assert sum(len(lst) for lst in lists) == len(set().union(*lists))
+
+
+def _with_scan(zipf_trace, seed, n=3000, n_pages=60):
+    rng = np.random.default_rng(seed)
+    # Xen kẽ đoạn lệch (zipf) với đoạn scan để đi qua mọi nhánh ghost
+    parts = [zipf_trace(seed, n // 3, n_pages, alpha=1.3), np.arange(n_pages, n_pages + n // 3), rng.integers(0, n_pages, n // 3)]
+    return np.concatenate(parts)
+
+
+@pytest.mark.parametrize("cls", [ARC, TwoQ, LIRS])
+@pytest.mark.parametrize("capacity", [2, 5, 16])
+def test_residency_invariants(zipf_trace, cls, capacity):
+    pages = _with_scan(zipf_trace, capacity)
+    policy = cls(capacity)
+    for page in pages.tolist():
+        before = _resident(policy)
+        status, evicted = policy.access(page)
+        after = _resident(policy)
+        assert status == ("HIT" if page in before else "MISS")
+        assert page in after
+        assert len(after) <= capacity
+        if evicted is not None:
+            assert evicted in before and evicted not in after
+        # Ngoài page mới và page bị xóa, tập resident không đổi
+        assert after == (before - {evicted}) | {page}
+        _check_structure(policy)
+    assert policy.hits + policy.misses == len(pages)
+
+
+@pytest.mark.parametrize("cls", [ARC, TwoQ, LIRS])
+def test_replay_matches_access(zipf_trace, cls):
+    pages = _with_scan(zipf_trace, 9)
+    stepped = cls(8)
+    statuses = [stepped.access(page) for page in pages.tolist()]
+    result = run_trace(cls(8), pages)
+    assert result.hit_mask.tolist() == [s == "HIT" for s, _ in statuses]
+    assert result.evicted.tolist() == [-1 if e is None else e for _, e in statuses]
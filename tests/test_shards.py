@@ -0,0 +1,60 @@
+import collections
+
+import numpy as np
+import pytest
+
+from core.shards import approx_mrc, estimate_error, exact_mrc, sample_trace, scaled_capacity
+
+CAPACITIES = [100, 500, 2000, 5000]
+
+
+@pytest.fixture(scope="module")
+def pages():
+    rng = np.random.default_rng(0)
+    return (rng.zipf(1.1, 200_000) % 20_000).astype(np.int64)
+
+
+def test_sample_keeps_every_access_of_sampled_pages(pages):
+    sample = sample_trace(pages, 0.1)
+    assert sample.total == len(pages)
+    assert 0.05 < len(sample.pages) / len(pages) < 0.2
+    # Lấy mẫu theo page: page được chọn giữ nguyên mọi lần truy cập, đúng thứ tự
+    counts = collections.Counter(pages.tolist())
+    assert all(counts[page] == n for page, n in collections.Counter(sample.pages.tolist()).items())
+    kept = np.isin(pages, sample.pages)
+    assert np.array_equal(pages[kept], sample.pages)
+
+
+@pytest.mark.parametrize("name", ['LRU', 'CLOCK', 'LIRS'])
+def test_scaled_mrc_close_to_exact(pages, name):
+    error = estimate_error(name, pages, CAPACITIES, 0.1)
+    assert error['mae'] < 0.02
+    assert error['max_error'] < 0.04
+
+
+def test_full_rate_is_exact(pages):
+    sample = sample_trace(pages[:20_000], 1.0)
+    approx = approx_mrc('CLOCK', sample, CAPACITIES)
+    exact = exact_mrc('CLOCK', pages[:20_000], CAPACITIES)
+    assert np.allclose(approx.miss_ratio, exact.miss_ratio, atol=1e-6)
+
+
+def test_fixed_size_mode(pages):
+    sample = sample_trace(pages, 0.5, max_pages=300)
+    assert len(np.unique(sample.pages)) == 300
+    # Ngưỡng đã hạ -> tỉ lệ mẫu thực tế nhỏ hơn tỉ lệ yêu cầu
+    assert sample.rate < 0.5
+    # Đọc theo chunk cho cùng kết quả với cả mảng (ngưỡng hạ giữa chừng được áp lại cho chunk cũ)
+    chunked = sample_trace(np.array_split(pages, 7), 0.5, max_pages=300)
+    assert chunked.rate == sample.rate
+    assert np.array_equal(chunked.pages, sample.pages)
+    assert chunked.total == len(pages)
+
+
+def test_scaled_capacity_respects_minimum():
+    assert scaled_capacity(1000, 0.01) == 10
+    assert scaled_capacity(10, 0.001) == 1
+    assert scaled_capacity(10, 0.001, minimum=2) == 2
+    sample = sample_trace(np.arange(1000) % 50, 0.01)
+    # LIRS cần capacity >= 2, capacity thu nhỏ không được làm hỏng constructor
+    assert len(approx_mrc('LIRS', sample, [10, 20]).miss_ratio) == 2
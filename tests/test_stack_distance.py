@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+from core.algorithms import LRU
+from core.replay import run_trace
+from core.stack_distance import lru_miss_counts, miss_ratio_curve
+
+
+def _mixed(zipf_trace, n, n_pages, seed):
+    rng = np.random.default_rng(seed)
+    # Trộn phần ngẫu nhiên đều với phần lệch (zipf) để có đủ loại stack distance
+    return np.concatenate((rng.integers(0, n_pages, n // 2), zipf_trace(seed, n - n // 2, n_pages, alpha=1.3)))
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_lru_miss_counts_match_replay(zipf_trace, seed):
+    pages = _mixed(zipf_trace, 3000, 60, seed)
+    max_capacity = len(np.unique(pages)) + 2
+    misses = lru_miss_counts(pages, max_capacity)
+    assert misses[0] == len(pages)
+    for capacity in range(1, max_capacity + 1):
+        assert misses[capacity] == run_trace(LRU(capacity), pages).misses, capacity
+
+
+def test_miss_ratio_curve_default_length(zipf_trace):
+    pages = _mixed(zipf_trace, 500, 20, 3)
+    curve = miss_ratio_curve(pages)
+    distinct = len(np.unique(pages))
+    # Capacity = số page khác nhau -> chỉ còn cold miss
+    assert len(curve) == distinct + 1
+    assert curve[-1] == pytest.approx(distinct / len(pages))
@@ -0,0 +1,78 @@
+import os
+
+import numpy as np
+import pytest
+
+from core.store import ResultStore, WindowCounter, array_digest
+
+
+@pytest.mark.parametrize("window", [1, 7, 100, 5000])
+def test_window_counter_across_chunks(window):
+    rng = np.random.default_rng(window)
+    mask = rng.random(3001) < 0.6
+    counter = WindowCounter(window)
+    # Ranh giới chunk không trùng ranh giới cửa sổ, có cả chunk rỗng
+    for part in np.split(mask, [0, 13, 13, 500, 1999, 2000]):
+        counter.add(part)
+    n_windows = -(-len(mask) // window)
+    expected_hits = [int(mask[k * window:(k + 1) * window].sum()) for k in range(n_windows)]
+    expected_sizes = [len(mask[k * window:(k + 1) * window]) for k in range(n_windows)]
+    assert counter.hits.tolist() == expected_hits
+    assert (counter.hits + counter.misses()).tolist() == expected_sizes
+
+
+def _put(store, key, size, age):
+    # Mảng ngẫu nhiên để file nén vẫn có kích thước khoảng `size` byte
+    data = np.random.default_rng(len(key)).integers(0, 1 << 62, size // 8)
+    assert store.put(key, {'requests': 0}, evicted=data)
+    os.utime(store._path(key), (age, age))
+
+
+def test_evicts_least_recently_used(tmp_path):
+    store = ResultStore(str(tmp_path))
+    _put(store, 'a', 3000, 100)
+    # Vừa đủ cho 3 entry
+    store.max_bytes = 3 * store.size() + 100
+    _put(store, 'b', 3000, 200)
+    _put(store, 'c', 3000, 300)
+    # Đọc 'a' làm mới mtime -> 'b' thành cũ nhất
+    assert store.get('a') is not None
+    _put(store, 'd', 3000, 400)
+    assert store.get('b') is None
+    assert all(store.get(key) is not None for key in 'acd')
+    assert store.size() <= store.max_bytes
+
+
+def test_keeps_fresh_entry(tmp_path):
+    store = ResultStore(str(tmp_path), max_bytes=4 << 10)
+    _put(store, 'old', 3000, 10**9)
+    # Entry vừa ghi không bị xóa kể cả khi mtime trùng / nhỏ hơn entry cũ
+    data = np.random.default_rng(0).integers(0, 1 << 62, 3000 // 8)
+    assert store.put('new', {'requests': 0}, evicted=data)
+    assert store.get('new') is not None
+    assert store.get('old') is None
+
+
+def test_rejects_entry_larger_than_limit(tmp_path):
+    store = ResultStore(str(tmp_path), max_bytes=1 << 10)
+    data = np.random.default_rng(0).integers(0, 1 << 62, 1000)
+    with pytest.warns(UserWarning):
+        assert not store.put('big', {'requests': 0}, evicted=data)
+    assert store.get('big') is None
+    assert store.size() == 0
+
+
+def test_run_reuses_stored_result(tmp_path, zipf_trace):
+    store = ResultStore(str(tmp_path))
+    pages = zipf_trace(0, 5000)
+    first = store.run('LRU', 16, pages, window=1000, keep_steps=True)
+    assert len(os.listdir(tmp_path)) == 1
+    again = store.run('LRU', 16, pages, window=1000, keep_steps=True, digest=array_digest(pages))
+    assert again['meta'] == first['meta']
+    assert np.array_equal(again['window_hits'], first['window_hits'])
+    assert np.array_equal(again['hit_mask'], first['hit_mask'])
+    assert np.array_equal(again['evicted'], first['evicted'])
+    assert int(first['window_hits'].sum()) == first['meta']['hits'] == int(first['hit_mask'].sum())
+    # Khác capacity -> khóa khác
+    store.run('LRU', 32, pages, window=1000)
+    assert len(os.listdir(tmp_path)) == 2
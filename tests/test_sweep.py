@@ -0,0 +1,23 @@
+import numpy as np
+
+from core import sweep
+from core.trace import load_trace, write_binary
+
+
+def test_memmap_trace_is_not_copied(tmp_path, zipf_trace, monkeypatch):
+    pages = zipf_trace(0, 20_000, 2000)
+    path = str(tmp_path / "trace.u32")
+    write_binary([pages], path, 'u32')
+    mapped = load_trace(path)
+    assert sweep._memmap_source(mapped) == (path, '<u4', 0, len(pages))
+    # Lát cắt không mở lại được từ file -> vẫn copy ra .npy
+    assert sweep._memmap_source(mapped[1:]) is None
+
+    expected = sweep.sweep({'trace': pages}, ['LRU', 'CLOCK'], [64, 512], max_workers=2)
+
+    def no_copy(*args, **kwargs):
+        raise AssertionError("memmap trace không được ghi lại ra .npy")
+
+    monkeypatch.setattr(np, 'save', no_copy)
+    actual = sweep.sweep({'trace': mapped}, ['LRU', 'CLOCK'], [64, 512], max_workers=2)
+    assert actual['misses'].tolist() == expected['misses'].tolist()
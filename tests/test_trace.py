@@ -0,0 +1,52 @@
+import gzip
+
+import numpy as np
+import pytest
+
+from core.trace import detect_format, iter_text_chunks, iter_trace_chunks, load_trace, write_binary
+
+
+def _pages(chunks):
+    return np.concatenate(list(chunks)).tolist()
+
+
+@pytest.mark.parametrize("block_bytes", [1, 4, 1 << 20])
+def test_text_tokens_split_across_blocks(tmp_path, zipf_trace, block_bytes):
+    pages = zipf_trace(0, 500, 5000).tolist()
+    path = tmp_path / "trace.txt"
+    path.write_text("\n".join(" ".join(map(str, pages[i:i + 7])) for i in range(0, len(pages), 7)))
+    assert _pages(iter_text_chunks(str(path), block_bytes=block_bytes)) == pages
+
+
+def test_gzip(tmp_path, zipf_trace):
+    pages = zipf_trace(1, 2000).tolist()
+    path = str(tmp_path / "trace.txt.gz")
+    with gzip.open(path, 'wt') as f:
+        f.write(" ".join(map(str, pages)))
+    assert detect_format(path) == 'gzip'
+    assert _pages(iter_trace_chunks(path)) == pages
+
+
+@pytest.mark.parametrize("fmt", ['u32', 'u64'])
+def test_binary_roundtrip(tmp_path, zipf_trace, fmt):
+    pages = zipf_trace(2, 3000)
+    path = str(tmp_path / f"trace.{fmt}")
+    write_binary(np.array_split(pages, 4), path, fmt)
+    assert detect_format(path) == fmt
+    loaded = load_trace(path)
+    # Trace nhị phân được mở bằng memmap, không nạp vào RAM
+    assert isinstance(loaded, np.memmap)
+    assert loaded.tolist() == pages.tolist()
+    assert [len(c) for c in iter_trace_chunks(path, chunk_size=1000)] == [1000, 1000, 1000]
+
+
+def test_zstd_multi_frame(tmp_path, zipf_trace):
+    zstandard = pytest.importorskip("zstandard")
+    pages = zipf_trace(3, 3000).tolist()
+    path = tmp_path / "trace.zst"
+    # Nhiều frame nối nhau (như zstd -T hoặc cat a.zst b.zst)
+    compressor = zstandard.ZstdCompressor()
+    parts = [pages[:1000], pages[1000:2500], pages[2500:]]
+    path.write_bytes(b"".join(compressor.compress((" ".join(map(str, part)) + "\n").encode()) for part in parts))
+    assert detect_format(str(path)) == 'zstd'
+    assert _pages(iter_trace_chunks(str(path))) == pages
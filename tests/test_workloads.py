@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from core import workloads
+
+
+@pytest.mark.parametrize("name", workloads.names())
+def test_generate_matches_iter_workload(name):
+    chunks = list(workloads.iter_workload(name, 10_000, seed=3, chunk_size=999))
+    assert [len(c) for c in chunks[:-1]] == [999] * 10 and len(chunks[-1]) == 10
+    pages = workloads.generate(name, 10_000, seed=3, chunk_size=999)
+    assert pages.dtype == np.int64
+    assert np.array_equal(pages, np.concatenate(chunks))
+    # Cùng seed -> cùng trace, khác seed -> khác trace (trừ workload tất định)
+    assert np.array_equal(pages, workloads.generate(name, 10_000, seed=3, chunk_size=999))
+    if name not in ('scan', 'loop'):
+        assert not np.array_equal(pages, workloads.generate(name, 10_000, seed=4, chunk_size=999))
+
+
+@pytest.mark.parametrize("name", ['zipf', 'scan', 'loop'])
+def test_chunk_size_does_not_change_trace(name):
+    a = workloads.generate(name, 5000, seed=1, chunk_size=5000)
+    b = workloads.generate(name, 5000, seed=1, chunk_size=7)
+    assert np.array_equal(a, b)
+
+
+def test_zipf_skew():
+    pages = workloads.generate('zipf', 200_000, n_pages=1000, alpha=1.2)
+    assert pages.min() >= 0 and pages.max() < 1000
+    counts = np.bincount(pages, minlength=1000)
+    # Page 0 nóng nhất, tần suất giảm theo hạng
+    assert counts.argmax() == 0
+    assert counts[0] > counts[1] > counts[9] > counts[99]
+
+
+def test_loop_and_scan():
+    assert workloads.generate('loop', 7, loop_size=3).tolist() == [0, 1, 2, 0, 1, 2, 0]
+    assert workloads.generate('scan', 5, chunk_size=2).tolist() == [0, 1, 2, 3, 4]
+
+
+def test_phases_working_set():
+    pages = workloads.generate('phases', 3000, working_set=50, phase_length=1000)
+    for p in range(3):
+        part = pages[p * 1000:(p + 1) * 1000]
+        assert part.min() >= p * 50 and part.max() < (p + 1) * 50
+
+
+def test_mixed_scan_share():
+    pages = workloads.generate('mixed', 50_000, n_pages=100, scan_weight=0.25)
+    scan = pages >= workloads.SCAN_BASE
+    assert abs(scan.mean() - 0.25) < 0.01
+    # Phần scan không bao giờ lặp lại, phần zipf nằm trong n_pages page
+    assert len(np.unique(pages[scan])) == scan.sum()
+    assert pages[~scan].max() < 100
+
+
+def test_unknown_workload():
+    with pytest.raises(KeyError):
+        workloads.create('random')
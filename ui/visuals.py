@@ -3,12 +3,24 @@ import streamlit as st
 import plotly.graph_objects as go
 import numpy as np
 import math
+import functools
 
-def draw_request_queue(queue, current_idx):
-    """Vẽ hàng đợi request nằm ngang"""
-    st.markdown("##### 📥 Request Queue (CPU)")
-    
-    st.markdown("""
+from core.downsample import MAX_POINTS, downsample, rolling_hit_rate
+
+# Chỉ vẽ các request / frame quanh vị trí hiện tại, phần còn lại gộp thành 1 ô "…"
+# để thời gian render không phụ thuộc độ dài trace hay kích thước cache
+QUEUE_WINDOW = 40
+CACHE_WINDOW = 12
+LIST_WINDOW = 16
+
+
+def _window(n, center, size):
+    """Trả về (start, end) của cửa sổ `size` phần tử quanh `center` trong [0, n)"""
+    start = max(0, min(center - size // 2, n - size))
+    return start, min(n, start + size)
+
+
+QUEUE_CSS = """
     <style>
     .req-box {
         display: inline-block;
@@ -25,17 +37,31 @@ def draw_request_queue(queue, current_idx):
     }
     .req-waiting { background-color: #f0f2f6; color: #31333F; }
     .req-done { background-color: #e0e0e0; color: #a0a0a0; text-decoration: line-through; }
+    .req-more { width: auto; padding: 0 6px; background-color: white; color: #999; border: 1px dashed #ccc; font-weight: normal; }
     </style>
-    """, unsafe_allow_html=True)
+"""
+
+
+def draw_request_queue(queue, current_idx, window=QUEUE_WINDOW):
+    """Vẽ hàng đợi request nằm ngang (chỉ `window` request quanh bước hiện tại)"""
+    st.markdown("##### 📥 Request Queue (CPU)")
+    st.markdown(QUEUE_CSS, unsafe_allow_html=True)
 
-    html_str = "<div>"
-    for i, num in enumerate(queue):
+    n = len(queue)
+    # Giữ khoảng 1/4 cửa sổ cho các request đã xong
+    start, end = _window(n, current_idx + window // 4, window)
+    parts = ["<div>"]
+    if start > 0:
+        parts.append(f'<div class="req-box req-more">… {start} done</div>')
+    for i in range(start, end):
         if i < current_idx: cls = "req-done"
         elif i == current_idx: cls = "req-active"
         else: cls = "req-waiting"
-        html_str += f'<div class="req-box {cls}">{num}</div>'
-    html_str += "</div>"
-    st.markdown(html_str, unsafe_allow_html=True)
+        parts.append(f'<div class="req-box {cls}">{queue[i]}</div>')
+    if end < n:
+        parts.append(f'<div class="req-box req-more">+{n - end} waiting</div>')
+    parts.append("</div>")
+    st.markdown("".join(parts), unsafe_allow_html=True)
 
 
 def draw_metrics(hits, misses):
@@ -65,26 +91,56 @@ def draw_metrics(hits, misses):
     st.markdown(html_content, unsafe_allow_html=True)
 
 
-def draw_linear_cache_with_evicted(data, evicted_val, algo_name, capacity, description):
-    """Vẽ cache tuyến tính + Mô tả"""
+def _linear_item_html(item):
+    if isinstance(item, dict) and 'freq' in item:
+        inner = f"<b>{item['val']}</b><br><i style='font-size: 11px;'>(f:{item['freq']})</i>"
+    else:
+        inner = f"<b>{item}</b>"
+    return f'<div style="display: inline-block; min-width: 44px; margin: 2px; padding: 6px 4px; text-align: center; border-radius: 6px; background-color: #e8f0fe; color: #1c4e9c; font-family: sans-serif;">{inner}</div>'
+
+
+def _more_html(text):
+    return f'<div style="display: inline-block; margin: 2px; padding: 6px; border: 1px dashed #ccc; border-radius: 6px; color: #999; font-family: sans-serif;">{text}</div>'
+
+
+def draw_linear_cache_with_evicted(data, evicted_val, algo_name, capacity, description, focus=None,
+                                   window=CACHE_WINDOW):
+    """
+    Vẽ cache tuyến tính + Mô tả.
+    Cache lớn hơn `window` frame: chỉ vẽ `window` frame quanh vị trí `focus`
+    (mặc định: cuối cache, nơi page mới được thêm) bằng 1 chuỗi HTML.
+    """
     st.markdown(f"##### 🗃️ Cache State ({algo_name})")
     st.markdown(f"*{description}*") # Dùng markdown in nghiêng cho mô tả
 
     col_cache, col_trash = st.columns([3, 1])
 
     with col_cache:
-        cols = st.columns(capacity)
-        for i in range(capacity):
-            with cols[i]:
-                if i < len(data):
-                    item = data[i]
-                    if isinstance(item, dict) and 'freq' in item:
-                        txt = f"**{item['val']}**\n\n*(f:{item['freq']})*"
+        if capacity > window:
+            n = len(data)
+            start, end = _window(n, n - 1 if focus is None else focus, window)
+            parts = []
+            if start > 0:
+                parts.append(_more_html(f"… {start} frames"))
+            parts.extend(_linear_item_html(data[i]) for i in range(start, end))
+            if end < n:
+                parts.append(_more_html(f"+{n - end} frames"))
+            if n < capacity:
+                parts.append(_more_html(f"{capacity - n} empty"))
+            st.markdown(f"<div>{''.join(parts)}</div>", unsafe_allow_html=True)
+        else:
+            cols = st.columns(capacity)
+            for i in range(capacity):
+                with cols[i]:
+                    if i < len(data):
+                        item = data[i]
+                        if isinstance(item, dict) and 'freq' in item:
+                            txt = f"**{item['val']}**\n\n*(f:{item['freq']})*"
+                        else:
+                            txt = f"**{item}**"
+                        st.info(txt)
                     else:
-                        txt = f"**{item}**"
-                    st.info(txt)
-                else:
-                    st.markdown("""<div style="height: 60px; border: 2px dashed #ccc; border-radius: 5px; display: flex; align-items: center; justify-content: center; color: #ccc;">Empty</div>""", unsafe_allow_html=True)
+                        st.markdown("""<div style="height: 60px; border: 2px dashed #ccc; border-radius: 5px; display: flex; align-items: center; justify-content: center; color: #ccc;">Empty</div>""", unsafe_allow_html=True)
 
     with col_trash:
         if evicted_val is not None:
@@ -258,101 +314,199 @@ def draw_clock_plotly(cache_items, hand_idx, capacity, evicted_val, description)
             """
         st.markdown(box_html, unsafe_allow_html=True)
 
-def draw_clock_svg(cache_items, hand_idx, capacity, evicted_val, description):
+# Cấu hình kích thước canvas SVG
+CLOCK_WIDTH, CLOCK_HEIGHT = 400, 320
+CLOCK_RADIUS = 110                    # Bán kính vòng tròn
+CLOCK_BOX = 60                        # Kích thước ô vuông
+
+# Cấu hình màu sắc
+COLOR_BOX_BG = "#f1f3f6"
+COLOR_BOX_BORDER = "#333333"
+COLOR_TEXT_BLUE = "#0099FF"
+COLOR_TEXT_RED = "#FF4B4B"
+COLOR_HAND = "#333333"
+
+
+@functools.lru_cache(maxsize=64)
+def _clock_slots(n):
+    """Tọa độ tâm n ô chia đều trên vòng tròn (chỉ phụ thuộc n -> memoize)"""
+    cx, cy = CLOCK_WIDTH / 2, CLOCK_HEIGHT / 2
+    slots = []
+    for i in range(n):
+        angle_rad = math.radians(i * 360 / n)
+        slots.append((cx + CLOCK_RADIUS * math.sin(angle_rad), cy - CLOCK_RADIUS * math.cos(angle_rad)))
+    return tuple(slots)
+
+
+@functools.lru_cache(maxsize=256)
+def _clock_hand(n, slot):
+    """Chuỗi SVG của kim đồng hồ chỉ vào ô `slot` trên n ô (memoize theo (n, slot))"""
+    cx, cy = CLOCK_WIDTH / 2, CLOCK_HEIGHT / 2
+    hand_rad = math.radians(slot * 360 / n)
+
+    # 1. Tính tọa độ ĐỈNH NHỌN của mũi tên
+    hand_len = CLOCK_RADIUS - 42
+    tip_x = cx + hand_len * math.sin(hand_rad)
+    tip_y = cy - hand_len * math.cos(hand_rad)
+
+    # 2. Thân kim ngắn hơn đỉnh 10px để chui vào trong tam giác chứ không lòi ra ngoài đỉnh
+    stick_len = hand_len - 10
+    stick_end_x = cx + stick_len * math.sin(hand_rad)
+    stick_end_y = cy - stick_len * math.cos(hand_rad)
+
+    # 3. Tính toán 2 cánh của mũi tên (dựa trên đỉnh tip_x, tip_y)
+    arrow_size = 12
+    p1_x = tip_x - arrow_size * math.sin(hand_rad - math.pi/6)
+    p1_y = tip_y + arrow_size * math.cos(hand_rad - math.pi/6)
+    p2_x = tip_x - arrow_size * math.sin(hand_rad + math.pi/6)
+    p2_y = tip_y + arrow_size * math.cos(hand_rad + math.pi/6)
+
+    return (f'<line x1="{cx}" y1="{cy}" x2="{stick_end_x}" y2="{stick_end_y}" stroke="{COLOR_HAND}" stroke-width="4" stroke-linecap="round" />'
+            f'<polygon points="{tip_x},{tip_y} {p1_x},{p1_y} {p2_x},{p2_y}" fill="{COLOR_HAND}" />'
+            f'<circle cx="{cx}" cy="{cy}" r="6" fill="{COLOR_HAND}" />')
+
+
+def _evicted_box(evicted_val):
+    if evicted_val is not None:
+        return f'<div style="display: flex; flex-direction: column; align-items: center; justify-content: center; height: 100%;"><div style="width: 60px; height: 60px; border: 2px solid #333; background-color: #f1f3f6; border-radius: 12px; display: flex; align-items: center; justify-content: center; font-family: sans-serif; font-weight: bold; font-size: 20px; color: #FF4B4B; margin-bottom: 5px;">{evicted_val}</div><div style="font-size: 14px; color: #FF4B4B; font-weight: bold; font-family: sans-serif;">🗑️ Evicted</div></div>'
+    return '<div style="display: flex; flex-direction: column; align-items: center; justify-content: center; height: 100%;"><div style="width: 60px; height: 60px; border: 1px dashed #ccc; border-radius: 12px; margin-bottom: 5px;"></div><div style="font-size: 14px; color: #ccc; font-family: sans-serif;">🗑️ Evicted</div></div>'
+
+
+def draw_clock_svg(cache_items, hand_idx, capacity, evicted_val, description, window=CACHE_WINDOW):
     """
     Vẽ đồng hồ bằng SVG.
     FIX: Xóa bỏ indentation (thụt đầu dòng) trong chuỗi HTML để tránh lỗi Markdown hiển thị code text.
+    Cache lớn hơn `window` frame: chỉ vẽ `window` frame quanh kim, thêm 1 ô "…" cho phần bị ẩn.
     """
     # Hiển thị tiêu đề
     st.markdown(f"##### 🗃️ Cache State (CLOCK)")
     st.markdown(f"*{description}*")
-    
-    # Cấu hình kích thước canvas SVG
-    width, height = 400, 320
-    cx, cy = width / 2, height / 2  # Tâm đồng hồ
-    radius = 110                    # Bán kính vòng tròn
-    box_size = 60                   # Kích thước ô vuông
-    
-    # Cấu hình màu sắc
-    COLOR_BOX_BG = "#f1f3f6"      
-    COLOR_BOX_BORDER = "#333333" 
-    COLOR_TEXT_BLUE = "#0099FF"   
-    COLOR_TEXT_RED = "#FF4B4B"    
-    COLOR_HAND = "#333333"        
-    
-    svg_content = ""
-    
+
+    half = CLOCK_BOX / 2
+    if capacity > window:
+        # Các frame hand - window/2 ... hand + window/2 (vòng tròn), ô cuối là "…"
+        first = hand_idx - window // 2
+        frames = [(first + k) % capacity for k in range(window)]
+        slots = _clock_slots(window + 1)
+        hand_slot = window // 2
+    else:
+        frames = range(capacity)
+        slots = _clock_slots(capacity)
+        hand_slot = hand_idx
+
+    parts = []
+
     # 1. Vẽ các ô nhớ (Rounded Rectangles)
-    angle_step = 360 / capacity
-    
-    for i in range(capacity):
-        angle_deg = i * angle_step
-        angle_rad = math.radians(angle_deg)
-        
-        # Tọa độ tâm ô vuông
-        x = cx + radius * math.sin(angle_rad)
-        y = cy - radius * math.cos(angle_rad)
-        
+    for (x, y), i in zip(slots, frames):
         item = cache_items[i]
-        
+
         if item['val'] is None:
             # Ô trống
-            svg_content += f'<rect x="{x - box_size/2}" y="{y - box_size/2}" width="{box_size}" height="{box_size}" rx="10" ry="10" fill="white" stroke="#e0e0e0" stroke-width="2" />'
+            parts.append(f'<rect x="{x - half}" y="{y - half}" width="{CLOCK_BOX}" height="{CLOCK_BOX}" rx="10" ry="10" fill="white" stroke="#e0e0e0" stroke-width="2" />')
         else:
             # Ô có dữ liệu
             val = item['val']
             bit = item['bit']
             text_fill = COLOR_TEXT_BLUE if bit == 1 else COLOR_TEXT_RED
-            
+
             # Vẽ Box và Text (viết liền 1 dòng để tránh lỗi hiển thị)
-            svg_content += f'<rect x="{x - box_size/2}" y="{y - box_size/2}" width="{box_size}" height="{box_size}" rx="10" ry="10" fill="{COLOR_BOX_BG}" stroke="{COLOR_BOX_BORDER}" stroke-width="2" />'
-            svg_content += f'<text x="{x}" y="{y}" fill="{text_fill}" font-family="sans-serif" text-anchor="middle" dominant-baseline="middle">'
-            svg_content += f'<tspan x="{x}" dy="-5" font-weight="bold" font-size="20">{val}</tspan>'
-            svg_content += f'<tspan x="{x}" dy="20" font-size="12">b={bit}</tspan></text>'
+            parts.append(f'<rect x="{x - half}" y="{y - half}" width="{CLOCK_BOX}" height="{CLOCK_BOX}" rx="10" ry="10" fill="{COLOR_BOX_BG}" stroke="{COLOR_BOX_BORDER}" stroke-width="2" />'
+                         f'<text x="{x}" y="{y}" fill="{text_fill}" font-family="sans-serif" text-anchor="middle" dominant-baseline="middle">'
+                         f'<tspan x="{x}" dy="-5" font-weight="bold" font-size="20">{val}</tspan>'
+                         f'<tspan x="{x}" dy="20" font-size="12">b={bit}</tspan></text>')
+
+    if capacity > window:
+        x, y = slots[-1]
+        parts.append(f'<text x="{x}" y="{y}" fill="#999" font-family="sans-serif" font-size="12" text-anchor="middle" dominant-baseline="middle">… {capacity - window}</text>')
 
     # 2. Vẽ Kim đồng hồ (Arrow)
     if len(cache_items) > 0:
-        hand_angle_deg = hand_idx * angle_step
-        hand_rad = math.radians(hand_angle_deg)
-        
-        # 1. Tính tọa độ ĐỈNH NHỌN của mũi tên (giữ nguyên)
-        hand_len = radius - 42 
-        tip_x = cx + hand_len * math.sin(hand_rad)
-        tip_y = cy - hand_len * math.cos(hand_rad)
-        
-        # 2. Tính tọa độ điểm kết thúc của THÂN KIM (ngắn hơn đỉnh 10px)
-        # Để thân kim chui vào trong tam giác chứ không lòi ra ngoài đỉnh
-        stick_len = hand_len - 10 
-        stick_end_x = cx + stick_len * math.sin(hand_rad)
-        stick_end_y = cy - stick_len * math.cos(hand_rad)
-        
-        # 3. Tính toán 2 cánh của mũi tên (dựa trên đỉnh tip_x, tip_y)
-        arrow_size = 12
-        p1_x = tip_x - arrow_size * math.sin(hand_rad - math.pi/6)
-        p1_y = tip_y + arrow_size * math.cos(hand_rad - math.pi/6)
-        p2_x = tip_x - arrow_size * math.sin(hand_rad + math.pi/6)
-        p2_y = tip_y + arrow_size * math.cos(hand_rad + math.pi/6)
-        
-        # VẼ:
-        # - Line: vẽ từ tâm đến stick_end (điểm ngắn hơn)
-        # - Polygon: vẫn vẽ tại tip (đỉnh nhọn)
-        svg_content += f'<line x1="{cx}" y1="{cy}" x2="{stick_end_x}" y2="{stick_end_y}" stroke="{COLOR_HAND}" stroke-width="4" stroke-linecap="round" />'
-        svg_content += f'<polygon points="{tip_x},{tip_y} {p1_x},{p1_y} {p2_x},{p2_y}" fill="{COLOR_HAND}" />'
-        svg_content += f'<circle cx="{cx}" cy="{cy}" r="6" fill="{COLOR_HAND}" />'
+        parts.append(_clock_hand(len(slots), hand_slot))
 
     # Tạo chuỗi HTML cuối cùng (Lưu ý: Không xuống dòng, không thụt lề)
-    full_html = f'<div style="display: flex; justify-content: center; background-color: white; border-radius: 10px; padding: 10px; border: 1px solid #ddd;"><svg width="{width}" height="{height}" viewBox="0 0 {width} {height}">{svg_content}</svg></div>'
+    full_html = f'<div style="display: flex; justify-content: center; background-color: white; border-radius: 10px; padding: 10px; border: 1px solid #ddd;"><svg width="{CLOCK_WIDTH}" height="{CLOCK_HEIGHT}" viewBox="0 0 {CLOCK_WIDTH} {CLOCK_HEIGHT}">{"".join(parts)}</svg></div>'
 
     # --- Render ---
     col1, col2 = st.columns([2, 1])
     with col1:
         st.markdown(full_html, unsafe_allow_html=True)
-        
+
     with col2:
-        # Phần Evicted Box (cũng viết gọn lại)
+        st.markdown(_evicted_box(evicted_val), unsafe_allow_html=True)
+
+def draw_multi_list_cache(state, evicted_val, algo_name, capacity, description, window=LIST_WINDOW):
+    """
+    Vẽ cache gồm nhiều danh sách (ARC, 2Q, LIRS):
+    state = {'lists': {...}, 'ghosts': {...}, 'params': {...}} (xem core.algorithms)
+    Danh sách trong cache vẽ ô đặc, ghost list vẽ ô viền nét đứt màu xám.
+    Mỗi list chỉ vẽ `window` page cuối, phần đầu gộp thành "… N".
+    """
+    st.markdown(f"##### 🗃️ Cache State ({algo_name})")
+    st.markdown(f"*{description}*")
+
+    params = " | ".join(f"**{k}** = {v}" for k, v in state['params'].items())
+    used = sum(len(pages) for pages in state['lists'].values())
+    st.markdown(f"{params} | Đang dùng **{used}/{capacity}** frame")
+
+    def row_html(name, pages, ghost):
+        # Chỉ vẽ `window` page mới nhất (cuối danh sách) của mỗi list
+        hidden = max(0, len(pages) - window)
+        pages = list(pages)[hidden:]
+        if ghost:
+            box = "border: 2px dashed #bbb; background-color: white; color: #999;"
+        else:
+            box = "border: 2px solid #333; background-color: #f1f3f6; color: #31333F;"
+        cells = "".join(
+            f'<div style="display: inline-block; width: 40px; height: 40px; line-height: 36px; text-align: center; margin: 2px; border-radius: 6px; font-weight: bold; font-family: sans-serif; {box}">{p}</div>'
+            for p in pages
+        ) or '<span style="color: #ccc; font-family: sans-serif;">(trống)</span>'
+        if hidden:
+            cells = f'<span style="color: #999; font-family: sans-serif;">… {hidden} </span>' + cells
+        label_color = "#999" if ghost else "#31333F"
+        return f'<div style="display: flex; align-items: center; margin: 4px 0;"><div style="width: 70px; font-family: sans-serif; font-weight: bold; color: {label_color};">{name}</div><div>{cells}</div></div>'
+
+    col_cache, col_trash = st.columns([3, 1])
+    with col_cache:
+        html = "".join(row_html(name, pages, False) for name, pages in state['lists'].items())
+        html += "".join(row_html(f"{name} 👻", pages, True) for name, pages in state['ghosts'].items())
+        st.markdown(f"<div>{html}</div>", unsafe_allow_html=True)
+
+    with col_trash:
         if evicted_val is not None:
-             box_html = f'<div style="display: flex; flex-direction: column; align-items: center; justify-content: center; height: 100%;"><div style="width: 60px; height: 60px; border: 2px solid #333; background-color: #f1f3f6; border-radius: 12px; display: flex; align-items: center; justify-content: center; font-family: sans-serif; font-weight: bold; font-size: 20px; color: #FF4B4B; margin-bottom: 5px;">{evicted_val}</div><div style="font-size: 14px; color: #FF4B4B; font-weight: bold; font-family: sans-serif;">🗑️ Evicted</div></div>'
+            box_html = f'<div style="display: flex; flex-direction: column; align-items: center;"><div style="width: 60px; height: 60px; border: 3px solid #FF4B4B; background-color: #ffe6e6; border-radius: 8px; display: flex; align-items: center; justify-content: center; font-weight: bold; font-size: 20px; color: #FF4B4B; margin-bottom: 5px;">{evicted_val}</div><div style="font-size: 14px; color: #FF4B4B; font-weight: bold;">🗑️ Evicted</div></div>'
         else:
-            box_html = '<div style="display: flex; flex-direction: column; align-items: center; justify-content: center; height: 100%;"><div style="width: 60px; height: 60px; border: 1px dashed #ccc; border-radius: 12px; margin-bottom: 5px;"></div><div style="font-size: 14px; color: #ccc; font-family: sans-serif;">🗑️ Evicted</div></div>'
-        
-        st.markdown(box_html, unsafe_allow_html=True)
\ No newline at end of file
+            box_html = '<div style="display: flex; flex-direction: column; align-items: center;"><div style="width: 60px; height: 60px; border: 1px dashed #ccc; border-radius: 8px; margin-bottom: 5px;"></div><div style="font-size: 14px; color: #ccc;">🗑️ Evicted</div></div>'
+        st.markdown(box_html, unsafe_allow_html=True)
+
+
+def _line_chart(series, title, x_title, y_title, max_points, method):
+    """series = {tên: (x, y)}; mỗi đường được downsample trước khi gửi sang Plotly"""
+    fig = go.Figure()
+    for name, (x, y) in series.items():
+        x, y = downsample(x, y, max_points, method)
+        # Scattergl (WebGL) vẽ nhanh hơn Scatter khi có vài nghìn điểm
+        fig.add_trace(go.Scattergl(x=x, y=y, mode='lines', name=name))
+    fig.update_layout(
+        title=title,
+        xaxis_title=x_title,
+        yaxis=dict(title=y_title, range=[0, 1]),
+        margin=dict(l=20, r=20, t=40, b=20),
+        height=320,
+        legend=dict(orientation="h", y=-0.25),
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+
+def draw_miss_ratio_chart(curves, max_points=MAX_POINTS, method='lttb'):
+    """Miss ratio theo capacity. curves = {tên thuật toán: (capacities, miss_ratio)}"""
+    _line_chart(curves, "Miss-ratio curve", "Cache size", "Miss ratio", max_points, method)
+
+
+def draw_hit_rate_chart(hit_masks, window, max_points=MAX_POINTS, method='minmax'):
+    """
+    Hit rate trên cửa sổ trượt `window` request theo thời gian.
+    hit_masks = {tên thuật toán: mảng bool HIT/MISS} (xem core.replay.run_trace).
+    Mặc định dùng min/max để giữ lại các đoạn hit rate tụt mạnh.
+    """
+    series = {name: rolling_hit_rate(mask, window) for name, mask in hit_masks.items()}
+    _line_chart(series, f"Hit rate (cửa sổ {window} request)", "Request", "Hit rate", max_points, method)